@@ -67,8 +67,9 @@ class Controller(Container):
         self.thread = None
 
         # signals
-        self.signals.update({ 'is_running': self.is_running, 
-                              'duty': self.duty })
+        self._update_signals(('is_running', 'duty'),
+                             (self.is_running, self.duty))
+        self._publish()
                             
 
         # no clock?
@@ -138,10 +139,10 @@ class Controller(Container):
 
         # Loop
         self.is_running = True
-        self.signals['is_running'] = self.is_running
-
         self.duty = 0
-        self.signals['duty'] = self.duty
+        self._update_signals(('is_running', 'duty'),
+                             (self.is_running, self.duty))
+        self._publish()
 
         # enable devices
         # print('> controller:: ENABLE')
@@ -155,8 +156,8 @@ class Controller(Container):
             # update is_running
             self.is_running = self.signals['is_running']
 
-            # update duty
-            self.signals['duty'] = duty
+            # update duty, published at the end of the next period
+            self._update_signals(('duty', ), (duty, ))
             self.duty = max(self.duty, duty)
 
         # disable devices
@@ -190,7 +191,8 @@ class Controller(Container):
         # Stop thread
         if self.is_running:
             self.is_running = False
-            self.signals['is_running'] = self.is_running
+            self._update_signals(('is_running', ), (self.is_running, ))
+            self._publish()
 
         # Wait for thread to finish
         if self.thread:
@@ -13,112 +13,86 @@ class eQEP(object):
     eQEP1 = "/sys/devices/ocp.2/48302000.epwmss/48302180.eqep"
     eQEP2 = "/sys/devices/ocp.2/48304000.epwmss/48304180.eqep"
 
+    # Get the file descriptor of an attribute, opened once and kept
+    # open so that each access costs a single pread or pwrite
+    def _fd(self, attribute):
+        fd = self.fds.get(attribute)
+        if fd is None:
+            fd = self.fds[attribute] = os.open(self.path + "/" + attribute,
+                                               os.O_RDWR)
+        return fd
+
+    # Read an integer attribute
+    def _read(self, attribute):
+        return int(os.pread(self._fd(attribute), 32, 0))
+
+    # Write an integer attribute, sysfs keeps only the value written
+    def _write(self, attribute, value):
+        os.pwrite(self._fd(attribute), str(value).encode(), 0)
+
     # Set the mode of the eQEP hardware
     def set_mode(self, mode):
-        # Open the mode attribute file
-        attribute = open(self.path + "/mode", "w")
-        
-        # Write the desired mode into the file
-        attribute.write(str(mode))
-        
-        # Close the file
-        attribute.close()
+        self._write("mode", mode)
         
     # Get the mode of the eQEP hardware
     def get_mode(self):
-        # Open the attribute file
-        attribute = open(self.path + "/mode", "r")
-        
-        # Get the value
-        mode = int(attribute.readline())
-        
-        # Close the attribute
-        attribute.close()
-        
-        # Return the mode
-        return mode
+        return self._read("mode")
 
     # Set the unit timer period of the eQEP hardware
     def set_period(self, period):
-        # Open the mode attribute file
-        attribute = open(self.path + "/period", "w")
-        
-        # Write the desired mode into the file
-        attribute.write(str(period))
-        
-        # Close the file
-        attribute.close()
+        self._write("period", period)
         
     # Get the unit timer period of the eQEP hardware
     def get_period(self):
-        # Open the attribute file
-        attribute = open(self.path + "/period", "r")
-        
-        # Get the value
-        period = int(attribute.readline())
-        
-        # Close the attribute
-        attribute.close()
-        
-        # Return the mode
-        return period
+        return self._read("period")
         
     # Set the current position of the encoder hardware
     def set_position(self, position):
-        # Open the mode attribute file
-        attribute = open(self.path + "/position", "w")
-        
-        # Write the desired mode into the file
-        attribute.write(str(position))
-        
-        # Close the file
-        attribute.close()
+        self._write("position", position)
         
     # Get the immediate position of the encoder hardare
     def get_position(self):
-        # Open the attribute file
-        attribute = open(self.path + "/position", "r")
-        
-        # Get the value
-        position = int(attribute.readline())
-        
-        # Close the attribute
-        attribute.close()
-        
-        # Return the mode
-        return position
+        return self._read("position")
         
     # Poll the position, returns when new data is available
     def poll_position(self):
         # Poll the position file
         self.poller.poll(-1)
         
-        # Seek to the beginning of the file to get the data
-        os.lseek(self.fd, 0, 0)
-        
-        # Return the position
-        return int(os.read(self.fd, 16))
+        # Read from the beginning of the file, which also rearms poll
+        return int(os.pread(self.fd, 32, 0))
     
     # Constructor - specify the path and the mode
     def __init__(self, path, mode):
         # Base path of the eQEP sysfs entry (ex. /sys/devices/ocp.2/48302000.epwmss/48302180.eqep)
         self.path = path;
         
+        # Attribute file descriptors
+        self.fds = {}
+
         # Set the mode
         self.set_mode(mode)
 
         # Reset the position
         self.set_position(0)
         
-        # Setup polling system
-        self.fd = os.open(self.path + "/position", os.O_RDONLY, os.O_NONBLOCK)
+        # Setup polling system on the position file
+        self.fd = self._fd("position")
        
         # Create the poll object
         self.poller = select.poll()
         self.poller.register(self.fd, select.POLLPRI)  
         
+    # Close all attribute files
+    def close(self):
+        if getattr(self, "fds", None):
+            if hasattr(self, "poller"):
+                self.poller.unregister(self.fd)
+            for fd in self.fds.values():
+                os.close(fd)
+            self.fds = {}
+
     # Deconstructor
     def __del__(self):
         # Cleanup polling system
-        self.poller.unregister(self.fd)
-        os.close(self.fd)   
+        self.close()
@@ -1,9 +1,12 @@
 import warnings
 import math
 import struct
+import time
+import collections
+from threading import Thread, Event
 
 import pyctrl.block as block
-import pycomms.mpu6050 as mpu6050
+from .pycomms import mpu6050
 
 import numpy
 
@@ -59,65 +62,183 @@ class Raw(block.Block):
         #print('< read')
         return self.output
 
-class IMU(block.Block):
+class IMU(block.Source, block.Block):
+    """
+    :py:class:`pyctrl.bbb.mpu6050.IMU` reads the quaternions computed by the DMP of the MPU6050.
 
-    def __init__(self, *vars, **kwargs):
+    While enabled, a reader thread checks the FIFO count every
+    :py:attr:`period` seconds and reads all complete packets in a
+    single burst and decodes them at once with
+    :py:meth:`pyctrl.bbb.pycomms.mpu6050.MPU6050.dmpDecodePackets`.
+    The thread never busy-waits and the FIFO is only
+    reset on overflow, so no packet is discarded. I/O errors are
+    counted in :py:attr:`errors` and also reset the FIFO, so the
+    thread keeps running.
+
+    If :py:attr:`latest` is `True`, reads do not wait and return the
+    quaternion `(w, x, y, z)` of the most recent packet. Otherwise
+    reads return a tuple with an array holding the quaternions of all
+    packets received since the previous read, one per row, for use
+    by an estimator.
+
+    :param mpu: an initialized :py:class:`pyctrl.bbb.pycomms.mpu6050.MPU6050` (default initializes a new one)
+    :param float period: period in seconds at which the FIFO is checked (default 0.005)
+    :param bool latest: whether to read the latest quaternion only (default True)
+    """
+
+    def __init__(self, **kwargs):
 
         # Sensor initialization
-        self.mpu = mpu6050.MPU6050()
-        self.mpu.dmpInitialize()
+        self.mpu = kwargs.pop('mpu', None)
+        if self.mpu is None:
+            self.mpu = mpu6050.MPU6050()
+            self.mpu.dmpInitialize()
+
+        self.period = kwargs.pop('period', 0.005)
+        self.latest = kwargs.pop('latest', True)
 
         # get expected DMP packet size for later comparison
         self.packetSize = self.mpu.dmpGetFIFOPacketSize() 
 
+        # latest quaternion and queue of received packets
+        self.output = (1.0, 0.0, 0.0, 0.0)
+        self.packets = collections.deque()
+        self.overflows = 0
+        self.errors = 0
+
+        self.thread = None
+        self.stop = Event()
+
         # call super
-        super().__init__(*vars, **kwargs)
+        super().__init__(**kwargs)
+
+        if self.enabled:
+            self.enabled = False
+            self.set_enabled(True)
+
+    def get(self, *keys, exclude = ()):
+        """
+        Get properties of :py:class:`pyctrl.bbb.mpu6050.IMU`.
+
+        :param keys: string or tuple of strings with property names
+        :param tuple exclude: keys never to be returned (default ())
+        """
+        return super().get(*keys, exclude = exclude + ('mpu',
+                                                       'packets',
+                                                       'thread',
+                                                       'stop'))
 
     def set_enabled(self, enabled = True):
+        """
+        Set :py:class:`pyctrl.bbb.mpu6050.IMU` :py:attr:`enabled` state.
+
+        Enabling starts the DMP and the reader thread; disabling stops both.
+
+        :param bool enabled: True or False (default True)
+        """
+
+        # quick return
+        if enabled == self.enabled:
+            return
 
         super().set_enabled(enabled)
         
         if enabled:
             self.mpu.setDMPEnabled(True)
             self.mpu.resetFIFO()
-            warnings.warn('> imu enabled')
-            print('> resetFIFO, count = {}'.format(self.mpu.getFIFOCount()))
+            self.packets.clear()
+            self.stop.clear()
+            self.thread = Thread(target = self.run, daemon = True)
+            self.thread.start()
         else:
+            self.stop.set()
+            self.thread.join()
+            self.thread = None
             self.mpu.setDMPEnabled(False)
-            warnings.warn('> imu disabled')
 
-    def read(self):
+    def run(self):
 
-        #print('> read')
-        if self.enabled:
+        mpu, size = self.mpu, self.packetSize
+        while not self.stop.wait(self.period):
 
-            # get current FIFO count
-            fifoCount = self.mpu.getFIFOCount()
-            #print('> fifoCount1 = {}'.format(fifoCount))
+            try:
 
-            if fifoCount == 1024:
-                # reset so we can continue cleanly
-                self.mpu.resetFIFO()
-                print('FIFO overflow!')
-            
-            fifoCount = self.mpu.getFIFOCount()
-            #print('> fifoCount2 = {}'.format(fifoCount))
-            while fifoCount < self.packetSize:
-                fifoCount = self.mpu.getFIFOCount()
-                #print('> fifoCount3 = {}'.format(fifoCount))
+                # get current FIFO count
+                fifoCount = mpu.getFIFOCount()
 
-            result = self.mpu.getFIFOBytes(self.packetSize)
-            q = self.mpu.dmpGetQuaternion(result)
+                if fifoCount >= 1024:
+                    # reset so we can continue cleanly
+                    mpu.resetFIFO()
+                    self.overflows += 1
+                    warnings.warn('FIFO overflow!')
+                    continue
 
-            # reset fifo every time
-            self.mpu.resetFIFO()
-                
-            self.output = (q['w'], q['x'], q['y'], q['z'])
-        
-        #print('< read')
-        return self.output
+                # read all complete packets at once
+                n = fifoCount // size
+                if n <= 0:
+                    continue
+                data = mpu.getFIFOBlock(n * size)
+
+            except (IOError, OSError) as e:
+                # a failed transfer leaves the FIFO misaligned, reset
+                # it and keep the thread alive
+                self.errors += 1
+                warnings.warn('Could not read FIFO: {}'.format(e))
+                try:
+                    mpu.resetFIFO()
+                except (IOError, OSError):
+                    pass
+                continue
+
+            q = mpu.dmpDecodePackets(data)['quaternion']
+
+            if not self.latest:
+                self.packets.append(q)
+
+            # a single assignment, so reads need no lock
+            self.output = tuple(q[-1].tolist())
+
+    def read(self):
+        """
+        Read from :py:class:`pyctrl.bbb.mpu6050.IMU`.
+
+        :return: tuple with the latest quaternion `(w, x, y, z)` or, if :py:attr:`latest` is `False`, a tuple with an array of all quaternions received since the previous read
+        """
+
+        if self.latest:
+            return self.output
+
+        packets = self.packets
+        q = [packets.popleft() for k in range(len(packets))]
+        return (numpy.vstack(q) if q else numpy.zeros((0, 4)), )
 
 class Inclinometer(IMU):
+    """
+    :py:class:`pyctrl.bbb.mpu6050.Inclinometer` reads the inclination computed from the latest quaternion.
+
+    :py:attr:`latest` cannot be `False`.
+    """
+
+    def __init__(self, **kwargs):
+
+        if not kwargs.get('latest', True):
+            raise block.BlockException('Inclinometer must have `latest` equal to `True`.')
+
+        # call super
+        super().__init__(**kwargs)
+
+    def set(self, exclude = (), **kwargs):
+        """
+        Set properties of :py:class:`pyctrl.bbb.mpu6050.Inclinometer`.
+
+        This method excludes :py:attr:`latest` from the list of properties.
+
+        :param tuple exclude: attributes to exclude (default ())
+        :param kwargs kwargs: other keyword arguments
+        """
+
+        # call super
+        return super().set(exclude + ('latest',), **kwargs)
 
     def read(self):
 
@@ -1,9 +1,5 @@
 #!/usr/bin/python
 
-# Python Standard Library Imports
-import smbus
-import Adafruit_I2C as I2C 
-
 # External Imports
 pass
 
@@ -14,12 +10,24 @@ pass
 # PyComms I2C Base Class (an rewriten Adafruit_I2C pythone class clone)
 # ===========================================================================
 
-class PyComms(I2C.Adafruit_I2C):
+# Largest SMBus block transfer
+I2C_BLOCK_MAX = 32
+
+class PyComms:
 
+    # bus can be a bus number or any object with the smbus.SMBus
+    # methods read_byte_data, write_byte_data, read_i2c_block_data
+    # and write_i2c_block_data, such as a fake bus for testing
     def __init__(self, address, bus = -1):
 
-        # call super
-        super().__init__(address, bus)
+        self.address = address
+
+        if isinstance(bus, int):
+            # open the bus as Adafruit_I2C does
+            import Adafruit_I2C as I2C
+            bus = I2C.Adafruit_I2C(address, bus).bus
+
+        self.bus = bus
 
     # def reverseByteOrder(self, data):
     #     # Reverses the byte order of an int (16-bit) or long (32-bit) value
@@ -81,91 +89,92 @@ class PyComms(I2C.Adafruit_I2C):
             
         return self.write8(reg, b)
 
+    def readBlock(self, reg, length, increment = True):
+        # Reads length bytes in blocks of up to I2C_BLOCK_MAX bytes.
+        # The device advances the register within a block; the next
+        # block starts after the last register read if increment is
+        # True, or again at reg otherwise, as when reading a FIFO.
+        # Raises IOError on failure.
+        output = bytearray()
+        while len(output) < length:
+            n = min(length - len(output), I2C_BLOCK_MAX)
+            output += bytes(self.bus.read_i2c_block_data(self.address,
+                                                         reg + len(output) if increment else reg,
+                                                         n))
+        return bytes(output)
+
     def readBytes(self, reg, length):
-        output = []
-        
-        i = 0
-        while i < length:
-            output.append(self.readU8(reg))
-            i += 1
-            
-        return output        
+        return list(self.readBlock(reg, length, False))
         
     def readBytesListU(self, reg, length):
-        output = []
-        
-        i = 0
-        while i < length:
-            output.append(self.readU8(reg + i))
-            i += 1
-            
-        return output
+        return list(self.readBlock(reg, length))
 
     def readBytesListS(self, reg, length):
-        output = []
-        
-        i = 0
-        while i < length:
-            output.append(self.readS8(reg + i))
-            i += 1
-            
-        return output        
-    
-    # def writeList(self, reg, list):
-    #     # Writes an array of bytes using I2C format"
-    #     try:
-    #         self.bus.write_i2c_block_data(self.address, reg, list)
-    #     except (IOError):
-    #         print ("Error accessing 0x%02X: Check your I2C address" % self.address)
-    #     return -1    
+        return [b - 256 if b > 127 else b for b in self.readBlock(reg, length)]
+
+    def readList(self, reg, length):
+        # Read a list of bytes from the I2C device
+        try:
+            return self.readBytesListU(reg, length)
+        except (IOError):
+            print ("Error accessing 0x%02X: Check your I2C address" % self.address)
+            return -1
+
+    def writeList(self, reg, list):
+        # Writes an array of bytes using I2C format"
+        try:
+            self.bus.write_i2c_block_data(self.address, reg, list)
+        except (IOError):
+            print ("Error accessing 0x%02X: Check your I2C address" % self.address)
+            return -1    
     
-    # def write8(self, reg, value):
-    #     # Writes an 8-bit value to the specified register/address
-    #     try:
-    #         self.bus.write_byte_data(self.address, reg, value)
-    #     except (IOError):
-    #         print ("Error accessing 0x%02X: Check your I2C address" % self.address)
-    #         return -1
-
-    # def readU8(self, reg):
-    #     # Read an unsigned byte from the I2C device
-    #     try:
-    #         result = self.bus.read_byte_data(self.address, reg)
-    #         return result
-    #     except (IOError):
-    #         print ("Error accessing 0x%02X: Check your I2C address" % self.address)
-    #         return -1
-
-    # def readS8(self, reg):
-    #     # Reads a signed byte from the I2C device
-    #     try:
-    #         result = self.bus.read_byte_data(self.address, reg)
-    #         if result > 127:
-    #             return result - 256
-    #         else:
-    #             return result
-    #     except (IOError):
-    #         print ("Error accessing 0x%02X: Check your I2C address" % self.address)
-    #         return -1
-
-    # def readU16(self, reg):
-    #     # Reads an unsigned 16-bit value from the I2C device
-    #     try:
-    #         hibyte = self.bus.read_byte_data(self.address, reg)
-    #         result = (hibyte << 8) + self.bus.read_byte_data(self.address, reg + 1)
-    #         return result
-    #     except (IOError):
-    #         print ("Error accessing 0x%02X: Check your I2C address" % self.address)
-    #         return -1
-
-    # def readS16(self, reg):
-    #     # Reads a signed 16-bit value from the I2C device
-    #     try:
-    #         hibyte = self.bus.read_byte_data(self.address, reg)
-    #         if hibyte > 127:
-    #             hibyte -= 256
-    #         result = (hibyte << 8) + self.bus.read_byte_data(self.address, reg + 1)
-    #         return result
-    #     except (IOError):
-    #         print ("Error accessing 0x%02X: Check your I2C address" % self.address)
-    #         return -1
+    def write8(self, reg, value):
+        # Writes an 8-bit value to the specified register/address
+        try:
+            self.bus.write_byte_data(self.address, reg, value)
+        except (IOError):
+            print ("Error accessing 0x%02X: Check your I2C address" % self.address)
+            return -1
+
+    def readU8(self, reg):
+        # Read an unsigned byte from the I2C device
+        try:
+            result = self.bus.read_byte_data(self.address, reg)
+            return result
+        except (IOError):
+            print ("Error accessing 0x%02X: Check your I2C address" % self.address)
+            return -1
+
+    def readS8(self, reg):
+        # Reads a signed byte from the I2C device
+        try:
+            result = self.bus.read_byte_data(self.address, reg)
+            if result > 127:
+                return result - 256
+            else:
+                return result
+        except (IOError):
+            print ("Error accessing 0x%02X: Check your I2C address" % self.address)
+            return -1
+
+    def readU16(self, reg):
+        # Reads an unsigned 16-bit value from the I2C device in a
+        # single transaction
+        try:
+            hibyte, lobyte = self.readBlock(reg, 2)
+            return (hibyte << 8) + lobyte
+        except (IOError):
+            print ("Error accessing 0x%02X: Check your I2C address" % self.address)
+            return -1
+
+    def readS16(self, reg):
+        # Reads a signed 16-bit value from the I2C device in a single
+        # transaction
+        try:
+            hibyte, lobyte = self.readBlock(reg, 2)
+            if hibyte > 127:
+                hibyte -= 256
+            return (hibyte << 8) + lobyte
+        except (IOError):
+            print ("Error accessing 0x%02X: Check your I2C address" % self.address)
+            return -1
@@ -5,9 +5,10 @@ from math import atan, atan2, sqrt
 import struct
 
 # External Imports
+import numpy
 
 # Custom Imports
-import pycomms
+from . import PyComms
 
 class MPU6050:
     # Register map based on Jeff Rowberg <jeff@rowberg.net> source code at
@@ -597,10 +598,17 @@ class MPU6050:
     
     # Setting up internal 42-byte (default) DMP packet buffer
     dmpPacketSize = 42
+
+    # Layout of a DMP packet, big-endian
+    dmpPacketType = numpy.dtype([('quaternion', '>i4', (4,)),
+                                 ('gyro', '>i4', (3,)),
+                                 ('accel', '>i4', (3,)),
+                                 ('footer', '>u2')])
     
-    # construct a new object with the I2C address of the MPU6050
-    def __init__(self, address = MPU6050_DEFAULT_ADDRESS):
-        self.i2c = pycomms.PyComms(address)
+    # construct a new object with the I2C address of the MPU6050 and
+    # the bus, see pycomms.PyComms
+    def __init__(self, address = MPU6050_DEFAULT_ADDRESS, bus = -1):
+        self.i2c = PyComms(address, bus)
         self.address = address
 
     def initialize(self):
@@ -1357,6 +1365,10 @@ class MPU6050:
     def getFIFOBytes(self,length):
         return self.i2c.readBytes(self.MPU6050_RA_FIFO_R_W, length)
 
+    # burst read of length FIFO bytes, returns bytes
+    def getFIFOBlock(self, length):
+        return self.i2c.readBlock(self.MPU6050_RA_FIFO_R_W, length, False)
+
     def setFIFOByte(self, data):
         self.i2c.write8(self.MPU6050_RA_FIFO_R_W, data)
 
@@ -1603,33 +1615,31 @@ class MPU6050:
     def dmpGetFIFOPacketSize(self):
         return self.dmpPacketSize    
     
-    def dmpGetAccel(self):
-        pass
+    # Decode one or more DMP packets at once, returns a dictionary
+    # with arrays holding one row per packet: the quaternion (w, x, y,
+    # z) and the raw accelerometer and gyroscope values (x, y, z)
+    @staticmethod
+    def dmpDecodePackets(data):
+        if isinstance(data, list):
+            data = bytes(data)
+        packets = numpy.frombuffer(data, dtype = MPU6050.dmpPacketType)
+        return {
+            'quaternion' : packets['quaternion'] / 1073741824.0, # 2^30
+            'accel' : packets['accel'] >> 16,
+            'gyro' : packets['gyro'] >> 16}
+
+    def dmpGetAccel(self, packet):
+        a = self.dmpDecodePackets(packet[:self.dmpPacketSize])['accel'][0]
+        return {'x' : int(a[0]), 'y' : int(a[1]), 'z' : int(a[2])}
     
     def dmpGetQuaternion(self, packet):
-        # We are dealing with signed bytes
-        if packet[0] > 127:
-            packet[0] -= 256
-
-        if packet[4] > 127:
-            packet[4] -= 256
-            
-        if packet[8] > 127:
-            packet[8] -= 256            
-          
-        if packet[12] > 127:
-            packet[12] -= 256          
-
-        data = {
-            'w' : ((packet[0] << 8) + packet[1]) / 16384.0,  
-            'x' : ((packet[4] << 8) + packet[5]) / 16384.0,
-            'y' : ((packet[8] << 8) + packet[9]) / 16384.0,
-            'z' : ((packet[12] << 8) + packet[13]) / 16384.0}        
-        
-        return data    
+        q = self.dmpDecodePackets(packet[:self.dmpPacketSize])['quaternion'][0]
+        return {'w' : float(q[0]), 'x' : float(q[1]),
+                'y' : float(q[2]), 'z' : float(q[3])}
     
-    def dmpGetGyro(self):
-        pass
+    def dmpGetGyro(self, packet):
+        g = self.dmpDecodePackets(packet[:self.dmpPacketSize])['gyro'][0]
+        return {'x' : int(g[0]), 'y' : int(g[1]), 'z' : int(g[2])}
     
     def dmpGetLinearAccel(self):
         pass
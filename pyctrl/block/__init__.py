@@ -27,6 +27,9 @@ else:
         else:
             return numpy.interp(x, xp, fp, left, right)
 
+# schemas of block classes, see Block._schema
+_schemas = {}
+
 class BlockType(Enum):
     source = 0
     filter = 1
@@ -50,6 +53,8 @@ class Source:
     """
     Base class for all source blocks.
     """
+
+    __slots__ = ()
     
     def __init__(self, **kwargs):
 
@@ -77,6 +82,8 @@ class Sink:
     """
     Base class for all sink blocks.
     """
+
+    __slots__ = ()
     
     def __init__(self, **kwargs):
 
@@ -105,6 +112,8 @@ class Filter:
     """
     Base class for all filter blocks.
     """
+
+    __slots__ = ()
     
     def __init__(self, **kwargs):
 
@@ -123,11 +132,17 @@ class Block:
     :py:class:`pyctrl.block.Block` provides the basic functionality for all types of blocks.
         
     :py:class:`pyctrl.block.Block` does not take any parameters other than :py:attr:`enable`
+
+    Properties are the attributes in the instance dictionary plus the
+    public `__slots__` declared by subclasses, see
+    :py:class:`pyctrl.block.SlottedBufferBlock`.
         
     :param bool enable: set block as enabled (default True)
     :param kwargs kwargs: additional keyword arguments
     :raise: :py:class:`pyctrl.block.BlockException` if any of the :py:data:`kwargs` is left unprocessed
     """
+
+    __slots__ = ()
     
     def __init__(self, **kwargs):
         
@@ -198,9 +213,9 @@ class Block:
 
         # add parent to list of excluded properties
         exclude += ('parent',)
-        
+
         for k in kwargs:
-            if k in exclude or k not in self.__dict__:
+            if k in exclude or not self._has_property(k):
                 raise BlockException("Does not know how to set attribute '{}'".format(kwargs))
             else:
                 # set attribute
@@ -228,7 +243,7 @@ class Block:
         if len(keys) == 0:
             
             # all keys
-            retval = self.__dict__.copy()
+            retval = self._properties()
 
             # exclude keys
             for k in exclude:
@@ -238,9 +253,18 @@ class Block:
             return retval
             
         #else:
+
+        if len(keys) == 1:
+
+            # single key, no need to collect all properties
+            key = keys[0]
+            if key in exclude or not self._has_property(key):
+                raise KeyError('Item with key {} does not exist'.format(key))
+            return getattr(self, key)
             
         # multiple keys
-        retval = { k : self.__dict__[k] for k in keys }
+        properties = self._properties()
+        retval = { k : properties[k] for k in keys }
 
         # exclude keys
         for k, v in retval.items():
@@ -249,11 +273,41 @@ class Block:
                 # remove key
                 raise KeyError('Item with key {} does not exist'.format(k))
 
-        # remove dict if single key
-        if len(keys) == 1:
-            return retval.popitem()[1]
-        else:
-            return retval
+        return retval
+
+    @classmethod
+    def _schema(cls):
+        # public slots declared along the class hierarchy
+        try:
+            return _schemas[cls]
+        except KeyError:
+            schema = []
+            for klass in reversed(cls.__mro__):
+                slots = klass.__dict__.get('__slots__', ())
+                if isinstance(slots, str):
+                    slots = (slots, )
+                schema.extend(k for k in slots
+                              if not k.startswith('_') and k not in schema)
+            _schemas[cls] = schema = tuple(schema)
+            return schema
+
+    def _properties(self):
+        # slots first, then the instance dictionary, if any
+        retval = {}
+        for k in self._schema():
+            try:
+                retval[k] = getattr(self, k)
+            except AttributeError:
+                # slot not set
+                pass
+        retval.update(getattr(self, '__dict__', {}))
+        return retval
+
+    def _has_property(self, key):
+        # whether key is a property, see _properties
+        if key in getattr(self, '__dict__', ()):
+            return True
+        return key in self._schema() and hasattr(self, key)
 
     def html(self, *keys):
         """
@@ -317,6 +371,12 @@ class BufferBlock(Block):
     :param bool mux: mux flag (default False)
     :param bool demux: demux flag (default False)
     """
+
+    # BufferBlocks run on every period, keep their attributes in slots;
+    # Block has no slots so that subclasses such as clocks can share
+    # their instance dictionary
+    __slots__ = ('enabled', 'parent', 'buffer', 'mux', 'demux')
+
     def __init__(self, **kwargs):
         
         self.buffer = ()
@@ -368,11 +428,26 @@ class BufferBlock(Block):
             
             if values and self.mux:
                 # convert values to numpy array
-                self.buffer = (numpy.hstack(values),)
+                self.buffer = (self._mux(values),)
             else:
                 # simply copy to buffer
                 self.buffer = values
 
+    def _mux(self, values):
+        """
+        Multiplex `values` into a numpy array.
+
+        Scalar values are converted with :py:func:`numpy.array`, which is
+        much cheaper than :py:func:`numpy.hstack`.
+
+        :param tuple values: values
+        :return: numpy array
+        """
+        for v in values:
+            if not isinstance(v, (int, float)):
+                return numpy.hstack(values)
+        return numpy.array(values)
+
     def read(self):
         """
         Returns the private :py:attr:`buffer` property.
@@ -388,7 +463,17 @@ class BufferBlock(Block):
 
             # return buffer
             if self.buffer and self.demux:
-                self.buffer = tuple(numpy.hstack(self.buffer).tolist())
+                buffer = self.buffer
+                if len(buffer) == 1 and isinstance(buffer[0], numpy.ndarray) \
+                   and buffer[0].ndim == 1:
+                    # single vector, no need to stack
+                    self.buffer = tuple(buffer[0].tolist())
+                else:
+                    # python floats are already demultiplexed
+                    for v in buffer:
+                        if type(v) is not float:
+                            self.buffer = tuple(numpy.hstack(buffer).tolist())
+                            break
                 
             return self.buffer
 
@@ -396,13 +481,35 @@ class BufferBlock(Block):
 
         return (None, )
 
-class ShortCircuit(Filter, BufferBlock):
+class SlottedBufferBlock(BufferBlock):
+    """
+    :py:class:`pyctrl.block.SlottedBufferBlock` is a lightweight :py:class:`pyctrl.block.BufferBlock` that stores its attributes in `__slots__`.
+
+    Subclasses declare their properties in `__slots__`, which works as
+    a class-level schema for :py:meth:`pyctrl.block.Block.get`,
+    :py:meth:`pyctrl.block.Block.set` and JSON serialization. Slots
+    whose names start with an underscore are private and are not
+    properties. Since every class along the hierarchy declares
+    `__slots__`, instances have no instance dictionary: they are
+    smaller and attributes are read and written through slot
+    descriptors, which is faster for blocks that run on every period.
+
+    Subclasses that do not declare `__slots__` get an instance
+    dictionary back and can have other attributes, which are
+    properties as in any other block.
+    """
+
+    __slots__ = ()
+
+class ShortCircuit(Filter, SlottedBufferBlock):
     """
     :py:class:`pyctrl.block.ShortCircuit` copies input to the output, that is
 
     :math:`y = u`
     """
 
+    __slots__ = ()
+
 class Printer(Sink, Block):
     """
     :py:class:`pyctrl.block.Printer` prints the values of its input signals.
@@ -476,13 +583,15 @@ class Printer(Sink, Block):
                 print(self.sep.join(self.frmt.format(val) for val in row),
                       file=file, end=self.endln)
 
-class Constant(Source, BufferBlock):
+class Constant(Source, SlottedBufferBlock):
     """
     :py:class:`pyctrl.block.Constant` outputs a constant.
     
     :param value: constant
     """
 
+    __slots__ = ('value', )
+
     def __init__(self, **kwargs):
 
         self.value = kwargs.pop('value', 1)
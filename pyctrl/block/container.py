@@ -10,9 +10,15 @@ import importlib
 from threading import Thread, Timer, Condition
 from time import perf_counter, sleep
 import re
+import heapq
+import itertools
+import collections
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 
 from .. import block
 from .. import BlockType
+from . import fuse
 
 class ContainerWarning(block.BlockWarning):
     pass
@@ -20,6 +26,31 @@ class ContainerWarning(block.BlockWarning):
 class ContainerException(block.BlockException):
     pass
 
+# structural versions, unique across containers
+_versions = itertools.count(1)
+
+def _pop_rate(kwargs, divisor = 1, phase = 0):
+    # pop and check rate divisor and phase
+    divisor = kwargs.pop('divisor', divisor)
+    phase = kwargs.pop('phase', phase)
+    if not isinstance(divisor, int) or divisor < 1:
+        raise ContainerException("'divisor' must be a positive integer")
+    if not isinstance(phase, int):
+        raise ContainerException("'phase' must be an integer")
+    return (divisor, phase % divisor)
+
+def _due(device, k):
+    # whether a device runs on period k of its schedule
+    return (k - device.get('phase', 0)) % device.get('divisor', 1) == 0
+
+def _changed(old, new):
+    # whether a signal value changed
+    if old is new:
+        return False
+    if isinstance(old, numpy.ndarray) or isinstance(new, numpy.ndarray):
+        return not numpy.array_equal(old, new)
+    return old != new
+
 class Input(block.Source, block.BufferBlock):
     """
     :py:class:`pyctrl.block.container.Input` provides a block that connects a container input signals to local container signals .
@@ -36,6 +67,66 @@ class Output(block.Sink, block.BufferBlock):
     def read(self):
         return block.BufferBlock.read(self)
     
+class Subscription:
+    """
+    :py:class:`pyctrl.block.container.Subscription` is a bounded queue of signal values filled at the end of the periods of a :py:class:`pyctrl.block.container.Container`.
+
+    Instances are created by
+    :py:meth:`pyctrl.block.container.Container.subscribe`. When the
+    queue is full the oldest values are dropped, so that a slow
+    reader never holds back the container.
+
+    :param list signals: tuples `(container, label)` locating the signals
+    :param int maxsize: maximum number of queued values (default 100)
+    :param int decimate: queue the values of one in every `decimate` periods (default 1)
+    """
+
+    def __init__(self, signals, maxsize = 100, decimate = 1):
+
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ContainerException("'maxsize' must be a positive integer")
+        if not isinstance(decimate, int) or decimate < 1:
+            raise ContainerException("'decimate' must be a positive integer")
+        
+        self.signals = signals
+        self.decimate = decimate
+        self.dropped = 0
+        self._queue = collections.deque(maxlen = maxsize)
+        self._condition = Condition()
+        self._count = 0
+
+    def put(self):
+        """
+        Queue the published values of the signals, called by the container after each period.
+        """
+        self._count += 1
+        if self._count < self.decimate:
+            return
+        self._count = 0
+        # signals removed after subscribing are None
+        values = tuple(container._snapshot.get(label)
+                       for (container, label) in self.signals)
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(values)
+            self._condition.notify()
+
+    def get(self, timeout = None):
+        """
+        Get all queued values, waiting for values if none are queued.
+
+        :param float timeout: wait at most `timeout` seconds (default `None`, wait forever)
+        :return: list of tuples with the signal values, empty if timed out
+        :rtype: list
+        """
+        with self._condition:
+            if not self._queue:
+                self._condition.wait(timeout)
+            values = list(self._queue)
+            self._queue.clear()
+        return values
+
 class Container(block.Filter, block.Block):
     """
     :py:class:`pyctrl.block.container.Container` provides a block that can contain other blocks.
@@ -59,9 +150,13 @@ class Container(block.Filter, block.Block):
         if self.enabled:
             self.set_enabled(False)
             sleep(1)
+
+        # structural version, see get_version
+        self._touch()
             
         # signals
         self.signals = { }
+        self._publish()
 
         # sources
         self.sources = { }
@@ -75,6 +170,25 @@ class Container(block.Filter, block.Block):
         self.filters = { }
         self.filters_order = [ ]
 
+        # execution plan for filters, see _get_plan
+        self._auto_order = False
+        self._fused = False
+        self._plan = None
+        self._schedules = None
+        self._tick = 0
+
+        # signal versions and versions seen by pure filters, see _run_tracked
+        self._versions = None
+        self._seen = None
+
+        # queues filled after each period, see subscribe
+        self._subscriptions = ()
+
+        # worker pool for independent branches, see parallel
+        if getattr(self, '_executor', None) is not None:
+            self._executor.shutdown()
+        self._executor = None
+
         # timers
         self.timers = { }
         self.running_timers = { }
@@ -85,6 +199,9 @@ class Container(block.Filter, block.Block):
         Reset all sources, sinks, filters, and timers.
         """
 
+        # copy fused states back before resetting
+        self._unfuse()
+
         # call reset for each block
         for label in self.sources_order:
             self.sources[label]['block'].reset()
@@ -100,7 +217,255 @@ class Container(block.Filter, block.Block):
 
     # get
     def get(self, *keys, exclude = ()):
-        return super().get(*keys, exclude = exclude + ("running_timers",))
+        return super().get(*keys, exclude = exclude + ("running_timers", "_auto_order",
+                                                      "_fused", "_plan",
+                                                      "_schedules", "_tick",
+                                                      "_versions", "_seen",
+                                                      "_snapshot", "_subscriptions", "_version",
+                                                      "_executor"))
+
+    def _touch(self):
+        # bump the structural version of this container and of its parents
+        container = self
+        while isinstance(container, Container):
+            container._version = next(_versions)
+            container = container.parent
+
+    def get_version(self):
+        """
+        Get the structural version of the container.
+
+        The version changes whenever signals, sources, filters, sinks
+        or timers are added or removed, whenever their attributes are
+        set through the container, when the container is enabled or
+        disabled and when any of the same happens to a contained
+        container. Versions are never reused, so they can be used to
+        cache :py:meth:`pyctrl.block.container.Container.html` and
+        other structural information. Attributes set directly on
+        blocks do not change the version.
+
+        :return: the version
+        :rtype: int
+        """
+        return self._version
+
+    # parallel
+    def parallel(self, enabled = True, workers = None):
+        """
+        Run independent branches of filters concurrently.
+
+        Filters are partitioned into branches that share no signals
+        written by filters; signals written by sources are only read
+        and do not connect branches. When enabled and there is more
+        than one branch, the first branch runs on the calling thread
+        and the others on a pool of worker threads. All branches are
+        joined before sinks run. Since each signal is written by a
+        single branch, results do not depend on scheduling.
+
+        Threads help when filters spend their time in code that
+        releases the GIL, such as NumPy linear algebra.
+
+        :param bool enabled: True or False (default True)
+        :param int workers: maximum number of worker threads (default as in :py:class:`concurrent.futures.ThreadPoolExecutor`)
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if enabled:
+            self._executor = ThreadPoolExecutor(max_workers = workers)
+
+    # order
+    def auto_order(self, enabled = True):
+        """
+        Order filters automatically.
+
+        When enabled, :py:attr:`filters_order` is sorted so that every
+        filter runs after the filters that write its input signals,
+        and is kept sorted as filters are added, removed or have their
+        signals changed. Ties are kept in the current order, which is
+        also used to order filters that write to the same signal.
+
+        A filter cannot read the outputs of a later filter in the
+        same period when enabled; such cycles are algebraic loops and
+        are reported.
+
+        :param bool enabled: True or False (default True)
+        :raise: :py:class:`pyctrl.block.container.ContainerException` if filters form an algebraic loop
+        """
+        if enabled:
+            self._sort_filters()
+        self._auto_order = enabled
+
+    def _sort_filters(self):
+        # topological sort of filters by signal dependencies
+        order = self.filters_order
+        position = { label: k for (k, label) in enumerate(order) }
+
+        # writers of each signal, in the current order
+        writers = { }
+        for label in order:
+            for s in self.filters[label]['outputs']:
+                writers.setdefault(s, [ ]).append(label)
+
+        # a filter depends on the last writer of each of its inputs,
+        # or on the previous writer if it also writes the signal
+        depends = { label: set() for label in order }
+        for (s, labels) in writers.items():
+            for (previous, label) in zip(labels, labels[1:]):
+                depends[label].add(previous)
+        for label in order:
+            for s in self.filters[label]['inputs']:
+                labels = writers.get(s, ())
+                if label in labels:
+                    k = labels.index(label)
+                    if k > 0:
+                        depends[label].add(labels[k-1])
+                elif labels:
+                    depends[label].add(labels[-1])
+
+        # Kahn's algorithm, ties broken by current position
+        dependents = { label: [ ] for label in order }
+        count = { }
+        for (label, previous) in depends.items():
+            previous.discard(label)
+            count[label] = len(previous)
+            for p in previous:
+                dependents[p].append(label)
+        ready = [ position[label] for label in order if not count[label] ]
+        heapq.heapify(ready)
+        sorted_order = [ ]
+        while ready:
+            label = order[heapq.heappop(ready)]
+            sorted_order.append(label)
+            for d in dependents[label]:
+                count[d] -= 1
+                if not count[d]:
+                    heapq.heappush(ready, position[d])
+
+        if len(sorted_order) < len(order):
+            # follow dependencies among the remaining filters to find a loop
+            label = next(label for label in order if count[label])
+            path = [ ]
+            while label not in path:
+                path.append(label)
+                label = next(p for p in depends[label] if count[p])
+            loop = path[path.index(label):] + [label]
+            raise ContainerException("Algebraic loop between filters '{}'".format("' -> '".join(reversed(loop))))
+
+        if sorted_order != order:
+            self._unfuse()
+            self.filters_order = sorted_order
+
+    # fuse
+    def fuse(self, enabled = True):
+        """
+        Fuse runs of linear filters.
+
+        When enabled, runs of consecutive enabled filters that are
+        linear, as tested by :py:func:`pyctrl.block.fuse.is_linear`,
+        are evaluated by a single state-space step, see
+        :py:mod:`pyctrl.block.fuse`. All signals are still
+        written. Fused filters are rebuilt whenever they are changed
+        through :py:meth:`pyctrl.block.container.Container.set_filter`
+        or any of them is disabled.
+
+        :param bool enabled: True or False (default True)
+        """
+        self._unfuse()
+        self._fused = enabled
+
+    def _sync(self):
+        # copy fused states back to the filters
+        if self._plan is not None:
+            for device in self._plan:
+                if 'labels' in device:
+                    device['block'].sync()
+
+    def _unfuse(self):
+        # copy fused states back to the filters and drop the plan
+        self._sync()
+        self._plan = None
+        self._schedules = None
+
+    def _get_plan(self):
+        # devices to run in order, built on demand
+        if self._plan is None:
+            if self._fused:
+                self._plan = fuse.fuse(self.filters, self.filters_order, self.signals)
+            else:
+                self._plan = [self.filters[label] for label in self.filters_order]
+        return self._plan
+
+    def _get_schedule(self):
+        # sources, filters, sinks and filter branches due on this period
+        if self._schedules is None:
+            # schedules repeat with the least common multiple of the divisors
+            period = 1
+            for devices in (self.sources, self.filters, self.sinks):
+                for device in devices.values():
+                    divisor = device.get('divisor', 1)
+                    period = period * divisor // math.gcd(period, divisor)
+            self._schedules = [None] * period
+
+            # track signal versions only if there are pure filters
+            if any(device.get('pure', False) for device in self.filters.values()):
+                self._versions = { }
+                self._seen = { }
+            else:
+                self._versions = self._seen = None
+
+        k = self._tick % len(self._schedules)
+        schedule = self._schedules[k]
+        if schedule is None:
+            # filters are listed by _get_filters
+            schedule = self._schedules[k] = [
+                [device for device in (self.sources[label] for label in self.sources_order)
+                 if _due(device, k)],
+                None,
+                [device for device in (self.sinks[label] for label in self.sinks_order)
+                 if _due(device, k)],
+                None,
+                k ]
+        return schedule
+
+    def _get_filters(self, schedule):
+        # filters due on this period; the plan is built here, after
+        # the sources have been read, so that fused filters are sized
+        # from the actual signals
+        if schedule[1] is None:
+            k = schedule[4]
+            schedule[1] = [device for device in self._get_plan() if _due(device, k)]
+        return schedule[1]
+
+    def _get_branches(self, schedule = None):
+        # filters due on this period partitioned into branches that share no written signals
+        if schedule is None:
+            schedule = self._get_schedule()
+        if schedule[3] is None:
+            plan = self._get_filters(schedule)
+            parent = list(range(len(plan)))
+            def find(k):
+                while parent[k] != k:
+                    parent[k] = parent[parent[k]]
+                    k = parent[k]
+                return k
+
+            # join all devices touching each signal written by a filter
+            written = set()
+            for device in plan:
+                written.update(device['outputs'])
+            first = { }
+            for (k, device) in enumerate(plan):
+                for s in itertools.chain(device['inputs'], device['outputs']):
+                    if s in written:
+                        parent[find(k)] = find(first.setdefault(s, k))
+
+            # branches keep the plan order
+            branches = { }
+            for (k, device) in enumerate(plan):
+                branches.setdefault(find(k), [ ]).append(device)
+            schedule[3] = list(branches.values())
+        return schedule[3]
             
     def html(self, *keys):
         """
@@ -439,6 +804,8 @@ class Container(block.Filter, block.Block):
                           ContainerWarning)
         else:
             self.signals[label] = 0
+            self._publish()
+            self._touch()
 
     def add_signals(self, *labels):
         """
@@ -491,6 +858,8 @@ class Container(block.Filter, block.Block):
 
         # otherwise go ahead
         self.signals.pop(label)
+        self._publish()
+        self._touch()
 
     def set_signal(self, label, value):
         """
@@ -509,6 +878,9 @@ class Container(block.Filter, block.Block):
         if label not in self.signals:
             raise ContainerException("Signal '{}' does not exist".format(label))
         self.signals[label] = value
+        if self._versions is not None:
+            self._versions[label] = self._versions.get(label, 0) + 1
+        self._publish()
 
     def get_signal(self, label):
         """
@@ -536,6 +908,74 @@ class Container(block.Filter, block.Block):
         """
         return [self.signals[label] for label in labels]
 
+    def _publish(self):
+        # a new snapshot is built and then swapped in with a single
+        # assignment, so readers never see a snapshot being modified
+        self._snapshot = dict(self.signals)
+
+    def get_snapshot(self, *labels):
+        """
+        Get the values of signals as published at the end of the last period.
+
+        A snapshot of all signals is published after the sinks run
+        and whenever signals are set, added or removed. Snapshots are
+        never modified, so threads other than the one running the
+        container can read a consistent set of values without
+        locking; values can be up to one period old.
+
+        :param vargs labels: the signal labels
+        :return: the signal values or, if no labels are given, a read-only mapping of all signals
+        :rtype: list or mapping
+        :raise: :py:class:`pyctrl.block.container.ContainerException` if a signal does not exist
+        """
+        if not labels:
+            return MappingProxyType(self._snapshot)
+
+        values = [ ]
+        for label in labels:
+            (container, local) = self.resolve_label(label)
+            try:
+                values.append(container._snapshot[local])
+            except KeyError:
+                raise ContainerException("Signal '{}' does not exist".format(label))
+        return values
+
+    def subscribe(self, *labels, maxsize = 100, decimate = 1):
+        """
+        Subscribe to the values of signals.
+
+        The published values of the signals are queued at the end of
+        every `decimate` periods, so that threads other than the one
+        running the container can follow signals without polling
+        and without missing periods.
+
+        :param vargs labels: the signal labels
+        :param int maxsize: maximum number of queued values (default 100)
+        :param int decimate: queue the values of one in every `decimate` periods (default 1)
+        :return: an instance of :py:class:`pyctrl.block.container.Subscription`
+        :raise: :py:class:`pyctrl.block.container.ContainerException` if a signal does not exist
+        """
+        signals = [ ]
+        for label in labels:
+            (container, local) = self.resolve_label(label)
+            if local not in container.signals:
+                raise ContainerException("Signal '{}' does not exist".format(label))
+            signals.append((container, local))
+
+        subscription = Subscription(signals, maxsize, decimate)
+        # swap in a new tuple, so run never sees a tuple being modified
+        self._subscriptions = self._subscriptions + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Stop queuing values to `subscription`.
+
+        :param subscription: an instance of :py:class:`pyctrl.block.container.Subscription` returned by :py:meth:`pyctrl.block.container.Container.subscribe`
+        """
+        self._subscriptions = tuple(s for s in self._subscriptions
+                                    if s is not subscription)
+
     def list_signals(self):
         """
         List of the signals currently on Container.
@@ -554,6 +994,8 @@ class Container(block.Filter, block.Block):
         :param pyctrl.block source: the source block
         :param list outputs: a list of output signals
         :param int order: if positive, set execution order, otherwise add as last (default `-1`)
+        :param int divisor: run only every `divisor` periods (default `1`)
+        :param int phase: run on periods `phase`, `phase + divisor`, ... (default `0`)
         """
         # resolve label
         (container, label) = self.resolve_label(label)
@@ -585,6 +1027,9 @@ class Container(block.Filter, block.Block):
         # order
         order = kwargs.pop('order', None)
         
+        # rate
+        (divisor, phase) = _pop_rate(kwargs)
+
         # enable
         enable = kwargs.pop('enable', None)
         if enable is None:
@@ -608,8 +1053,12 @@ class Container(block.Filter, block.Block):
         self.sources[label] = {
             'block': source,
             'outputs': outputs,
-            'enable': enable
+            'enable': enable,
+            'divisor': divisor,
+            'phase': phase
         }
+        self._schedules = None
+        self._touch()
 
         # order
         if order is None:
@@ -641,6 +1090,8 @@ class Container(block.Filter, block.Block):
         # local label
         self.sources_order.remove(label)
         self.sources.pop(label)
+        self._schedules = None
+        self._touch()
 
     def set_source(self, label, **kwargs):
         """
@@ -651,6 +1102,8 @@ class Container(block.Filter, block.Block):
 
         :param str label: the source label
         :param list outputs: set source output signals
+        :param int divisor: set rate divisor
+        :param int phase: set rate phase
         :param kwargs kwargs: other key-value pairs of attributes
         """
         # resolve label
@@ -671,7 +1124,14 @@ class Container(block.Filter, block.Block):
             enable = kwargs.pop('enable')
             assert isinstance(enable, bool)
             self.sources[label]['enable'] = enable 
+
+        if 'divisor' in kwargs or 'phase' in kwargs:
+            device = self.sources[label]
+            (device['divisor'], device['phase']) \
+                = _pop_rate(kwargs, device.get('divisor', 1), device.get('phase', 0))
+            self._schedules = None
             
+        self._touch()
         self.sources[label]['block'].set(**kwargs)
 
     def get_source(self, label, *keys):
@@ -741,6 +1201,8 @@ class Container(block.Filter, block.Block):
         :param pyctrl.block sink: the sink block
         :param list inputs: a list of input signals
         :param int order: if positive, set execution order, otherwise add as last (default `-1`)
+        :param int divisor: run only every `divisor` periods (default `1`)
+        :param int phase: run on periods `phase`, `phase + divisor`, ... (default `0`)
         """
         # resolve label
         (container, label) = self.resolve_label(label)
@@ -772,6 +1234,9 @@ class Container(block.Filter, block.Block):
         # order
         order = kwargs.pop('order', None)
         
+        # rate
+        (divisor, phase) = _pop_rate(kwargs)
+
         # enable
         enable = kwargs.pop('enable', None)
         if enable is None:
@@ -795,8 +1260,12 @@ class Container(block.Filter, block.Block):
         self.sinks[label] = {
             'block': sink,
             'inputs': inputs,
-            'enable': enable
+            'enable': enable,
+            'divisor': divisor,
+            'phase': phase
         }
+        self._schedules = None
+        self._touch()
 
         # order
         if order is None:
@@ -828,6 +1297,8 @@ class Container(block.Filter, block.Block):
         # local label
         self.sinks_order.remove(label)
         self.sinks.pop(label)
+        self._schedules = None
+        self._touch()
 
     def set_sink(self, label, **kwargs):
         """
@@ -838,6 +1309,8 @@ class Container(block.Filter, block.Block):
 
         :param str label: the sink label
         :param list inputs: set sink input signals
+        :param int divisor: set rate divisor
+        :param int phase: set rate phase
         :param kwargs kwargs: other key-value pairs of attributes
         """
         # resolve label
@@ -858,7 +1331,14 @@ class Container(block.Filter, block.Block):
             enable = kwargs.pop('enable')
             assert isinstance(enable, bool)
             self.sinks[label]['enable'] = enable 
+
+        if 'divisor' in kwargs or 'phase' in kwargs:
+            device = self.sinks[label]
+            (device['divisor'], device['phase']) \
+                = _pop_rate(kwargs, device.get('divisor', 1), device.get('phase', 0))
+            self._schedules = None
                 
+        self._touch()
         self.sinks[label]['block'].set(**kwargs)
 
     def get_sink(self, label, *keys):
@@ -973,6 +1453,9 @@ class Container(block.Filter, block.Block):
         :param list inputs: a list of input signals
         :param list outputs: a list of output signals
         :param int order: if positive, set execution order, otherwise add as last (default `-1`)
+        :param int divisor: run only every `divisor` periods (default `1`)
+        :param int phase: run on periods `phase`, `phase + divisor`, ... (default `0`)
+        :param bool pure: if True the filter is stateless and is skipped when its signals have not changed (default `False`)
         """
         # resolve label
         (container, label) = self.resolve_label(label)
@@ -1006,6 +1489,13 @@ class Container(block.Filter, block.Block):
         # order
         order = kwargs.pop('order', None)
         
+        # rate
+        (divisor, phase) = _pop_rate(kwargs)
+
+        # pure
+        pure = kwargs.pop('pure', False)
+        assert isinstance(pure, bool)
+
         # enable
         enable = kwargs.pop('enable', None)
         if enable is None:
@@ -1034,10 +1524,15 @@ class Container(block.Filter, block.Block):
             'block': filter_,  
             'inputs': inputs,
             'outputs': outputs,
-            'enable': enable
+            'enable': enable,
+            'divisor': divisor,
+            'phase': phase,
+            'pure': pure
         }
 
         # order
+        self._unfuse()
+        self._touch()
         if order is None:
             self.filters_order.append(label)
         else:
@@ -1045,6 +1540,15 @@ class Container(block.Filter, block.Block):
 
         # reference parent
         filter_.set_parent(self)
+
+        # keep filters sorted
+        if self._auto_order:
+            try:
+                self._sort_filters()
+            except ContainerException:
+                self.filters_order.remove(label)
+                self.filters.pop(label)
+                raise
             
         # make sure input signals exist
         for s in inputs:
@@ -1072,8 +1576,10 @@ class Container(block.Filter, block.Block):
             return container.remove_filter(label)
 
         # local label
+        self._unfuse()
         self.filters_order.remove(label)
         self.filters.pop(label)
+        self._touch()
 
     def set_filter(self, label, **kwargs):
         """
@@ -1085,6 +1591,9 @@ class Container(block.Filter, block.Block):
         :param str label: the filter label
         :param list inputs: set filter input signals
         :param list outputs: set filter output signals
+        :param int divisor: set rate divisor
+        :param int phase: set rate phase
+        :param bool pure: set whether the filter is stateless
         :param kwargs kwargs: other key-value pairs of attributes
         """
         # resolve label
@@ -1096,6 +1605,11 @@ class Container(block.Filter, block.Block):
         if label not in self.filters:
             raise ContainerException("Filter '{}' does not exist".format(label))
 
+        self._unfuse()
+
+        inputs = self.filters[label]['inputs']
+        outputs = self.filters[label]['outputs']
+
         if 'inputs' in kwargs:
             values = kwargs.pop('inputs')
             assert isinstance(values, (list, tuple))
@@ -1106,11 +1620,31 @@ class Container(block.Filter, block.Block):
             assert isinstance(values, (list, tuple))
             self.filters[label]['outputs'] = values
 
+        # keep filters sorted
+        if self._auto_order:
+            try:
+                self._sort_filters()
+            except ContainerException:
+                self.filters[label]['inputs'] = inputs
+                self.filters[label]['outputs'] = outputs
+                raise
+
         if 'enable' in kwargs:
             enable = kwargs.pop('enable')
             assert isinstance(enable, bool)
             self.filters[label]['enable'] = enable 
+
+        if 'divisor' in kwargs or 'phase' in kwargs:
+            device = self.filters[label]
+            (device['divisor'], device['phase']) \
+                = _pop_rate(kwargs, device.get('divisor', 1), device.get('phase', 0))
+
+        if 'pure' in kwargs:
+            pure = kwargs.pop('pure')
+            assert isinstance(pure, bool)
+            self.filters[label]['pure'] = pure
                 
+        self._touch()
         self.filters[label]['block'].set(**kwargs)
             
     def get_filter(self, label, *keys):
@@ -1131,6 +1665,9 @@ class Container(block.Filter, block.Block):
         if label not in self.filters:
             raise ContainerException("Filter '{}' does not exist".format(label))
 
+        # copy fused states back
+        self._sync()
+
         return self.filters[label]['block'].get(*keys)
 
     def read_filter(self, label):
@@ -1372,6 +1909,7 @@ class Container(block.Filter, block.Block):
             'repeat': repeat,
             'enable': enable
         }
+        self._touch()
 
         # reference parent
         blk.set_parent(self)
@@ -1389,6 +1927,7 @@ class Container(block.Filter, block.Block):
 
         # local label
         self.timers.pop(label)
+        self._touch()
         
     def set_timer(self, label, **kwargs):
         """
@@ -1426,6 +1965,7 @@ class Container(block.Filter, block.Block):
             assert isinstance(enable, bool)
             self.timers[label]['enable'] = enable
             
+        self._touch()
         self.timers[label]['block'].set(**kwargs)
         
     def get_timer(self, label, *keys):
@@ -1550,14 +2090,17 @@ class Container(block.Filter, block.Block):
         t0 = 0
         first = True
 
+        # devices due on this period
+        schedule = self._get_schedule()
+        (sources, sinks) = (schedule[0], schedule[2])
+        self._tick += 1
+
         # Read all sources
-        for label in self.sources_order:
-            block = self.sources[label]
+        for block in sources:
             source = block['block']
             if source.is_enabled():
                 # retrieve outputs
-                self.signals.update(dict(zip(block['outputs'], 
-                                             source.read())))
+                self._update_signals(block['outputs'], source.read())
 
                 # Begin profiling
                 if first:
@@ -1565,29 +2108,125 @@ class Container(block.Filter, block.Block):
                     first = False
 
         # Process all filters
-        for label in self.filters_order:
-            block = self.filters[label]
-            fltr = block['block']
-            if fltr.is_enabled():
-                # write signals to inputs
-                fltr.write(*[self.signals[label] 
-                             for label in block['inputs']])
-                # retrieve outputs
-                self.signals.update(dict(zip(block['outputs'], 
-                                             fltr.read())))
+        if self._executor is None:
+            unfuse = self._run_filters(self._get_filters(schedule))
+        else:
+            branches = self._get_branches(schedule)
+            futures = [self._executor.submit(self._run_filters, branch)
+                       for branch in branches[1:]]
+            try:
+                unfuse = self._run_filters(branches[0]) if branches else False
+            finally:
+                # join in order
+                for future in futures:
+                    unfuse = future.result() or unfuse
+        if unfuse:
+            self._unfuse()
 
         # Write to all sinks
-        for label in self.sinks_order:
-            block = self.sinks[label]
+        for block in sinks:
             sink = block['block']
             if sink.is_enabled():
                 # write inputs
                 sink.write(*[self.signals[label]
                              for label in block['inputs']])
 
+        # publish signals
+        self._publish()
+
+        # feed subscriptions
+        for subscription in self._subscriptions:
+            subscription.put()
+
         # return duty time
         return perf_counter() - t0
                 
+    def _update_signals(self, labels, values):
+        # update signals; every write outside of the filters loop goes
+        # through here so that pure filters see the changes
+        if self._versions is None:
+            self.signals.update(zip(labels, values))
+        else:
+            self._update_tracked(labels, values)
+
+    def _update_tracked(self, labels, values):
+        # update signals and bump the versions of the ones that changed
+        signals, versions = self.signals, self._versions
+        for (label, value) in zip(labels, values):
+            if _changed(signals.get(label), value):
+                versions[label] = versions.get(label, 0) + 1
+            signals[label] = value
+
+    def _run_tracked(self, devices):
+        # run filter devices in order, skipping pure filters whose
+        # input and output signals have not changed since they last ran
+        unfuse = False
+        versions, seen = self._versions, self._seen
+        for block in devices:
+            fltr = block['block']
+            if fltr.is_enabled():
+                pure = block.get('pure', False)
+                if pure:
+                    current = tuple(versions.get(label, 0)
+                                    for label in itertools.chain(block['inputs'],
+                                                                 block['outputs']))
+                    if seen.get(id(block)) == current:
+                        continue
+                # write signals to inputs
+                try:
+                    fltr.write(*[self.signals[label] 
+                                 for label in block['inputs']])
+                except fuse.FuseException:
+                    # shapes changed: run filters one by one
+                    self._run_unfused(block)
+                    unfuse = True
+                    continue
+                # retrieve outputs
+                self._update_tracked(block['outputs'], fltr.read())
+                if pure:
+                    seen[id(block)] = tuple(versions.get(label, 0)
+                                            for label in itertools.chain(block['inputs'],
+                                                                         block['outputs']))
+            elif 'labels' in block:
+                # a fused filter was disabled: run filters one by one
+                self._run_unfused(block)
+                unfuse = True
+        return unfuse
+
+    def _run_unfused(self, device):
+        # run the filters of a fused device one by one, keeping the
+        # fused state in step with their models
+        fused = device['block']
+        fused.sync()
+        self._run_filters([self.filters[label] for label in device['labels']])
+        fused.load()
+
+    def _run_filters(self, devices):
+        # run filter devices in order, return True if a fused filter was disabled
+        if self._versions is not None:
+            return self._run_tracked(devices)
+        unfuse = False
+        for block in devices:
+            fltr = block['block']
+            if fltr.is_enabled():
+                # write signals to inputs
+                try:
+                    fltr.write(*[self.signals[label] 
+                                 for label in block['inputs']])
+                except fuse.FuseException:
+                    # shapes changed: run filters one by one
+                    self._run_unfused(block)
+                    unfuse = True
+                    continue
+                # retrieve outputs
+                self.signals.update(dict(zip(block['outputs'], 
+                                             fltr.read())))
+            elif 'labels' in block:
+                # a fused filter was disabled: run filters one by one
+                self._run_unfused(block)
+                unfuse = True
+        return unfuse
+                
     def tick(self, label, device):
 
         # Acquire lock
@@ -1604,8 +2243,8 @@ class Container(block.Filter, block.Block):
         if device['outputs']:
                 
             # retrieve outputs
-            self.signals.update(dict(zip(device['outputs'], 
-                                         device['block'].read())))
+            self._update_signals(device['outputs'],
+                                 device['block'].read())
 
         # Notify lock
         device['condition'].notify_all()
@@ -1652,6 +2291,7 @@ class Container(block.Filter, block.Block):
             
         # call super
         super().set_enabled(enabled)
+        self._touch()
 
         # enable
         if self.enabled:
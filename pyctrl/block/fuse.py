@@ -0,0 +1,327 @@
+"""
+This module fuses chains of linear filters into a single state-space step.
+
+A run of consecutive filters in a :py:class:`pyctrl.block.container.Container`
+made of :py:class:`pyctrl.block.system.Gain`,
+:py:class:`pyctrl.block.system.Affine`,
+:py:class:`pyctrl.block.system.Sum`,
+:py:class:`pyctrl.block.system.Subtract` and
+:py:class:`pyctrl.block.system.System` blocks with
+:py:class:`pyctrl.system.tf.DTTF` or :py:class:`pyctrl.system.ss.DTSS`
+models is an affine map of the signals it reads and of the states of
+its models. :py:func:`pyctrl.block.fuse.fuse` replaces such runs by a
+single :py:class:`pyctrl.block.fuse.Fused` block that evaluates one
+:py:class:`pyctrl.system.ss.DTSS` per period and still writes every
+signal written by the original filters.
+
+Fusing is enabled with :py:meth:`pyctrl.block.container.Container.fuse`.
+"""
+
+import warnings
+import numpy
+
+from .. import block
+from . import system
+from pyctrl.system.tf import DTTF
+from pyctrl.system.ss import DTSS
+
+class FuseException(block.BlockException):
+    """
+    Exception raised by :py:class:`pyctrl.block.fuse.Fused` when the shapes of its input signals changed
+    """
+    pass
+
+class _NotLinear(Exception):
+    pass
+
+def _is_scalar(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def is_linear(filter_):
+    """
+    Test whether `filter_` can be fused.
+
+    :param filter_: an instance of :py:class:`pyctrl.block.Filter`
+    :return: `True` if `filter_` can take part in a fused step
+    """
+    klass = type(filter_)
+    if klass in (system.Gain, system.Sum, system.Subtract):
+        return _is_scalar(filter_.gain)
+    elif klass is system.Affine:
+        return _is_scalar(filter_.gain) and _is_scalar(filter_.offset)
+    elif klass is system.System:
+        return type(filter_.model) in (DTTF, DTSS)
+    return False
+
+def _get_state(model):
+    # state of the realization returned by _matrices
+    if isinstance(model, DTSS):
+        return model.state.copy()
+    return numpy.flipud(model.state)
+
+def _matrices(model):
+    # state-space realization of the model and its state
+    if isinstance(model, DTSS):
+        return (model.A, model.B, model.C, model.D, _get_state(model))
+
+    # DTTF: x = [z[k-n], ..., z[k-1]] is the reversed transfer-function state
+    n = model.state.size
+    A = numpy.zeros((n, n))
+    B = numpy.zeros((n, 1))
+    C = numpy.zeros((1, n))
+    if n > 0:
+        A[:-1,1:] = numpy.eye(n - 1)
+        A[-1,:] = -numpy.flipud(model.den[1:])
+        B[-1,0] = 1
+        C[0,:] = numpy.flipud(model.num[1:]) - model.num[0] * numpy.flipud(model.den[1:])
+    D = numpy.array([[model.num[0]]])
+    return (A, B, C, D, _get_state(model))
+
+def _set_state(model, x):
+    if isinstance(model, DTSS):
+        model.state = x
+    else:
+        model.state[:] = numpy.flipud(x)
+
+class Fused(block.Filter, block.SlottedBufferBlock):
+    """
+    :py:class:`pyctrl.block.fuse.Fused` evaluates a chain of linear filters as a single :py:class:`pyctrl.system.ss.DTSS`.
+
+    Inputs are the signals read by the chain before they are written
+    and outputs are all signals written by the chain. Instances are
+    created by :py:func:`pyctrl.block.fuse.fuse`.
+
+    :param model: an instance of :py:class:`pyctrl.system.ss.DTSS` whose last input is the constant `1`
+    :param list blocks: the fused blocks
+    :param list systems: tuples `(model, start, stop)` locating the state of each fused model
+    :param list layout: tuples `(start, stop, is_array)` locating each output
+    """
+
+    __slots__ = ('model', 'blocks', 'systems', 'layout', '_uk')
+
+    def __init__(self, **kwargs):
+
+        self.model = kwargs.pop('model')
+        self.blocks = kwargs.pop('blocks', [])
+        self.systems = kwargs.pop('systems', [])
+        self.layout = kwargs.pop('layout', [])
+
+        # preallocated input, the last entry is the constant 1
+        self._uk = numpy.ones(self.model.B.shape[1])
+
+        super().__init__(**kwargs)
+
+    def is_enabled(self):
+        """
+        :return: `True` if the block and all fused blocks are enabled
+        """
+        return self.enabled and all(b.enabled for b in self.blocks)
+
+    def sync(self):
+        """
+        Copy the fused state back to the models of the fused blocks.
+        """
+        x = self.model.state
+        for (model, start, stop) in self.systems:
+            _set_state(model, x[start:stop])
+
+    def load(self):
+        """
+        Copy the states of the models of the fused blocks to the fused state.
+        """
+        x = self.model.state
+        for (model, start, stop) in self.systems:
+            x[start:stop] = _get_state(model)
+
+    def write(self, *values):
+        """
+        Update :py:attr:`model` and write to the private :py:attr:`buffer`.
+
+        :param vararg values: values
+        :raise: :py:class:`pyctrl.block.fuse.FuseException` if the sizes of the values do not match the fused inputs
+        """
+        uk = self._uk
+        try:
+            if len(values) == len(uk) - 1:
+                # scalar signals
+                uk[:-1] = values
+            else:
+                # array signals
+                u = numpy.hstack(values)
+                if u.size != len(uk) - 1:
+                    raise ValueError()
+                uk[:-1] = u
+        except ValueError:
+            raise FuseException('Shapes of fused signals changed')
+        self.buffer = self.model.update(uk)
+
+    def read(self):
+        """
+        Read the values of all signals written by the fused blocks.
+
+        :return: tuple with values
+        """
+        y = self.buffer
+        return tuple(y[start:stop].copy() if is_array else y[start]
+                     for (start, stop, is_array) in self.layout)
+
+def _linearize(devices, signals):
+    # returns a Fused block with its inputs and outputs
+
+    # find inputs read before written and model orders
+    inputs, written, nx = [], set(), 0
+    for device in devices:
+        for s in device['inputs']:
+            if s not in written and s not in inputs:
+                inputs.append(s)
+        written.update(device['outputs'])
+        if type(device['block']) is system.System:
+            nx += device['block'].model.shape()[2]
+
+    # expressions are rows over the columns [x; u; 1]
+    sizes = []
+    for s in inputs:
+        value = signals[s]
+        if not (_is_scalar(value) or
+                (isinstance(value, numpy.ndarray) and value.ndim <= 1 and
+                 numpy.issubdtype(value.dtype, numpy.number))):
+            raise _NotLinear()
+        sizes.append(numpy.size(value))
+    nu = sum(sizes)
+    N = nx + nu + 1
+    one = numpy.zeros((1, N))
+    one[0,-1] = 1
+
+    exprs = {}
+    k = nx
+    for (s, size) in zip(inputs, sizes):
+        E = numpy.zeros((size, N))
+        E[:,k:k+size] = numpy.eye(size)
+        exprs[s] = (E, isinstance(signals[s], numpy.ndarray))
+        k += size
+
+    # propagate expressions through the chain
+    blocks, systems, states, Xs = [], [], [], []
+    k = 0
+    for device in devices:
+        blk = device['block']
+        values = [exprs[s] for s in device['inputs']]
+
+        # mux
+        if blk.mux:
+            values = [(numpy.vstack([E for (E, a) in values])
+                       if values else numpy.zeros((0, N)), True)]
+
+        klass = type(blk)
+        if klass is system.System:
+            (A, B, C, D, x) = _matrices(blk.model)
+            (E, a) = values[0]
+            if E.shape[0] != B.shape[1]:
+                raise _NotLinear()
+            n = A.shape[0]
+            X = numpy.zeros((n, N))
+            X[:,k:k+n] = A
+            X += B.dot(E)
+            Y = numpy.zeros((C.shape[0], N))
+            Y[:,k:k+n] = C
+            Y += D.dot(E)
+            systems.append((blk.model, k, k + n))
+            states.append(x)
+            Xs.append(X)
+            values = [(Y, True)]
+            k += n
+
+        elif klass is system.Affine:
+            values = [(blk.gain * E + blk.offset * one, a) for (E, a) in values]
+
+        elif klass is system.Gain:
+            values = [(blk.gain * E, a) for (E, a) in values]
+
+        else: # Sum or Subtract
+            if (len(set(E.shape[0] for (E, a) in values)) > 1 or
+                len(set(a for (E, a) in values)) > 1):
+                # not summable
+                raise _NotLinear()
+            if klass is system.Subtract and values:
+                values[0] = (-values[0][0], values[0][1])
+            E = sum(E for (E, a) in values) if values else numpy.zeros((1, N))
+            values = [(blk.gain * E, any(a for (E, a) in values))]
+
+        # demux
+        if blk.demux:
+            values = [(E[i:i+1], False)
+                      for (E, a) in values for i in range(E.shape[0])]
+
+        exprs.update(zip(device['outputs'], values))
+        blocks.append(blk)
+
+    # outputs are all signals written by the chain
+    outputs = [s for s in exprs if s in written]
+    layout, Ys, k = [], [], 0
+    for s in outputs:
+        (E, a) = exprs[s]
+        if not a and E.shape[0] != 1:
+            raise _NotLinear()
+        layout.append((k, k + E.shape[0], a))
+        Ys.append(E)
+        k += E.shape[0]
+
+    X = numpy.vstack(Xs) if Xs else numpy.zeros((0, N))
+    Y = numpy.vstack(Ys) if Ys else numpy.zeros((0, N))
+    x = numpy.hstack(states) if states else numpy.zeros(0)
+    model = DTSS(X[:,:nx], X[:,nx:], Y[:,:nx], Y[:,nx:], x)
+
+    return (Fused(model = model, blocks = blocks,
+                  systems = systems, layout = layout),
+            inputs, outputs)
+
+def fuse(filters, order, signals):
+    """
+    Fuse runs of consecutive linear filters.
+
+    Runs of at least two enabled filters that run on every period and
+    for which :py:func:`pyctrl.block.fuse.is_linear` holds are replaced by a
+    :py:class:`pyctrl.block.fuse.Fused` block. Sizes of the input
+    signals are taken from their current values in `signals`, so the
+    plan should be built after the sources have been read; runs that
+    cannot be fused issue a warning. The models of the fused blocks
+    are not updated while fused; call
+    :py:meth:`pyctrl.block.fuse.Fused.sync` to copy their state back.
+
+    :param dict filters: filter devices as in :py:attr:`pyctrl.block.container.Container.filters`
+    :param list order: the filters execution order
+    :param dict signals: the signals
+    :return: list of devices to run; fused devices have the additional key `'labels'`
+    """
+    plan, run = [], []
+
+    def flush():
+        if len(run) > 1:
+            devices = [filters[label] for label in run]
+            try:
+                (fused, inputs, outputs) = _linearize(devices, signals)
+                plan.append({ 'block': fused,
+                              'inputs': inputs,
+                              'outputs': outputs,
+                              'enable': False,
+                              'labels': list(run) })
+            except _NotLinear:
+                warnings.warn("Could not fuse filters '{}'".format("', '".join(run)),
+                              block.BlockWarning)
+                plan.extend(devices)
+        else:
+            plan.extend(filters[label] for label in run)
+        run.clear()
+
+    for label in order:
+        device = filters[label]
+        fltr = device['block']
+        if (fltr.is_enabled() and not device['enable'] and
+            device.get('divisor', 1) == 1 and is_linear(fltr)):
+            run.append(label)
+        else:
+            flush()
+            plan.append(device)
+    flush()
+
+    return plan
@@ -0,0 +1,173 @@
+"""
+This module provides a block that runs a :py:class:`pyctrl.block.container.Container` in a separate process.
+"""
+
+import os
+import itertools
+import multiprocessing
+
+from .. import block
+from . import container
+from .shm import SignalBus
+
+# unique names for shared memory segments
+_counter = itertools.count()
+
+def _worker(container_, inputs, outputs, request, done, stop, errors):
+
+    # attach to inputs; outputs are created on the first run
+    inputs = SignalBus(inputs)
+    bus = None
+
+    container_.set_enabled(True)
+    try:
+        while True:
+            # wait for request
+            request.acquire()
+            if stop.is_set():
+                break
+            try:
+                container_.write(*inputs.read())
+                values = container_.read()
+                if bus is None:
+                    bus = SignalBus(outputs,
+                                    [str(k) for k in range(len(values))],
+                                    [getattr(v, 'shape', ()) for v in values])
+                bus.write(*values)
+            except Exception as e:
+                errors.send('{}: {}'.format(type(e).__name__, e))
+            done.release()
+
+    finally:
+        container_.set_enabled(False)
+        inputs.close()
+        if bus is not None:
+            bus.close()
+
+class ProcessContainer(block.Filter, block.Block):
+    """
+    :py:class:`pyctrl.block.process.ProcessContainer` runs a :py:class:`pyctrl.block.container.Container` in a worker process.
+
+    Inputs are written to the :py:class:`pyctrl.block.container.Input`
+    sources of :py:attr:`container` and outputs are read from its
+    :py:class:`pyctrl.block.container.Output` sinks, as when the
+    container is used as a filter, but the container runs in a
+    separate process so that it can use another core. Values are
+    exchanged through :py:class:`pyctrl.block.shm.SignalBus` segments
+    and each period is started and acknowledged with a pair of
+    semaphores.
+
+    If :py:attr:`wait` is `True` a read waits for the worker to finish
+    the period started by the last write. Otherwise reads return the
+    outputs of the last period completed by the worker and writes are
+    dropped while the worker is busy, so the calling loop never waits
+    except for the very first period.
+
+    The worker is started on the first write with a copy of
+    :py:attr:`container`, which keeps its own state; the copy in this
+    process is not updated. :py:meth:`pyctrl.block.process.ProcessContainer.reset`
+    stops the worker, so that the next write starts over from
+    :py:attr:`container`.
+
+    :param container: an instance of :py:class:`pyctrl.block.container.Container`
+    :param bool wait: whether reads wait for the worker (default `True`)
+    """
+
+    def __init__(self, **kwargs):
+
+        container_ = kwargs.pop('container', None)
+        if not isinstance(container_, container.Container):
+            raise block.BlockException('container must be an instance of pyctrl.block.container.Container')
+        self.container = container_
+        self.wait = kwargs.pop('wait', True)
+
+        self._process = None
+
+        super().__init__(**kwargs)
+
+    def _start(self, values):
+
+        name = 'pyctrl_{}_{}'.format(os.getpid(), next(_counter))
+        self._inputs = SignalBus(name + '_in',
+                                 [str(k) for k in range(len(values))],
+                                 [getattr(v, 'shape', ()) for v in values])
+        self._outputs = None
+        self._outputs_name = name + '_out'
+        self._request = multiprocessing.Semaphore(0)
+        self._done = multiprocessing.Semaphore(0)
+        self._stop = multiprocessing.Event()
+        (self._errors, errors) = multiprocessing.Pipe(duplex = False)
+        self._pending = False
+        self._process = multiprocessing.Process(target = _worker,
+                                                args = (self.container,
+                                                        self._inputs.name,
+                                                        self._outputs_name,
+                                                        self._request,
+                                                        self._done,
+                                                        self._stop,
+                                                        errors),
+                                                daemon = True)
+        self._process.start()
+
+    def close(self):
+        """
+        Stop the worker process.
+        """
+        if self._process is not None:
+            self._stop.set()
+            self._request.release()
+            self._process.join()
+            self._process = None
+            self._inputs.close()
+            self._errors.close()
+            if self._outputs is not None:
+                self._outputs.close()
+
+    def reset(self):
+        """
+        Reset :py:class:`pyctrl.block.process.ProcessContainer` by stopping the worker.
+        """
+        self.close()
+
+    def _check(self):
+        # raise errors from the worker
+        if self._errors.poll():
+            raise block.BlockException('Error in worker process: {}'.format(self._errors.recv()))
+
+    def write(self, *values):
+        """
+        Write inputs and start a period on the worker.
+
+        :param vararg values: values
+        """
+        if self._process is None:
+            self._start(values)
+
+        # worker still busy?
+        if self._pending:
+            if not self._done.acquire(False):
+                return
+            self._pending = False
+            self._check()
+
+        self._inputs.write(*values)
+        self._request.release()
+        self._pending = True
+
+    def read(self):
+        """
+        Read outputs.
+
+        :return: tuple with values
+        """
+        if self._process is None:
+            raise block.BlockException('ProcessContainer has not been written to')
+
+        if self._pending and (self.wait or self._outputs is None):
+            self._done.acquire()
+            self._pending = False
+            self._check()
+
+        if self._outputs is None:
+            self._outputs = SignalBus(self._outputs_name)
+        return self._outputs.read()
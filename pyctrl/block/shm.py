@@ -0,0 +1,265 @@
+"""
+This module provides blocks for sharing signals with other processes through shared memory.
+
+A :py:class:`pyctrl.block.shm.SignalBus` is a named block of shared
+memory holding a fixed layout of `float64` signals and a sequence
+counter. The segment starts with the counter and a JSON header with
+the signal labels and shapes, followed by the values:
+
+.. code-block:: none
+
+    | seq (uint64) | header length (uint64) | header | values (float64) |
+
+The writer makes the counter odd while it updates the values and even
+when done, so readers can copy the values without locks and retry if
+the counter was odd or changed during the copy (a seqlock). Readers
+attach by name and need no serialization.
+
+:py:class:`pyctrl.block.shm.Publisher` is a sink that publishes its
+input signals on every period and
+:py:class:`pyctrl.block.shm.Subscriber` is a source that reads them,
+possibly in another process.
+"""
+
+import json
+import time
+import numpy
+from multiprocessing import shared_memory
+
+from .. import block
+from . import container
+
+def _attach(name):
+    # attach without registering with the resource tracker of this
+    # process, which would unlink the segment when the reader exits
+    try:
+        return shared_memory.SharedMemory(name = name, track = False)
+    except TypeError:
+        # before python 3.13
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name = name)
+        finally:
+            resource_tracker.register = register
+
+class SignalBus:
+    """
+    :py:class:`pyctrl.block.shm.SignalBus` is a fixed layout of signals in shared memory.
+
+    Create a bus with `labels` and `shapes` or attach to an existing
+    one with only `name`.
+
+    :param str name: name of the shared memory segment
+    :param list labels: signal labels, only when creating
+    :param list shapes: signal shapes, `()` for scalars and `(n,)` for arrays, only when creating
+    """
+
+    def __init__(self, name, labels = None, shapes = None):
+
+        if labels is None:
+            # attach
+            self.shm = _attach(name)
+            self._seq = numpy.ndarray((2,), dtype = numpy.uint64,
+                                      buffer = self.shm.buf)
+            size = int(self._seq[1])
+            header = json.loads(bytes(self.shm.buf[16:16+size]).decode('utf-8'))
+            self.labels = header['labels']
+            self.shapes = [tuple(shape) for shape in header['shapes']]
+            self.owner = False
+
+        else:
+            # create
+            if shapes is None:
+                shapes = [()] * len(labels)
+            if len(shapes) != len(labels):
+                raise block.BlockException('labels and shapes must have the same length')
+            self.labels = list(labels)
+            self.shapes = [tuple(shape) for shape in shapes]
+            header = json.dumps({ 'labels': self.labels,
+                                  'shapes': self.shapes }).encode('utf-8')
+            size = len(header)
+            n = sum(int(numpy.prod(shape)) for shape in self.shapes)
+            self.shm = shared_memory.SharedMemory(name = name, create = True,
+                                                  size = 16 + 8 * ((size + 7) // 8) + 8 * n)
+            self.shm.buf[16:16+size] = header
+            self._seq = numpy.ndarray((2,), dtype = numpy.uint64,
+                                      buffer = self.shm.buf)
+            self._seq[:] = (0, size)
+            self.owner = True
+
+        self.name = self.shm.name
+
+        # values and their slices
+        offset = 16 + 8 * ((size + 7) // 8)
+        self.slices = []
+        k = 0
+        for shape in self.shapes:
+            n = int(numpy.prod(shape))
+            self.slices.append(slice(k, k + n))
+            k += n
+        self._data = numpy.ndarray((k,), dtype = numpy.float64,
+                                   buffer = self.shm.buf, offset = offset)
+
+    def get_sequence(self):
+        """
+        :return: the sequence counter, which is incremented twice on each write
+        """
+        return int(self._seq[0])
+
+    def write(self, *values):
+        """
+        Write values of all signals.
+
+        :param vararg values: one value per label
+        """
+        seq, data = self._seq, self._data
+        seq[0] += 1
+        try:
+            for (s, value) in zip(self.slices, values):
+                data[s] = value
+        finally:
+            seq[0] += 1
+
+    def read_array(self, timeout = 1):
+        """
+        Read a consistent copy of the values of all signals.
+
+        :param float timeout: give up after `timeout` seconds (default 1)
+        :return: flat array with the values of all signals
+        :raise: :py:class:`pyctrl.block.BlockException` if no consistent copy was obtained
+        """
+        seq, data = self._seq, self._data
+        deadline = None
+        while True:
+            s0 = seq[0]
+            if not s0 & 1:
+                values = data.copy()
+                if seq[0] == s0:
+                    return values
+            # writer is busy
+            if deadline is None:
+                deadline = time.perf_counter() + timeout
+            elif time.perf_counter() > deadline:
+                raise block.BlockException("Timed out reading signal bus '{}'".format(self.name))
+            time.sleep(0)
+
+    def read(self, timeout = 1):
+        """
+        Read a consistent copy of the values of all signals.
+
+        :param float timeout: give up after `timeout` seconds (default 1)
+        :return: tuple with one value per label, floats for scalars and arrays otherwise
+        """
+        values = self.read_array(timeout)
+        return tuple(values[s] if shape else float(values[s.start])
+                     for (s, shape) in zip(self.slices, self.shapes))
+
+    def close(self):
+        """
+        Detach from the shared memory segment; the creator also removes it.
+        """
+        self._seq = self._data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+class Publisher(block.Sink, block.Block):
+    """
+    :py:class:`pyctrl.block.shm.Publisher` publishes its input signals on a :py:class:`pyctrl.block.shm.SignalBus`.
+
+    The bus is created on the first write, with shapes taken from the
+    values written. Labels are the input signals of the sink when
+    added to a :py:class:`pyctrl.block.container.Container`.
+
+    :param str name: name of the shared memory segment
+    :param list labels: list with labels
+    """
+
+    def __init__(self, **kwargs):
+
+        self.name = kwargs.pop('name')
+        self.labels = kwargs.pop('labels', None)
+        self._bus = None
+
+        super().__init__(**kwargs)
+
+    def set_parent(self, parent):
+
+        # call super
+        super().set_parent(parent)
+
+        # look for labels
+        if self.parent and isinstance(self.parent, container.Container):
+            label = self.parent.find_sink(self)
+            if not label:
+                raise block.BlockException("Could not locate Publisher in parent")
+            self.labels = self.parent.sinks[label]['inputs']
+
+    def get_bus(self):
+        """
+        :return: the :py:class:`pyctrl.block.shm.SignalBus` or `None` if nothing has been written yet
+        """
+        return self._bus
+
+    def write(self, *values):
+        """
+        Publish values.
+
+        :param vararg values: values
+        :raise: :py:class:`pyctrl.block.BlockException` if the shapes of the values changed
+        """
+        bus = self._bus
+        if bus is None:
+            labels = self.labels or [str(k) for k in range(len(values))]
+            bus = self._bus = SignalBus(self.name, labels,
+                                        [numpy.shape(value) for value in values])
+        try:
+            bus.write(*values)
+        except ValueError:
+            raise block.BlockException('Shapes of published signals cannot change')
+
+    def close(self):
+        """
+        Remove the shared memory segment.
+        """
+        if self._bus is not None:
+            self._bus.close()
+            self._bus = None
+
+class Subscriber(block.Source, block.Block):
+    """
+    :py:class:`pyctrl.block.shm.Subscriber` reads the signals published on a :py:class:`pyctrl.block.shm.SignalBus`.
+
+    The bus is attached on the first read.
+
+    :param str name: name of the shared memory segment
+    :param float timeout: timeout for reading a consistent copy (default 1)
+    """
+
+    def __init__(self, **kwargs):
+
+        self.name = kwargs.pop('name')
+        self.timeout = kwargs.pop('timeout', 1)
+        self._bus = None
+
+        super().__init__(**kwargs)
+
+    def read(self):
+        """
+        Read the published values.
+
+        :return: tuple with values
+        """
+        if self._bus is None:
+            self._bus = SignalBus(self.name)
+        return self._bus.read(self.timeout)
+
+    def close(self):
+        """
+        Detach from the shared memory segment.
+        """
+        if self._bus is not None:
+            self._bus.close()
+            self._bus = None
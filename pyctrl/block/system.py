@@ -12,7 +12,7 @@ from pyctrl.system.ss import DTSS
 
 # Blocks
 
-class System(block.Filter, block.BufferBlock):
+class System(block.Filter, block.SlottedBufferBlock):
     """
     :py:class:`pyctrl.block.system.System` is a wrapper for a time-invariant dynamic system model.  
 
@@ -20,6 +20,8 @@ class System(block.Filter, block.BufferBlock):
 
     :param model: an instance of :py:class:`pyctrl.system.System`
     """
+
+    __slots__ = ('model', '_uk')
     
     def __init__(self, **kwargs):
 
@@ -33,6 +35,9 @@ class System(block.Filter, block.BufferBlock):
             kwargs['mux'] = True
         elif not kwargs.get('mux'):
             raise block.BlockException('System must have `mux` equal to `True`.')
+
+        # preallocated input for scalar signals
+        self._uk = numpy.zeros(0)
             
         super().__init__(**kwargs)
 
@@ -59,6 +64,18 @@ class System(block.Filter, block.BufferBlock):
         Calls :py:meth:`pyctrl.system.System.set_output` for :py:attr:`model` with 0.
         """
         self.model.set_output(numpy.zeros(self.model.shape()[1]))
+
+    def _mux(self, values):
+        # the model consumes its input before write returns, so scalar
+        # values can be copied into the same preallocated array every time
+        for v in values:
+            if not isinstance(v, (int, float)):
+                return numpy.hstack(values)
+        uk = self._uk
+        if uk.size != len(values):
+            uk = self._uk = numpy.zeros(len(values))
+        uk[:] = values
+        return uk
         
     def write(self, *values):
         """
@@ -136,7 +153,7 @@ class TimeVaryingSystem(block.Filter, block.BufferBlock):
         uk = self.buffer[0]
         self.buffer = (self.model.update(uk[0], uk[1:]), )
 
-class Gain(block.Filter, block.BufferBlock):
+class Gain(block.Filter, block.SlottedBufferBlock):
     """
     *Gain* multiplies input by a constant gain, that is
 
@@ -146,6 +163,9 @@ class Gain(block.Filter, block.BufferBlock):
 
     :param gain: multiplier (default `1`)
     """
+
+    __slots__ = ('gain', )
+
     def __init__(self, **kwargs):
 
         gain = kwargs.pop('gain', 1)
@@ -427,6 +447,8 @@ class Sum(Gain):
     :param float gain: multiplier (default `1`)
     """
 
+    __slots__ = ()
+
     def write(self, *values):
         """
         Writes product of `gain` times the sum of the current input to the private `buffer`.
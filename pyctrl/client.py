@@ -22,8 +22,13 @@ class Controller(pyctrl.Controller):
     :py:class:`pyctrl.client.Controller` provides a controller that can
     remotely interact with a server.
 
-    :param host: host name or id address (default: 'localhost')
+    Use a `host` of the form `unix://path` to connect to a server
+    listening on the Unix domain socket `path` on the same host;
+    `port` is then ignored.
+
+    :param host: host name, id address or `unix://path` (default: 'localhost')
     :param port: port numer (default: 9999)
+    :param nodelay: whether to disable Nagle's algorithm on TCP connections (default: True)
     """
     
     def __init__(self, **kwargs):
@@ -31,6 +36,7 @@ class Controller(pyctrl.Controller):
         # parameters
         self.host = kwargs.pop('host', 'localhost')
         self.port = kwargs.pop('port', 9999)
+        self.nodelay = kwargs.pop('nodelay', True)
 
         self.socket = None
         self.shutdown_request = False
@@ -71,8 +77,16 @@ class Controller(pyctrl.Controller):
     def open(self):
         # Open a socket
         if self.socket is None:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.connect((self.host, self.port))
+            if self.host.startswith('unix://'):
+                self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.socket.connect(self.host[len('unix://'):])
+            else:
+                self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                if self.nodelay:
+                    # do not hold small requests back
+                    self.socket.setsockopt(socket.IPPROTO_TCP,
+                                           socket.TCP_NODELAY, 1)
+                self.socket.connect((self.host, self.port))
         else:
             warnings.warn("Socket already open")
 
@@ -99,14 +113,17 @@ class Controller(pyctrl.Controller):
         if self.debug > 0:
             print("> Will request command '{}'"
                   .format(command))
-        self.socket.send(packet.pack('C', command))
+        buffer = [packet.pack('C', command)]
 
         # Send arguments to server
         for (argtype, argvalue) in (vargs[i:i+2] for i in range(0, n, 2)):
             if self.debug > 0:
                 print("> Will send argument '{}({})'"
                       .format(argtype, argvalue))
-            self.socket.send(packet.pack(argtype, argvalue))
+            buffer.append(packet.pack(argtype, argvalue))
+
+        # command and arguments go out in a single write
+        self.socket.sendall(b''.join(buffer))
 
         # Wait for output
         if self.debug > 0:
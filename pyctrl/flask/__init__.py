@@ -1,4 +1,7 @@
 import flask.json as json
+import struct
+import functools
+import numpy
 
 import pyctrl
 import pyctrl.block
@@ -6,21 +9,52 @@ import importlib
 
 # json
 
+@functools.lru_cache(maxsize = None)
+def get_class(module_name, class_name):
+    """
+    Memoized lookup of classes by module and class name.
+
+    :param str module_name: the module name
+    :param str class_name: the class name
+    :return: the class
+    """
+    return getattr(importlib.import_module(module_name), class_name)
+
+@functools.lru_cache(maxsize = None)
+def _schema(klass):
+    # class and module names and, for objects other than blocks, the
+    # public properties that can be set, such as DTSS matrices
+    properties = []
+    if not issubclass(klass, pyctrl.block.Block):
+        for k in klass.__mro__:
+            for (key, value) in vars(k).items():
+                if isinstance(value, property) and value.fset is not None \
+                   and not key.startswith('_') and key not in properties:
+                    properties.append(key)
+    return (klass.__name__, klass.__module__, tuple(properties))
+
 class JSONEncoder(json.JSONEncoder):
     
     def default(self, obj):
         # Convert objects to a dictionary of their representation
-        d = { '__class__': obj.__class__.__name__, 
-              '__module__': type(obj).__module__ }
+        (class_name, module_name, properties) = _schema(type(obj))
+        d = { '__class__': class_name, 
+              '__module__': module_name }
         if isinstance(obj, pyctrl.block.Block):
             d.update(obj.get())
-        elif d['__module__'] == 'numpy':
+        elif module_name == 'numpy':
             d.update({
                 '__class__': 'array',
                 'object': obj.tolist()
             })
         else:
-            d.update(obj.__dict__)
+            # skip private attributes, such as cached coefficients
+            d.update({k: v for (k, v) in obj.__dict__.items()
+                      if not k.startswith('_')})
+            # include public properties that can be set
+            for k in properties:
+                if k not in d:
+                    d[k] = getattr(obj, k)
         return d
 
 class JSONDecoder(json.JSONDecoder):
@@ -30,29 +64,106 @@ class JSONDecoder(json.JSONDecoder):
 
     def dict_to_object(self, d):
         if '__class__' in d:
-            class_name = d.pop('__class__')
-            module_name = d.pop('__module__')
-            kwargs = dict( (key, value)
-                           for key, value in d.items() )
-
-            #print('class_name = {}'.format(class_name))
-            #print('module_name = {}'.format(module_name))
-            #print('kwargs = {}'.format(kwargs))
+            klass = get_class(d.pop('__module__'), d.pop('__class__'))
 
             try:
                 
                 # try to call constructor first
-                inst = getattr(importlib.import_module(module_name), 
-                               class_name)(**kwargs)
+                inst = klass(**d)
 
             except pyctrl.block.BlockException:
 
                 # construct first then update
-                inst = getattr(importlib.import_module(module_name), 
-                               class_name)()
+                inst = klass()
                 
-                inst.__dict__.update(kwargs)
+                for (key, value) in d.items():
+                    setattr(inst, key, value)
                 
         else:
             inst = d
         return inst
+
+def dumps(obj, compact = True):
+    """
+    Serialize controllers, blocks and systems to json.
+
+    Compact output has no indentation or spaces and is encoded
+    several times faster than indented output.
+
+    :param obj: the object
+    :param bool compact: whether to produce compact output (default `True`)
+    :return: json string
+    """
+    if compact:
+        return JSONEncoder(sort_keys = True, separators = (',', ':')).encode(obj)
+    else:
+        return JSONEncoder(sort_keys = True, indent = 4).encode(obj)
+
+def loads(s):
+    """
+    Deserialize controllers, blocks and systems from json.
+
+    :param str s: json string
+    :return: the object
+    """
+    return JSONDecoder().decode(s)
+
+# binary
+
+def flatten_arrays(obj, prefix = ''):
+    """
+    Flatten nested dictionaries of numbers and arrays.
+
+    Labels of nested values are joined by `'/'`, as in `'log/clock'`.
+
+    :param obj: a number, an array or a dictionary of those
+    :param str prefix: label of `obj`
+    :return: list of tuples `(label, array)`
+    :raise: `TypeError` if `obj` contains non numeric values
+    """
+    if isinstance(obj, dict):
+        retval = []
+        for (key, value) in obj.items():
+            retval.extend(flatten_arrays(value,
+                                         prefix + '/' + key if prefix else key))
+        return retval
+    value = numpy.asarray(obj)
+    if not (numpy.issubdtype(value.dtype, numpy.number) or
+            value.dtype == bool):
+        raise TypeError("'{}' is not numeric".format(prefix))
+    return [(prefix, value)]
+
+def encode_arrays(arrays):
+    """
+    Encode arrays as raw little-endian `float64` bytes.
+
+    The result is a little-endian `uint32` with the size of a JSON
+    header holding the labels and shapes, the header, then the values
+    of all arrays in C order.
+
+    :param list arrays: list of tuples `(label, array)`
+    :return: bytes
+    """
+    header = json.dumps({ 'labels': [label for (label, value) in arrays],
+                          'shapes': [numpy.shape(value) for (label, value) in arrays],
+                          'dtype': '<f8' }).encode('utf-8')
+    return b''.join([struct.pack('<I', len(header)), header] +
+                    [numpy.ascontiguousarray(value, dtype = '<f8').tobytes()
+                     for (label, value) in arrays])
+
+def decode_arrays(data):
+    """
+    Decode arrays encoded by :py:func:`pyctrl.flask.encode_arrays`.
+
+    :param bytes data: encoded arrays
+    :return: dictionary of arrays
+    """
+    (size,) = struct.unpack_from('<I', data)
+    header = json.loads(data[4:4+size].decode('utf-8'))
+    values = numpy.frombuffer(data, dtype = header['dtype'], offset = 4 + size)
+    retval, k = {}, 0
+    for (label, shape) in zip(header['labels'], header['shapes']):
+        n = int(numpy.prod(shape))
+        retval[label] = values[k:k+n].reshape(shape)
+        k += n
+    return retval
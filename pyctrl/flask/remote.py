@@ -0,0 +1,263 @@
+"""
+This module lets :py:class:`pyctrl.flask.server.Server` run in a process other than the one running the controller.
+
+Flask handles requests in threads that share the interpreter lock with
+the control loop, so encoding large responses adds jitter to the
+loop. Instead, the controller process can serve its controller on a
+Unix domain socket with a :py:class:`pyctrl.flask.remote.Listener`
+and the web server, started in its own process with
+:py:func:`pyctrl.flask.remote.start_server`, uses a
+:py:class:`pyctrl.flask.remote.Controller` proxy:
+
+.. code-block:: python
+
+    directory = tempfile.mkdtemp()
+    address = os.path.join(directory, 'pyctrl.sock')
+    authkey = os.urandom(32)
+    controller = pyctrl.timer.Controller(period = .01)
+    listener = remote.Listener(controller, address, authkey)
+    listener.start()
+    process = remote.start_server(address, authkey, host = '0.0.0.0')
+
+Calls and results are pickled by :py:mod:`multiprocessing.connection`,
+so only the call itself runs in the controller process; encoding json
+and rendering pages happen in the web server process. Anybody who can
+connect to the socket can run code in the controller process: place
+it in a directory only its owner can access, as
+:py:func:`tempfile.mkdtemp` does, and use a random `authkey`. The
+socket itself is only accessible by its owner.
+"""
+
+import os
+import threading
+import itertools
+import functools
+import multiprocessing
+from multiprocessing import connection
+
+class Subscription:
+    """
+    :py:class:`pyctrl.flask.remote.Subscription` reads a :py:class:`pyctrl.block.container.Subscription` in the controller process.
+
+    :param controller: an instance of :py:class:`pyctrl.flask.remote.Controller`
+    :param int key: the key of the subscription in the controller process
+    """
+
+    def __init__(self, controller, key):
+        self.controller = controller
+        self.key = key
+
+    def get(self, timeout = None):
+        """
+        Get all queued values, see :py:meth:`pyctrl.block.container.Subscription.get`.
+        """
+        return self.controller._call('get_subscription', self.key, timeout)
+
+class Controller:
+    """
+    :py:class:`pyctrl.flask.remote.Controller` is a proxy for a controller served by a :py:class:`pyctrl.flask.remote.Listener`.
+
+    Public methods are called in the controller process. Each thread
+    opens its own connection, so that a call waiting on the
+    controller does not hold back calls from other threads.
+
+    :param str address: path of the Unix domain socket
+    :param bytes authkey: authentication key (default `None`)
+    """
+
+    def __init__(self, address, authkey = None):
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def _call(self, name, *args, **kwargs):
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = self._local.connection \
+                = connection.Client(self.address, family = 'AF_UNIX',
+                                    authkey = self.authkey)
+        try:
+            conn.send((name, args, kwargs))
+            (status, value) = conn.recv()
+        except (EOFError, OSError):
+            # connect again on the next call
+            self.close()
+            raise
+        if status == 'error':
+            raise value
+        return value
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return functools.partial(self._call, name)
+
+    def apply(self, function, *args, **kwargs):
+        """
+        Call `function(controller, *args, **kwargs)` in the controller process.
+
+        :param function: a module level function, which is pickled by name
+        :return: the result of the call
+        """
+        return self._call('apply', function, *args, **kwargs)
+
+    def subscribe(self, *labels, **kwargs):
+        """
+        Subscribe to the values of signals, see :py:meth:`pyctrl.block.container.Container.subscribe`.
+
+        :return: an instance of :py:class:`pyctrl.flask.remote.Subscription`
+        """
+        return Subscription(self, self._call('subscribe', *labels, **kwargs))
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscription returned by :py:meth:`pyctrl.flask.remote.Controller.subscribe`.
+        """
+        self._call('unsubscribe', subscription.key)
+
+    def close(self):
+        """
+        Close the connection of the calling thread.
+        """
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            self._local.connection = None
+            conn.close()
+
+class Listener:
+    """
+    :py:class:`pyctrl.flask.remote.Listener` serves a controller on a Unix domain socket.
+
+    Each connection is handled in its own thread.
+
+    :param controller: an instance of :py:class:`pyctrl.Controller`
+    :param str address: path of the Unix domain socket
+    :param bytes authkey: authentication key (default `None`)
+    """
+
+    def __init__(self, controller, address, authkey = None):
+        self.controller = controller
+        self.subscriptions = {}
+        self._keys = itertools.count()
+        self._listener = connection.Listener(address, family = 'AF_UNIX',
+                                             authkey = authkey)
+        self.address = self._listener.address
+        os.chmod(self.address, 0o600)
+        self.authkey = authkey
+        self._thread = None
+        self._closing = False
+
+    def start(self):
+        """
+        Start accepting connections.
+        """
+        self._thread = threading.Thread(target = self._accept, daemon = True)
+        self._thread.start()
+
+    def close(self):
+        """
+        Stop accepting connections and remove the socket.
+        """
+        if self._thread is not None:
+            self._closing = True
+            # wake up accept
+            try:
+                connection.Client(self.address, family = 'AF_UNIX',
+                                  authkey = self.authkey).close()
+            except OSError:
+                pass
+            self._thread.join()
+            self._thread = None
+        self._listener.close()
+
+    def _accept(self):
+        while not self._closing:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, connection.AuthenticationError):
+                continue
+            threading.Thread(target = self._handle, args = (conn,),
+                             daemon = True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    (name, args, kwargs) = conn.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    message = ('success', self.call(name, *args, **kwargs))
+                except Exception as e:
+                    message = ('error', e)
+                try:
+                    conn.send(message)
+                except (EOFError, OSError):
+                    break
+                except Exception as e:
+                    # result could not be pickled
+                    conn.send(('error', Exception('{}: {}'.format(type(e).__name__, e))))
+
+    def call(self, name, *args, **kwargs):
+        """
+        Call method `name` of the controller.
+
+        :param str name: the method name
+        :return: the result of the call
+        """
+        if name == 'apply':
+            return args[0](self.controller, *args[1:], **kwargs)
+
+        elif name == 'set_controller':
+            from pyctrl.flask.server import make_controller
+            controller = make_controller(**kwargs)
+            if controller is None:
+                raise Exception('No controller given')
+            self.controller = controller
+
+        elif name == 'subscribe':
+            key = next(self._keys)
+            self.subscriptions[key] = (self.controller,
+                                       self.controller.subscribe(*args, **kwargs))
+            return key
+
+        elif name == 'unsubscribe':
+            (controller, subscription) = self.subscriptions.pop(args[0])
+            controller.unsubscribe(subscription)
+
+        elif name == 'get_subscription':
+            return self.subscriptions[args[0]][1].get(*args[1:])
+
+        elif name.startswith('_'):
+            raise AttributeError("'{}' is not public".format(name))
+
+        else:
+            return getattr(self.controller, name)(*args, **kwargs)
+
+def _run_server(address, authkey, kwargs):
+    # web server process
+    from pyctrl.flask.server import Server
+    app = Server('pyctrl.flask.server')
+    app.config['SECRET_KEY'] = kwargs.pop('secret_key', 'secret!')
+    app.set_controller(controller = Controller(address, authkey))
+    app.run(**kwargs)
+
+def start_server(address, authkey = None, **kwargs):
+    """
+    Start a :py:class:`pyctrl.flask.server.Server` in a new process.
+
+    The server uses the controller served by a
+    :py:class:`pyctrl.flask.remote.Listener` on `address`. The
+    process is started with the `spawn` method, so it shares no
+    threads or locks with the controller process.
+
+    :param str address: path of the Unix domain socket
+    :param bytes authkey: authentication key (default `None`)
+    :param kwargs kwargs: keyword arguments for :py:meth:`flask.Flask.run`, such as `host` and `port`
+    :return: the :py:class:`multiprocessing.Process` running the server
+    """
+    process = multiprocessing.get_context('spawn').Process(target = _run_server,
+                                                           args = (address, authkey, kwargs),
+                                                           daemon = True)
+    process.start()
+    return process
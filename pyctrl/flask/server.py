@@ -1,14 +1,19 @@
-from flask import Flask, request, render_template, jsonify, make_response, redirect, flash, url_for
+from flask import Flask, Response, request, render_template, jsonify, make_response, redirect, flash, url_for
 from functools import wraps
 import re
+import json
+import uuid
 
 import pyctrl
 from pyctrl.block import Logger
 import warnings
 import importlib
 import traceback, sys, io
+import copy
+import numpy
 
-from pyctrl.flask import JSONEncoder, JSONDecoder
+from pyctrl.flask import JSONEncoder, JSONDecoder, dumps, flatten_arrays, encode_arrays
+from pyctrl.flask import remote
 
 encoder = JSONEncoder(sort_keys = True, indent = 4)
 decoder = JSONDecoder()
@@ -48,20 +53,25 @@ def decode_kwargs(f):
 
     return wrapper
 
+# call
+def call(f, *args, **kwargs):
+    try:
+        retval = f(*args, **kwargs)
+        if retval is None:
+            retval = { 'status': 'success' }
+    except Exception as e:
+        message = io.StringIO()
+        traceback.print_exc(file=message)
+        retval = { 'status': 'error',
+                   'message': message.getvalue() }
+    return retval
+
 # json_response
 def json_response(f):
     
     @wraps(f)
     def wrapper(*args, **kwargs):
-        try:
-            retval = f(*args, **kwargs)
-            if retval is None:
-                retval = { 'status': 'success' }
-        except Exception as e:
-            message = io.StringIO()
-            traceback.print_exc(file=message)
-            retval = { 'status': 'error',
-                       'message': message.getvalue() }
+        retval = call(f, *args, **kwargs)
             
         next = request.args.get('next', None)
         if next:
@@ -73,6 +83,157 @@ def json_response(f):
         
     return wrapper
 
+# array_response
+def array_response(f):
+    """
+    Like `json_response` but return numeric results as binary when
+    requested in the `Accept` header:
+
+    1. `application/octet-stream`: as encoded by :py:func:`pyctrl.flask.encode_arrays`;
+    2. `application/x-npz`: as a NumPy `.npz` archive.
+
+    Labels of nested results are joined by `'/'`. Errors and non
+    numeric results are returned as json.
+    """
+    
+    json_wrapper = json_response(f)
+    
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        mimetype = request.accept_mimetypes.best_match(['application/json',
+                                                        'application/octet-stream',
+                                                        'application/x-npz'],
+                                                       'application/json')
+        if mimetype == 'application/json':
+            return json_wrapper(*args, **kwargs)
+        
+        retval = call(f, *args, **kwargs)
+        try:
+            if retval.get('status', None) == 'error':
+                raise TypeError('error')
+            arrays = flatten_arrays(retval)
+        except (TypeError, AttributeError):
+            return jsonify(retval)
+
+        if mimetype == 'application/x-npz':
+            data = io.BytesIO()
+            numpy.savez(data, **dict(arrays))
+            data = data.getvalue()
+        else:
+            data = encode_arrays(arrays)
+            
+        response = make_response(data)
+        response.headers['Content-Type'] = mimetype
+        return response
+        
+    return wrapper
+
+# cached_response
+def cached_response(f):
+    """
+    Cache responses on the structural version of the controller, see
+    :py:meth:`pyctrl.block.container.Container.get_version`.
+
+    Responses carry an `ETag` with the version, so that clients that
+    already have the current version get an empty `304` response.
+    """
+    
+    @wraps(f)
+    def wrapper(self, *args, **kwargs):
+        etag = '{}-{}'.format(self.token, self.controller.get_version())
+        if etag in request.if_none_match:
+            response = make_response('', 304)
+        else:
+            key = request.full_path
+            cached = self.cache.get(key)
+            if cached is None or cached[0] != etag:
+                response = make_response(f(self, *args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                cached = (etag, response.get_data(), response.mimetype)
+                self.cache[key] = cached
+            response = make_response(cached[1])
+            response.mimetype = cached[2]
+        response.set_etag(etag)
+        return response
+        
+    return wrapper
+
+# controller
+
+def make_controller(**kwargs):
+    """
+    Create a new controller or check an existing one.
+
+    :param str module: name of the controller module (default 'pyctrl')
+    :param str pyctrl_class: name of the controller class (default 'Controller')
+    :param dict kwargs: keyword arguments for the controller class
+    :param controller: an existing controller, instead of the above
+    :param str json: a controller encoded in json, instead of the above
+    :return: the controller or `None` if no controller was given
+    """
+
+    # decode controller?
+    if 'json' in kwargs:
+        kwargs['controller'] = decoder.decode(kwargs.pop('json'))
+
+    # Create new controller?
+    if 'module' in kwargs or 'pyctrl_class' in kwargs:
+
+        module = kwargs.pop('module', 'pyctrl')
+        pyctrl_class = kwargs.pop('pyctrl_class', 'Controller')
+        ckwargs = kwargs.pop('kwargs', {})
+
+        if len(kwargs) > 0:
+            raise Exception("webserver.reset():: Unknown parameter(s) '{}'".format(', '.join(str(k) for k in kwargs.keys())))
+        
+        try:
+
+            if True:
+                warnings.warn("> Installing new instance of '{}.{}({})' as controller".format(module, pyctrl_class, ckwargs))
+                
+            obj_class = getattr(importlib.import_module(module),
+                                pyctrl_class)
+            controller = obj_class(**ckwargs)
+
+            # Make sure it is an instance of pyctrl.Controller
+            if not isinstance(controller, pyctrl.Controller):
+                raise Exception("Object '{}.{}' is not and instance of pyctrl.Controller".format(module, pyctrl_class))
+
+            return controller
+
+        except Exception as e:
+
+            raise Exception("Error resetting controller: {}".format(e))
+
+    elif 'controller' in kwargs:
+
+        controller = kwargs.pop('controller')
+
+        # Make sure it is an instance of pyctrl.Controller
+        if not isinstance(controller, (pyctrl.Controller, remote.Controller)):
+            raise Exception("Object '{}' is not and instance of pyctrl.Controller".format(controller))
+                
+        return controller
+
+# controller queries, run in the controller process, see Server.apply
+
+def get_block(controller, type_name, label):
+    (container, label) = controller.resolve_label(label)
+    blk = getattr(container, type_name)[label]['block']
+    # detach from parent, which is not needed and may not be picklable
+    blk = copy.copy(blk)
+    blk.set_parent(None)
+    return blk
+
+def html_block(controller, type_name, label):
+    (container, label) = controller.resolve_label(label)
+    return getattr(container, type_name)[label]['block'].html()
+
+def list_loggers(controller):
+    return [ label for (label, device) in controller.sinks.items()
+             if isinstance(device['block'], Logger) ]
+
 # Server class
 
 class Server(Flask):
@@ -82,6 +243,10 @@ class Server(Flask):
         self.controller = None
         self.base_url = ''
 
+        # responses cached by cached_response
+        self.token = uuid.uuid4().hex
+        self.cache = {}
+
         # call super
         super().__init__(*args, **kwargs)
 
@@ -132,6 +297,16 @@ class Server(Flask):
                          view_func = self.set_signal)
         self.add_url_rule(self.base_url + '/list/signals',
                          view_func = self.list_signals)
+        self.add_url_rule(self.base_url + '/list/sources',
+                         view_func = self.list_sources)
+        self.add_url_rule(self.base_url + '/list/filters',
+                         view_func = self.list_filters)
+        self.add_url_rule(self.base_url + '/list/sinks',
+                         view_func = self.list_sinks)
+        self.add_url_rule(self.base_url + '/list/timers',
+                         view_func = self.list_timers)
+        self.add_url_rule(self.base_url + '/stream/signals',
+                         view_func = self.stream_signals)
 
         # sources
         self.add_url_rule(self.base_url + '/add/source/<path:label>/<module_name>/<class_name>',
@@ -184,48 +359,25 @@ class Server(Flask):
         
     def set_controller(self, **kwargs):
 
-        # Create new controller?
-        if 'module' in kwargs or 'pyctrl_class' in kwargs:
-
-            module = kwargs.pop('module', 'pyctrl')
-            pyctrl_class = kwargs.pop('pyctrl_class', 'Controller')
-            ckwargs = kwargs.pop('kwargs', {})
-
-            if len(kwargs) > 0:
-                raise Exception("webserver.reset():: Unknown parameter(s) '{}'".format(', '.join(str(k) for k in kwargs.keys())))
+        # install new controller in the controller process?
+        if isinstance(self.controller, remote.Controller) and \
+           not isinstance(kwargs.get('controller'), remote.Controller):
+            return self.controller.set_controller(**kwargs)
         
-            try:
-
-                if True:
-                    warnings.warn("> Installing new instance of '{}.{}({})' as controller".format(module, pyctrl_class, ckwargs))
-                
-                obj_class = getattr(importlib.import_module(module),
-                                    pyctrl_class)
-                controller = obj_class(**ckwargs)
-
-                # print('obj_class = {}'.format(obj_class))
-                # print('_controller = {}'.format(_controller))
-            
-                # Make sure it is an instance of pyctrl.Controller
-                if not isinstance(controller, pyctrl.Controller):
-                    raise Exception("Object '{}.{}' is not and instance of pyctrl.Controller".format(module, pyctrl_class))
-
-                self.controller = controller
-
-            except Exception as e:
-
-                raise Exception("Error resetting controller: {}".format(e))
-
-        elif 'controller' in kwargs:
-
-            controller = kwargs.pop('controller')
-
-            # Make sure it is an instance of pyctrl.Controller
-            if not isinstance(controller, pyctrl.Controller):
-                raise Exception("Object '{}.{}' is not and instance of pyctrl.Controller".format(module, pyctrl_class))
-                
+        controller = make_controller(**kwargs)
+        if controller is not None:
             self.controller = controller
 
+    def apply(self, function, *args):
+        """
+        Call `function(controller, *args)`, in the controller process
+        if the controller is an instance of
+        :py:class:`pyctrl.flask.remote.Controller`.
+        """
+        if isinstance(self.controller, remote.Controller):
+            return self.controller.apply(function, *args)
+        return function(self.controller, *args)
+
     # auxiliary
 
     def get_keys(self, method, type_name,
@@ -237,9 +389,6 @@ class Server(Flask):
             keys = [keys]
         print('keys = {}'.format(keys))
                 
-        # get container
-        (container,label) = self.controller.resolve_label(label)
-                
         if keys:
             # return attributes
             if len(keys) > 1:
@@ -247,17 +396,19 @@ class Server(Flask):
             else:
                 return {keys[0]: method(label, *keys)}
         else:
-            # return container
-            return {label:
-                    getattr(container, type_name)[label]['block']}
+            # return block under its local label
+            return {label.split('/')[-1]:
+                    self.apply(get_block, type_name, label)}
 
     
     # handlers
         
+    @cached_response
     def index(self):
         
-        sinks = [ {'label': k, 'is_logger': isinstance(v['block'], Logger)}
-                  for (k,v) in self.controller.sinks.items() ]
+        loggers = self.apply(list_loggers)
+        sinks = [ {'label': k, 'is_logger': k in loggers}
+                  for k in self.controller.list_sinks() ]
         
         return render_template('index.html',
                                baseurl = self.base_url,
@@ -269,6 +420,7 @@ class Server(Flask):
                                timers = self.controller.list_timers(),
                                is_running = self.controller.get_signal('is_running'))
 
+    @cached_response
     def info(self):
 
         return self.controller.html()
@@ -279,8 +431,11 @@ class Server(Flask):
                                baseurl = self.base_url,
                                logger = label)
 
-    def download(self):
-        response = make_response(jsonify(self.controller))
+    @decode_kwargs
+    def download(self, compact = True):
+        # encoded where the controller runs
+        response = make_response(self.apply(dumps, compact))
+        response.mimetype = 'application/json'
         response.headers["Content-Disposition"] \
             = "attachment; filename=controller.json"
         return response
@@ -305,11 +460,9 @@ class Server(Flask):
 
                 else:
 
-                    # there is a file
+                    # there is a file, decoded where the controller runs
                     try:
-                        controller = decoder.decode(file.read().decode('utf-8'))
-                        # print('controller = {}'.format(controller))
-                        self.set_controller(controller = controller)
+                        self.set_controller(json = file.read().decode('utf-8'))
                         flash('New controller succesfully loaded.')
                         
                     except Exception as e:
@@ -352,19 +505,75 @@ class Server(Flask):
     def remove_signal(self, *args, **kwargs):
         return self.controller.remove_signal(*args, **kwargs)
                       
-    @json_response
+    @array_response
     def get_signal(self, label, *args, **kwargs):
-        return {label: self.controller.get_signal(label, *args, **kwargs)}
+        # read from the published snapshot, which is safe while running
+        return {label: self.controller.get_snapshot(label)[0]}
     
     @json_response
     @decode_value
     def set_signal(self, *args, **kwargs):
         return self.controller.set_signal(*args, **kwargs)
     
+    @cached_response
     @json_response
     def list_signals(self):
         return self.controller.list_signals()
 
+    @cached_response
+    @json_response
+    def list_sources(self):
+        return self.controller.list_sources()
+
+    @cached_response
+    @json_response
+    def list_filters(self):
+        return self.controller.list_filters()
+
+    @cached_response
+    @json_response
+    def list_sinks(self):
+        return self.controller.list_sinks()
+
+    @cached_response
+    @json_response
+    def list_timers(self):
+        return self.controller.list_timers()
+
+    @decode_kwargs
+    def stream_signals(self, labels = (), timeout = 15, **kwargs):
+        """
+        Stream the values of the signals in `labels` as server-sent
+        events. Each event carries a json list with the rows queued
+        since the last event. Remaining arguments, such as `decimate`
+        and `maxsize`, are passed to
+        :py:meth:`pyctrl.block.container.Container.subscribe`. A
+        comment is sent every `timeout` seconds without values to
+        detect closed connections.
+        """
+        if isinstance(labels, str):
+            labels = [labels]
+        controller = self.controller
+        retval = call(controller.subscribe, *labels, **kwargs)
+        if isinstance(retval, dict):
+            return jsonify(retval)
+        
+        def events(subscription):
+            try:
+                yield 'event: labels\ndata: {}\n\n'.format(json.dumps(labels))
+                while True:
+                    rows = subscription.get(timeout)
+                    if rows:
+                        yield 'data: {}\n\n'.format(json.dumps(rows, default = lambda obj: obj.tolist()))
+                    else:
+                        yield ': keep-alive\n\n'
+            finally:
+                controller.unsubscribe(subscription)
+
+        return Response(events(retval),
+                        mimetype = 'text/event-stream',
+                        headers = {'Cache-Control': 'no-cache'})
+
     # sources
     @json_response
     @decode_kwargs
@@ -389,9 +598,7 @@ class Server(Flask):
 
     @decode_kwargs
     def html_source(self, label, *args, **kwargs):
-        # get container
-        (container,label) = self.controller.resolve_label(label)
-        return self.controller.sources[label]['block'].html();
+        return self.apply(html_block, 'sources', label)
     
     # filters
     @json_response
@@ -418,9 +625,7 @@ class Server(Flask):
     
     @decode_kwargs
     def html_filter(self, label, *args, **kwargs):
-        # get container
-        (container,label) = self.controller.resolve_label(label)
-        return self.controller.filters[label]['block'].html();
+        return self.apply(html_block, 'filters', label)
     
     # sinks
     @json_response
@@ -434,7 +639,7 @@ class Server(Flask):
     def remove_sink(self, *args, **kwargs):
         return self.controller.remove_sink(*args, **kwargs)
     
-    @json_response
+    @array_response
     @decode_kwargs
     def get_sink(self, label, *args, **kwargs):
         return self.get_keys(self.controller.get_sink, 'sinks',
@@ -447,9 +652,7 @@ class Server(Flask):
     
     @decode_kwargs
     def html_sink(self, label, *args, **kwargs):
-        # get container
-        (container,label) = self.controller.resolve_label(label)
-        return self.controller.sinks[label]['block'].html();
+        return self.apply(html_block, 'sinks', label)
     
     # timers
     @json_response
@@ -476,9 +679,7 @@ class Server(Flask):
 
     @decode_kwargs
     def html_timer(self, label, *args, **kwargs):
-        # get container
-        (container,label) = self.controller.resolve_label(label)
-        return self.controller.timers[label]['block'].html();
+        return self.apply(html_block, 'timers', label)
 
 if __name__ == "__main__":
 
@@ -495,17 +696,45 @@ if __name__ == "__main__":
         debug = True
         RCPY = False
 
+    # run the web server in its own process?
+    PROCESS = '--process' in sys.argv
+
     try:
-        
-        app = Server(__name__)
-        app.config['SECRET_KEY'] = 'secret!'
-        
-        # initialize controller
-        app.set_controller(controller = Controller(period = .01))
-        
-        # run app
-        app.run(host='0.0.0.0',
-                debug = debug)
+
+        if PROCESS:
+
+            import tempfile
+
+            # serve controller to the web server process on a socket
+            # in a directory only this user can access, protected by
+            # a random key
+            directory = tempfile.mkdtemp(prefix = 'pyctrl-')
+            address = os.path.join(directory, 'pyctrl.sock')
+            authkey = os.urandom(32)
+            listener = remote.Listener(Controller(period = .01), address, authkey)
+            listener.start()
+
+            # run app
+            try:
+                remote.start_server(address, authkey,
+                                    host='0.0.0.0',
+                                    debug = debug,
+                                    use_reloader = False).join()
+            finally:
+                listener.close()
+                os.rmdir(directory)
+
+        else:
+            
+            app = Server(__name__)
+            app.config['SECRET_KEY'] = 'secret!'
+
+            # initialize controller
+            app.set_controller(controller = Controller(period = .01))
+
+            # run app
+            app.run(host='0.0.0.0',
+                    debug = debug)
 
     except:
         pass
@@ -1,4 +1,7 @@
 import warnings
+import os
+import stat
+import socket
 import socketserver
 import threading
 import time
@@ -141,9 +144,10 @@ def set_controller(_controller = pyctrl.Controller(noclock = True)):
               'Add signal'),
         'D': ('SD', '', controller.set_signal,
               'Set signal'),
-        'E': ('S', 'D', controller.get_signal,
+        # signals are read from the published snapshot
+        'E': ('S', 'D', lambda label: controller.get_snapshot(label)[0],
               'Get signal'),
-        'e': ('R', 'R', controller.get_signals,
+        'e': ('R', 'R', lambda *labels: controller.get_snapshot(*labels) if labels else [],
               'Get signal'),
         'F': ('', 'P', controller.list_signals,
               'List signals'),
@@ -240,6 +244,13 @@ class Handler(socketserver.StreamRequestHandler):
 
     #def __init__(self, request, client_address, server):
         #super().__init__(request, client_address, server)
+
+    def setup(self):
+        # do not hold small replies back on TCP connections
+        if self.request.family in (socket.AF_INET, socket.AF_INET6):
+            self.request.setsockopt(socket.IPPROTO_TCP,
+                                    socket.TCP_NODELAY, 1)
+        super().setup()
     
     def handle(self):
         
@@ -352,3 +363,26 @@ class Handler(socketserver.StreamRequestHandler):
             print('>>> Exiting server::handle loop')
             print('>>> controller state = {}'.format(controller.get_state()))
            
+
+class TCPServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+def make_server(host = '0.0.0.0', port = 9999):
+    """
+    Create a server for :py:class:`pyctrl.server.Handler`.
+
+    Use a `host` of the form `unix://path` to listen on the Unix
+    domain socket `path` instead of on a TCP port, which is faster
+    for clients on the same host. A stale socket file at `path` is
+    removed.
+
+    :param str host: host name, ip address or `unix://path` (default '0.0.0.0')
+    :param int port: port number (default 9999)
+    :return: an instance of :py:class:`socketserver.TCPServer` or :py:class:`socketserver.UnixStreamServer`
+    """
+    if host.startswith('unix://'):
+        path = host[len('unix://'):]
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        return socketserver.UnixStreamServer(path, Handler)
+    return TCPServer((host, port), Handler)
@@ -98,7 +98,7 @@ class Controller(pyctrl.Controller):
                                      ['clock'],
                                      enable = True,
                                      kwargs = {'period': self.period})
-        self.signals['clock'] = self.clock.time
+        self.set_signal('clock', self.clock.time)
         self.time_origin = self.clock.time_origin
 
         # add signals
@@ -0,0 +1,207 @@
+"""
+This module provides functions for discretizing continuous-time models.
+
+Discretizations are memoized on `(model, period, method)` in a least
+recently used cache, so that switching between a few models or
+periods at runtime, as in gain-scheduled controllers, only pays for
+matrix exponentials and root finding the first time.
+"""
+
+import math
+import functools
+import numpy
+
+from .. import system
+from . import tf
+from . import ss
+
+# cache size
+maxsize = 128
+
+# Pade coefficients for expm
+_pade = [math.factorial(12 - k) * math.factorial(6) /
+         (math.factorial(12) * math.factorial(k) * math.factorial(6 - k))
+         for k in range(7)]
+
+def expm(A):
+    """
+    Matrix exponential computed by scaling and squaring with a degree 6 Pade approximant.
+
+    :param numpy.array A: square matrix
+    :return: :math:`e^A`
+    """
+
+    A = numpy.array(A, dtype=float)
+    n = A.shape[0]
+    if n == 0:
+        return A
+
+    # scale so that norm is smaller than 1/2
+    norm = numpy.linalg.norm(A, numpy.inf)
+    s = max(0, int(math.ceil(math.log2(norm / 0.5)))) if norm > 0.5 else 0
+    A = A / 2**s
+
+    # Pade approximant
+    N = _pade[0] * numpy.eye(n)
+    D = _pade[0] * numpy.eye(n)
+    Ak = numpy.eye(n)
+    for k in range(1, 7):
+        Ak = Ak.dot(A)
+        N += _pade[k] * Ak
+        D += (-1)**k * _pade[k] * Ak
+    E = numpy.linalg.solve(D, N)
+
+    # square
+    for k in range(s):
+        E = E.dot(E)
+
+    return E
+
+def _poly(A):
+    # characteristic polynomial, also for empty matrices
+    if A.shape[0] == 0:
+        return numpy.ones(1)
+    return numpy.real(numpy.poly(A))
+
+def _poly_roots(r):
+    # polynomial with roots r, also for no roots
+    return numpy.atleast_1d(numpy.real(numpy.poly(r)))
+
+def _ss_zoh(A, B, C, D, period):
+    n, m = B.shape
+    M = numpy.zeros((n + m, n + m))
+    M[:n,:n] = A * period
+    M[:n,n:] = B * period
+    E = expm(M)
+    return (E[:n,:n], E[:n,n:], C, D)
+
+def _ss_tustin(A, B, C, D, period):
+    n = A.shape[0]
+    M = numpy.eye(n) - (period / 2) * A
+    Ad = numpy.linalg.solve(M, numpy.eye(n) + (period / 2) * A)
+    Bd = numpy.linalg.solve(M, period * B)
+    Cd = numpy.linalg.solve(M.T, C.T).T
+    Dd = D + C.dot(Bd) / 2
+    return (Ad, Bd, Cd, Dd)
+
+def _tf_zoh(model, period):
+    # go through state space
+    sys = model.as_CTSS()
+    (A, B, C, D) = _ss_zoh(sys.A, sys.B, sys.C, sys.D, period)
+    # G(z) = C (zI - A)^-1 B + D = (det(zI - A + B C) - det(zI - A)) / det(zI - A) + D
+    den = _poly(A)
+    num = _poly(A - B.dot(C)) - den + D[0,0] * den
+    return (num, den)
+
+def _tf_tustin(model, period):
+    # substitute s = (2/T) (z - 1)/(z + 1) and multiply by (z + 1)^n
+    n = model.den.size - 1
+    num = numpy.zeros(n + 1)
+    num[n + 1 - model.num.size:] = model.num
+    def substitute(p):
+        q = numpy.zeros(n + 1)
+        for (i, c) in enumerate(reversed(p)):
+            term = c * (2 / period)**i * numpy.polymul(_poly_roots(numpy.ones(i)),
+                                                       _poly_roots(-numpy.ones(n - i)))
+            q[n + 1 - term.size:] += term
+        return q
+    return (substitute(num), substitute(model.den))
+
+def _tf_matched(model, period):
+    n = model.den.size - 1
+    if not numpy.any(model.num):
+        return (numpy.zeros(n + 1), _poly_roots(numpy.exp(numpy.roots(model.den) * period)))
+    # roots at the origin are counted separately to match the low frequency gain
+    kz = model.num.size - numpy.trim_zeros(model.num, 'b').size
+    kp = model.den.size - numpy.trim_zeros(model.den, 'b').size
+    zeros = numpy.roots(numpy.trim_zeros(model.num, 'b'))
+    poles = numpy.roots(numpy.trim_zeros(model.den, 'b'))
+    # map finite roots by z = exp(s T) and zeros at infinity to z = -1
+    Nr = _poly_roots(numpy.hstack((numpy.exp(zeros * period),
+                                   -numpy.ones(n - model.num.size + 1))))
+    Dr = _poly_roots(numpy.exp(poles * period))
+    # match lim s^r G(s) as s -> 0 with lim ((z-1)/T)^r Gd(z) as z -> 1
+    r = kp - kz
+    gain = model.num[-(kz + 1)] / model.den[-(kp + 1)]
+    K = period**r * gain * numpy.polyval(Dr, 1) / numpy.polyval(Nr, 1)
+    num = K * numpy.polymul(Nr, _poly_roots(numpy.ones(kz)))
+    den = numpy.polymul(Dr, _poly_roots(numpy.ones(kp)))
+    return (num, den)
+
+@functools.lru_cache(maxsize = maxsize)
+def _c2d(model, period, method):
+
+    if isinstance(model, tf.CTTF):
+        if method == 'zoh':
+            retval = _tf_zoh(model, period)
+        elif method == 'tustin':
+            retval = _tf_tustin(model, period)
+        else: # method == 'matched'
+            retval = _tf_matched(model, period)
+
+    else: # isinstance(model, ss.CTSS)
+        if method == 'zoh':
+            retval = _ss_zoh(model.A, model.B, model.C, model.D, period)
+        elif method == 'tustin':
+            retval = _ss_tustin(model.A, model.B, model.C, model.D, period)
+        else:
+            raise system.SystemException("Method 'matched' is only available for pyctrl.system.tf.CTTF")
+
+    # make cached values immutable
+    for M in retval:
+        M.flags.writeable = False
+    return retval
+
+def c2d(model, period, method = 'zoh', state = None):
+    """
+    Discretize continuous-time model.
+
+    Available methods are:
+
+    1. `'zoh'`: zero-order hold equivalent;
+    2. `'tustin'`: bilinear (Tustin) transformation :math:`s = \\frac{2}{T} \\frac{z - 1}{z + 1}`;
+    3. `'matched'`: matched pole-zero; zeros at infinity are mapped to :math:`z = -1` and the gain is matched at low frequency. Only for :py:class:`pyctrl.system.tf.CTTF`.
+
+    Results are memoized, so repeated calls with the same model,
+    period and method are cheap. A new model, with its own state, is
+    returned every time.
+
+    :param model: an instance of :py:class:`pyctrl.system.tf.CTTF` or :py:class:`pyctrl.system.ss.CTSS`
+    :param float period: sampling period in seconds
+    :param str method: `'zoh'`, `'tustin'` or `'matched'` (default `'zoh'`)
+    :param state: initial state of the discrete-time model (default `None`)
+    :return: an instance of :py:class:`pyctrl.system.tf.DTTF` if `model` is a :py:class:`pyctrl.system.tf.CTTF` or of :py:class:`pyctrl.system.ss.DTSS` if `model` is a :py:class:`pyctrl.system.ss.CTSS`
+    :raise: :py:class:`pyctrl.system.SystemException` if `model` or `method` are not supported
+    """
+
+    if not isinstance(model, (tf.CTTF, ss.CTSS)):
+        raise system.SystemException('model must be an instance of pyctrl.system.tf.CTTF or pyctrl.system.ss.CTSS')
+
+    if method == 'bilinear':
+        method = 'tustin'
+    if method not in ('zoh', 'tustin', 'matched'):
+        raise system.SystemException("Unknown method '{}'; must be 'zoh', 'tustin' or 'matched'".format(method))
+
+    if not period > 0:
+        raise system.SystemException('period must be positive')
+
+    retval = _c2d(model, float(period), method)
+
+    if isinstance(model, tf.CTTF):
+        (num, den) = retval
+        return tf.DTTF(num, den, state)
+    else:
+        (A, B, C, D) = retval
+        return ss.DTSS(A.copy(), B.copy(), C.copy(), D.copy(), state)
+
+def cache_info():
+    """
+    :return: statistics of the discretization cache, as in :py:func:`functools.lru_cache`
+    """
+    return _c2d.cache_info()
+
+def cache_clear():
+    """
+    Clear the discretization cache.
+    """
+    _c2d.cache_clear()
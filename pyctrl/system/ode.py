@@ -1,9 +1,10 @@
 import numpy
-import scipy.integrate
-import scipy.optimize
 
 from .. import system
 
+# scipy is imported lazily: importing it is slow and memory hungry on
+# embedded targets and most controllers never construct an ODE model
+
 def identity(t, x, u, *pars):
     return x
 
@@ -83,6 +84,8 @@ class ODEBase(system.TVSystem):
         :param numpy.array yk: desired `yk`
         """
         
+        import scipy.optimize
+
         u0 = numpy.zeros(self.shp[0])
         x0 = self.state
         self.state = scipy.optimize.newton(lambda x: self.g(tk, x, u0) - yk, x0)
@@ -118,6 +121,8 @@ class ODE(ODEBase):
         # call super
         super().__init__(shape, f, g, x0, t0, pars)
 
+        import scipy.integrate
+
         # setup solver
         self.solver = scipy.integrate.ode(self.f).set_integrator('dopri5')
 
@@ -174,9 +179,14 @@ class ODEINT(ODEBase):
         # call super
         super().__init__(shape, f, g, x0, t0, pars)
 
+        import scipy.integrate
+
         # flip call to fit odeint
         self.f = lambda t, x, *pars: f(x, t, *pars)
 
+        # keep reference to odeint
+        self._odeint = scipy.integrate.odeint
+
     def update(self, tk, uk):
 
         #print('t0 = {}, tk = {}, uk = {}'.format(self.t0, tk, uk))
@@ -189,10 +199,10 @@ class ODEINT(ODEBase):
         else:
 
             # solve ode
-            yk = scipy.integrate.odeint(self.f, 
-                                        self.state, 
-                                        [self.t0, tk], 
-                                        args = (uk,) + self.pars)
+            yk = self._odeint(self.f, 
+                              self.state, 
+                              [self.t0, tk], 
+                              args = (uk,) + self.pars)
 
             # update state
             # odeint returns all state, latest is last
@@ -203,3 +213,108 @@ class ODEINT(ODEBase):
 
         # evaluate output
         return self.g(tk, self.state, uk, *self.pars)
+
+class FixedStep(ODEBase):
+    r"""
+    :py:class:`pyctrl.system.FixedStep` implements a general nonlinear time-varying continuous-time state-space model of the form:
+
+    .. math::
+
+       \dot{x} &= f(t, x, u, *pars) \\
+             y &= g(t, x, u, *pars)
+
+    Integration is performed by an explicit fixed-step method, which
+    is much cheaper per call than :py:class:`pyctrl.system.ode.ODE` or
+    :py:class:`pyctrl.system.ode.ODEINT` and therefore better suited
+    for simulating plants in real time. The interval between two
+    consecutive calls to :py:meth:`update` is divided into
+    :py:attr:`substeps` steps of equal size. The input :math:`u` is
+    held constant over the interval.
+
+    The available methods are:
+
+    1. `'euler'`: forward Euler, one evaluation of :math:`f` per step;
+    2. `'rk4'`: classic fourth-order Runge-Kutta, four evaluations of :math:`f` per step;
+    3. `'semi-implicit-euler'`: symplectic Euler, two evaluations of :math:`f` per step. The state is assumed to be partitioned as :math:`x = (q, v)` where :math:`q` has :py:attr:`split` entries; :math:`v` is updated first and :math:`q` is then updated using the derivative evaluated at the new :math:`v`. This is the method of choice for mechanical systems with :math:`\dot{q} = v`.
+
+    :param tuple shape: (m,p) where m is the number of inputs and p is the number of outputs
+    :param f: nonlinear state function :math:`f`
+    :param g: nonlinear state function :math:`g`
+    :param numpy.array x0: initial value of the state vector
+    :param float t0: initial time
+    :param vargs pars: variable positional arguments to be passed to f and g
+    :param str method: `'euler'`, `'rk4'` or `'semi-implicit-euler'` (default `'rk4'`)
+    :param int substeps: number of steps per call to :py:meth:`update` (default `1`)
+    :param int split: number of entries of :math:`q` for `'semi-implicit-euler'` (default half of the state)
+    """
+
+    def __init__(self,
+                 shape,
+                 f, g = identity, x0 = 0, t0 = -1, pars = (),
+                 method = 'rk4', substeps = 1, split = None):
+
+        # call super
+        super().__init__(shape, f, g,
+                         numpy.atleast_1d(numpy.array(x0, dtype=float)),
+                         t0, pars)
+
+        # method
+        if method == 'euler':
+            self._step = self.euler
+        elif method == 'rk4':
+            self._step = self.rk4
+        elif method == 'semi-implicit-euler':
+            self._step = self.semi_implicit_euler
+        else:
+            raise system.SystemException("Unknown method '{}'; must be 'euler', 'rk4' or 'semi-implicit-euler'".format(method))
+        self.method = method
+
+        # substeps
+        assert isinstance(substeps, int) and substeps > 0
+        self.substeps = substeps
+
+        # split
+        if split is None:
+            split = self.state.size // 2
+        self.split = split
+
+    def euler(self, t, x, h, pars):
+        return x + h * numpy.asarray(self.f(t, x, *pars))
+
+    def rk4(self, t, x, h, pars):
+        f = self.f
+        k1 = numpy.asarray(f(t, x, *pars))
+        k2 = numpy.asarray(f(t + h/2, x + (h/2) * k1, *pars))
+        k3 = numpy.asarray(f(t + h/2, x + (h/2) * k2, *pars))
+        k4 = numpy.asarray(f(t + h, x + h * k3, *pars))
+        return x + (h/6) * (k1 + 2 * (k2 + k3) + k4)
+
+    def semi_implicit_euler(self, t, x, h, pars):
+        n = self.split
+        x = numpy.array(x, dtype=float)
+        # update v first
+        x[n:] += h * numpy.asarray(self.f(t, x, *pars))[n:]
+        # then q with the updated v
+        x[:n] += h * numpy.asarray(self.f(t, x, *pars))[:n]
+        return x
+
+    def update(self, tk, uk):
+
+        if tk != self.t0:
+
+            # integrate from t0 to tk
+            pars = (uk,) + self.pars
+            h = (tk - self.t0) / self.substeps
+            t, x = self.t0, self.state
+            for k in range(self.substeps):
+                x = self._step(t, x, h, pars)
+                t += h
+
+            # update state
+            self.state = x
+
+            # update time
+            self.t0 = tk
+
+        # evaluate output
+        return self.g(tk, self.state, uk, *self.pars)
@@ -0,0 +1,305 @@
+import math
+import cmath
+import numpy
+
+from .. import system
+
+class SOS(system.System):
+    r"""
+    :py:class:`pyctrl.system.sos.SOS` implements a single-input-single-output (SISO) filter as a cascade of second-order sections (biquads).
+
+    Each row of :py:attr:`sos` holds the coefficients of one section:
+
+    .. math::
+
+        [b_0, b_1, b_2, a_0, a_1, a_2]
+
+    which corresponds to the transfer-function:
+
+    .. math::
+
+      G_i(z) = \frac{b_0 + b_1 z^{-1} + b_2 z^{-2}}{a_0 + a_1 z^{-1} + a_2 z^{-2}}
+
+    The overall transfer-function is the product :math:`G(z) = G_1(z) G_2(z) \cdots G_n(z)`. Coefficients are normalized so that :math:`a_0 = 1`.
+
+    Each section is implemented in transposed direct form II:
+
+    .. math::
+
+        y_k &= b_0 u_k + s_1 \\
+        s_1 &\leftarrow b_1 u_k - a_1 y_k + s_2 \\
+        s_2 &\leftarrow b_2 u_k - a_2 y_k
+
+    which is much better conditioned than a single high-order :py:class:`pyctrl.system.tf.DTTF`.
+
+    :param sos: numpy n x 6 array with the coefficients of the sections (default [[1, 0, 0, 1, 0, 0]])
+    :param state: numpy n x 2 array with the state of the sections (default `None`)
+    """
+
+    def __init__(self,
+                 sos = numpy.array([[1, 0, 0, 1, 0, 0]]),
+                 state = None):
+
+        self.sos = self._initialize(sos, state)
+
+    def _initialize(self, sos, state):
+
+        # make sure it is a 2D numpy array
+        sos = numpy.array(sos, dtype=float)
+        if sos.ndim == 1:
+            sos = sos.reshape((1, -1))
+        if sos.ndim != 2 or sos.shape[1] != 6:
+            raise system.SystemException('sos must be an n x 6 array')
+
+        # inproper?
+        if not numpy.all(sos[:,3]):
+            raise system.SystemException('Leading denominator coefficient cannot be zero')
+
+        # normalize denominators
+        sos = sos / sos[:,3:4]
+
+        # coefficients (b0, b1, b2, a1, a2) as floats for fast update
+        self._sections = [tuple(row) for row in sos[:,[0,1,2,4,5]].tolist()]
+
+        # state
+        n = sos.shape[0]
+        if state is None:
+            self._state = [[0., 0.] for k in range(n)]
+        else:
+            self.set_state(state)
+
+        return sos
+
+    def get_state(self):
+        """
+        :return: numpy n x 2 array with the state of the sections
+        """
+        return numpy.array(self._state)
+
+    def set_state(self, xk):
+        """
+        Set the state of the sections.
+
+        :param xk: numpy n x 2 array with the state of the sections
+        """
+        n = len(self._sections)
+        xk = numpy.array(xk, dtype=float)
+        if xk.shape != (n, 2):
+            raise system.SystemException('Shape of state must be ({}, 2)'.format(n))
+        self._state = xk.tolist()
+
+    state = property(get_state, set_state)
+
+    def set_output(self, yk):
+        r"""
+        Sets the internal state of the :py:class:`pyctrl.system.sos.SOS` so that a call to `update` with `uk = 0` yields `yk`.
+
+        With :math:`u_k = 0` every section outputs its own :math:`s_1`,
+        so the state of all but the last section is zeroed and
+        :math:`s_1 = y_k` on the last section.
+
+        :param yk: scalar desired `yk`
+        """
+        if isinstance(yk, numpy.ndarray):
+            yk = yk.item()
+        for s in self._state:
+            s[0] = s[1] = 0.
+        self._state[-1][0] = float(yk)
+
+    def shape(self):
+        return (1, 1, 2 * len(self._sections))
+
+    def update(self, uk):
+        r"""
+        Update :py:class:`pyctrl.system.sos.SOS` model by running :math:`u_k` through all sections in sequence.
+
+        :param uk: scalar or one-element numpy array input at time k
+        :return: scalar output at time k
+        """
+        if isinstance(uk, numpy.ndarray):
+            uk = uk.item()
+        for (b0, b1, b2, a1, a2), s in zip(self._sections, self._state):
+            yk = b0 * uk + s[0]
+            s[0] = b1 * uk - a1 * yk + s[1]
+            s[1] = b2 * uk - a2 * yk
+            uk = yk
+        return uk
+
+class _Design(SOS):
+    # SOS designed from parameters: the parameters are public attributes
+    # and the coefficients are private, so that the model can be rebuilt
+    # from its attributes, as done by pyctrl.flask.JSONDecoder
+
+    @property
+    def sos(self):
+        return self._sos
+
+    def _initialize(self, sos, state):
+        self._sos = super()._initialize(sos, state)
+        return self._sos
+
+class LPF(_Design):
+    r"""
+    :py:class:`pyctrl.system.sos.LPF` implements a low-pass filter of arbitrary order as a cascade of identical first-order sections.
+
+    Each section is the zero-order hold equivalent of the continuous-time filter
+
+    .. math::
+
+        T(s) = \frac{\omega_c}{s + \omega_c}, \quad \omega_c = 2 \pi f_c
+
+    that is
+
+    .. math::
+
+        T(z) = \frac{1 - a}{z - a}, \quad a = e^{-\omega_c T_s}
+
+    For :py:data:`order = 1` it coincides with :py:class:`pyctrl.system.tf.LPF`.
+
+    :param fc: cuttof frequency in Hz
+    :param period: sampling period in seconds
+    :param gain: gain (default = `1`)
+    :param order: order (default = `1`)
+    :param state: initial state (default = `None`)
+    """
+
+    def __init__(self,
+                 fc,
+                 period,
+                 gain = 1,
+                 order = 1,
+                 state = None):
+
+        assert period > 0
+        assert order >= 1
+
+        self.fc = fc
+        self.period = period
+        self.gain = gain
+        self.order = order
+
+        a = math.exp(-2 * math.pi * fc * period)
+        sos = numpy.zeros((order, 6))
+        sos[:,1] = 1 - a
+        sos[:,3] = 1
+        sos[:,4] = -a
+        sos[0,1] *= gain
+
+        self._initialize(sos, state)
+
+class Butterworth(_Design):
+    r"""
+    :py:class:`pyctrl.system.sos.Butterworth` implements a Butterworth filter of arbitrary order.
+
+    The filter is obtained from the analog Butterworth prototype using
+    the bilinear (Tustin) transformation with frequency prewarping, so
+    that the gain at the cutoff frequency :math:`f_c` is exactly
+    :math:`1/\sqrt{2}` times :py:attr:`gain`. Complex conjugate pole
+    pairs are grouped into second-order sections and, for odd orders,
+    the real pole becomes a first-order section.
+
+    :param fc: cuttof frequency in Hz, must be smaller than the Nyquist frequency :math:`1/(2 T_s)`
+    :param period: sampling period in seconds
+    :param order: order (default = `2`)
+    :param gain: gain in the passband (default = `1`)
+    :param str btype: either `'lowpass'` or `'highpass'` (default = `'lowpass'`)
+    :param state: initial state (default = `None`)
+    """
+
+    def __init__(self,
+                 fc,
+                 period,
+                 order = 2,
+                 gain = 1,
+                 btype = 'lowpass',
+                 state = None):
+
+        assert period > 0
+        assert order >= 1
+
+        if not 0 < fc * period < 0.5:
+            raise system.SystemException('Cutoff frequency must be between 0 and the Nyquist frequency')
+
+        if btype == 'lowpass':
+            sign = 1
+        elif btype == 'highpass':
+            sign = -1
+        else:
+            raise system.SystemException("Unknown btype '{}'; must be 'lowpass' or 'highpass'".format(btype))
+
+        self.fc = fc
+        self.period = period
+        self.order = order
+        self.gain = gain
+        self.btype = btype
+
+        # prewarped analog cutoff
+        K = 2 / period
+        wc = K * math.tan(math.pi * fc * period)
+
+        sos = numpy.zeros(((order + 1) // 2, 6))
+        for k in range(order // 2):
+            # analog pole in the upper half plane and its bilinear image
+            p = wc * cmath.exp(1j * math.pi * (2 * k + order + 1) / (2 * order))
+            z = (K + p) / (K - p)
+            a1, a2 = -2 * z.real, abs(z) ** 2
+            # double zero at z = -1 (lowpass) or z = 1 (highpass)
+            # normalized to unit gain at z = 1 (lowpass) or z = -1 (highpass)
+            g = (1 + sign * a1 + a2) / 4
+            sos[k] = [g, 2 * sign * g, g, 1, a1, a2]
+
+        if order % 2:
+            # real pole at -wc
+            z = (K - wc) / (K + wc)
+            g = (1 - sign * z) / 2
+            sos[-1] = [g, sign * g, 0, 1, -z, 0]
+
+        sos[0,:3] *= gain
+
+        self._initialize(sos, state)
+
+class Notch(_Design):
+    r"""
+    :py:class:`pyctrl.system.sos.Notch` implements a second-order notch filter.
+
+    The filter is the bilinear transformation of
+
+    .. math::
+
+        T(s) = \frac{s^2 + \omega_0^2}{s^2 + \frac{\omega_0}{Q} s + \omega_0^2}, \quad \omega_0 = 2 \pi f_c
+
+    with frequency prewarping so that the notch is exactly at :math:`f_c`.
+
+    :param fc: notch frequency in Hz
+    :param period: sampling period in seconds
+    :param Q: quality factor; larger values give narrower notches (default = `10`)
+    :param gain: gain away from the notch (default = `1`)
+    :param state: initial state (default = `None`)
+    """
+
+    def __init__(self,
+                 fc,
+                 period,
+                 Q = 10,
+                 gain = 1,
+                 state = None):
+
+        assert period > 0
+        assert Q > 0
+
+        if not 0 < fc * period < 0.5:
+            raise system.SystemException('Notch frequency must be between 0 and the Nyquist frequency')
+
+        self.fc = fc
+        self.period = period
+        self.Q = Q
+        self.gain = gain
+
+        w0 = 2 * math.pi * fc * period
+        alpha = math.sin(w0) / (2 * Q)
+        c = math.cos(w0)
+
+        sos = numpy.array([[gain, -2 * c * gain, gain,
+                            1 + alpha, -2 * c, 1 - alpha]])
+
+        self._initialize(sos, state)
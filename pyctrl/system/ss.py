@@ -11,11 +11,30 @@ class DTSS(system.System):
       x_{k+1} &= A x_k + B u_k \\
           y_k &= C x_k + D u_k
 
+    The matrices are stacked at construction as
+
+    .. math::
+
+      M = \begin{bmatrix} A & B \\ C & D \end{bmatrix}
+
+    so that :py:meth:`pyctrl.system.ss.DTSS.update` computes the next
+    state and the output with a single product into preallocated
+    buffers. :py:attr:`A`, :py:attr:`B`, :py:attr:`C` and :py:attr:`D`
+    are views of :math:`M` and :py:attr:`state` is updated in place.
+    Assigning to any of them copies the new values into the buffers.
+
+    If :py:attr:`sparse` is `True` then :math:`M` is also stored as a
+    `scipy.sparse` matrix, which pays off for large, sparse models
+    such as observers. The sparse matrix is rebuilt when
+    :py:attr:`A`, :py:attr:`B`, :py:attr:`C` or :py:attr:`D` are
+    assigned, but not when they are modified in place.
+
     :param numpy.array A: state space matrix :math:`A` (Default = [])
     :param numpy.array B: state space matrix :math:`B` (Default = [[0]])
     :param numpy.array C: state space matrix :math:`C` (Default = [])
     :param numpy.array D: state space matrix :math:`D` (Default = [[1]])
     :param numpy.array state: initial value of the state vector
+    :param bool sparse: store :math:`M` as a sparse matrix (Default = `False`)
     """
     
     def __init__(self,
@@ -23,12 +42,13 @@ class DTSS(system.System):
                  B = numpy.array([[0]]),
                  C = numpy.array([[]]),
                  D = numpy.array([[1]]),
-                 state = None):
+                 state = None,
+                 sparse = False):
 
-        #print('A = {} ({})'.format(A, A.shape))
-        #print('B = {} ({})'.format(B, B.shape))
-        #print('C = {} ({})'.format(C, C.shape))
-        #print('D = {} ({})'.format(D, D.shape))
+        A = numpy.asarray(A)
+        B = numpy.asarray(B)
+        C = numpy.asarray(C)
+        D = numpy.asarray(D)
 
         # check dimensions
         assert A.shape == (1,0) or A.shape[0] == A.shape[1]
@@ -36,23 +56,68 @@ class DTSS(system.System):
         assert C.shape[0] == D.shape[0]
         assert A.shape[1] == C.shape[1]
         assert B.shape[1] == D.shape[1]
-        
-        self.A = A
-        self.B = B
-        self.C = C
-        self.D = D
-
-        n = A.shape[0]
-        if state is None:
-            self.state = numpy.zeros((n,), dtype=float)
-        elif state.shape == (n,):
-            self.state = state.astype(float)
-        else:
-            raise system.SystemException('Order of state must match order of denominator')
 
-        #print('num = {}'.format(self.num))
-        #print('den = {}'.format(self.den))
-        #print('state = {}'.format(self.state))
+        # stack [[A B]; [C D]]
+        n, m, p = A.shape[1], B.shape[1], C.shape[0]
+        M = numpy.zeros((n + p, n + m))
+        M[:n,:n] = A[:n]
+        M[:n,n:] = B[:n]
+        M[n:,:n] = C
+        M[n:,n:] = D
+
+        self._M = M
+        self._A = M[:n,:n]
+        self._B = M[:n,n:]
+        self._C = M[n:,:n]
+        self._D = M[n:,n:]
+
+        self.set_sparse(sparse)
+
+        # buffers: _xu = [x_k; u_k] and _xy = [x_{k+1}; y_k]
+        self._xu = numpy.zeros((n + m,))
+        self._xy = numpy.zeros((n + p,))
+
+        # state is a view of _xu
+        self._state = self._xu[:n]
+        if state is not None:
+            self.set_state(state)
+
+    def set_sparse(self, sparse = True):
+        """
+        Store stacked matrix :math:`M` as a sparse matrix.
+
+        :param bool sparse: True or False (default True)
+        """
+        self._sparse = sparse
+        self._build_sparse()
+
+    def _build_sparse(self):
+        if self._sparse:
+            # scipy is only needed for sparse models
+            import scipy.sparse
+            self._S = scipy.sparse.csr_matrix(self._M)
+
+    sparse = property(lambda self: self._sparse, set_sparse)
+
+    def _matrix(name):
+        # property for a block of the stacked matrix; assignment copies
+        def get(self):
+            return getattr(self, name)
+        def set(self, value):
+            M = getattr(self, name)
+            value = numpy.asarray(value)
+            if value.shape != M.shape:
+                raise system.SystemException('Shape of {} must be {}'.format(name[1:], M.shape))
+            M[...] = value
+            self._build_sparse()
+        return property(get, set)
+
+    A = _matrix('_A')
+    B = _matrix('_B')
+    C = _matrix('_C')
+    D = _matrix('_D')
+
+    del _matrix
 
     def set_output(self, yk):
         r"""
@@ -78,15 +143,18 @@ class DTSS(system.System):
         # y = C x
         assert isinstance(yk, numpy.ndarray)
         assert yk.shape[0] == self.C.shape[0]
-        xk = numpy.linalg.lstsq(self.C, yk)[0]
+        xk = numpy.linalg.lstsq(self.C, yk, rcond=None)[0]
         self.set_state(xk)
 
     def get_state(self):
-        return self.state
+        return self._state.copy()
         
     def set_state(self, xk):
-        assert len(xk) == len(self.state)
-        self.state = xk
+        if numpy.shape(xk) != self._state.shape:
+            raise system.SystemException('Order of state must match order of denominator')
+        self._state[:] = xk
+
+    state = property(lambda self: self._state, set_state)
 
     def shape(self):
         return (self.B.shape[1], self.C.shape[0], self.A.shape[0])
@@ -97,27 +165,75 @@ class DTSS(system.System):
 
         .. math::
         
-            y_k &= C x_k + D u_k
+            \begin{bmatrix} x_{k+1} \\ y_k \end{bmatrix} = \begin{bmatrix} A & B \\ C & D \end{bmatrix} \begin{bmatrix} x_k \\ u_k \end{bmatrix}
 
-        then updates
-
-        .. math::
-        
-            x_{k+1} &= A x_k + B u_k
+        then updates the state in place.
 
         :param numpy.array uk: input at time k
+        :return: numpy.array output at time k
         """
-        # yk = C xk + D uk
-        # xk+1 = A xk + B uk
-        if self.state.size > 0:
-            #print('> x = {}'.format(self.state))
-            yk = self.C.dot(self.state) + self.D.dot(uk)
-            #print('> yk = {}'.format(yk))
-            #print('> A.x = {}'.format(self.A.dot(self.state)))
-            #print('> B.u = {}'.format(self.B.dot(uk)))
-            self.state = self.A.dot(self.state) + self.B.dot(uk)
-            #print('< x = {}'.format(self.state))
+        n = self._state.size
+        self._xu[n:] = uk
+        if self._sparse:
+            self._xy[:] = self._S.dot(self._xu)
         else:
-            yk = self.D.dot(uk)
-            
-        return yk
+            numpy.dot(self._M, self._xu, out=self._xy)
+        self._state[:] = self._xy[:n]
+        return self._xy[n:].copy()
+
+class CTSS:
+    r"""
+    *CTSS* represents a continuous-time state-space model of the form:
+
+    .. math::
+
+      \dot{x} &= A x + B u \\
+            y &= C x + D u
+
+    A *CTSS* cannot be simulated directly; use
+    :py:func:`pyctrl.system.c2d.c2d` to obtain a discrete-time
+    :py:class:`pyctrl.system.ss.DTSS`. *CTSS* objects are immutable
+    and can be compared and hashed, which is what allows
+    discretizations to be memoized.
+
+    :param numpy.array A: state space matrix :math:`A`
+    :param numpy.array B: state space matrix :math:`B`
+    :param numpy.array C: state space matrix :math:`C`
+    :param numpy.array D: state space matrix :math:`D` (default zero)
+    """
+
+    def __init__(self, A, B, C, D = None):
+
+        A = numpy.array(A, dtype=float, ndmin=2)
+        B = numpy.array(B, dtype=float, ndmin=2)
+        C = numpy.array(C, dtype=float, ndmin=2)
+        if D is None:
+            D = numpy.zeros((C.shape[0], B.shape[1]))
+        D = numpy.array(D, dtype=float, ndmin=2)
+
+        # check dimensions
+        if not (A.shape[0] == A.shape[1] and
+                A.shape[0] == B.shape[0] and
+                C.shape[0] == D.shape[0] and
+                A.shape[1] == C.shape[1] and
+                B.shape[1] == D.shape[1]):
+            raise system.SystemException('Dimensions of A, B, C and D do not match')
+
+        # make immutable
+        for M in (A, B, C, D):
+            M.flags.writeable = False
+        self.A, self.B, self.C, self.D = A, B, C, D
+
+    def __eq__(self, other):
+        return (isinstance(other, CTSS) and
+                all(numpy.array_equal(M, N)
+                    for (M, N) in zip((self.A, self.B, self.C, self.D),
+                                      (other.A, other.B, other.C, other.D))))
+
+    def __hash__(self):
+        # adding 0.0 turns -0.0 into 0.0, which compare equal
+        return hash(tuple((M.shape, (M + 0.0).tobytes())
+                          for M in (self.A, self.B, self.C, self.D)))
+
+    def shape(self):
+        return (self.B.shape[1], self.C.shape[0], self.A.shape[0])
@@ -314,7 +314,7 @@ class LPF(DTTF):
     
     where :math:`T_s` is the sampling period.
     
-    TODO: filters of order higher than `1`
+    For filters of order higher than `1` use :py:class:`pyctrl.system.sos.LPF`.
     
     :param fc: cuttof frequency in Hz
     :param Ts: sampling period in seconds
@@ -331,7 +331,7 @@ class LPF(DTTF):
                  state = None):
 
         if order != 1:
-            raise Exception('Not implemented yet')
+            raise system.SystemException('Order higher than 1 not implemented; use pyctrl.system.sos.LPF')
 
         assert period > 0
 
@@ -341,3 +341,80 @@ class LPF(DTTF):
         
         super().__init__(num, den, state)
         
+
+class CTTF:
+    r"""
+    :py:class:`pyctrl.system.tf.CTTF` represents a single-input-single-output (SISO) continuous-time transfer-function:
+
+    .. math::
+
+      G(s) = \frac{num[0] s^m + num[1] s^{m-1} + \cdots + num[m]}{den[0] s^n + den[1] s^{n-1} + \cdots + den[n]}
+
+    Note that, unlike :py:class:`pyctrl.system.tf.DTTF`, coefficients are in *descending* powers of :math:`s`.
+    Denominator is always normalized so that :math:`den[0] = 1`.
+
+    A *CTTF* cannot be simulated directly; use
+    :py:func:`pyctrl.system.c2d.c2d` to obtain a discrete-time
+    :py:class:`pyctrl.system.tf.DTTF`. *CTTF* objects are immutable
+    and can be compared and hashed, which is what allows
+    discretizations to be memoized.
+
+    :param num: numpy 1D-vector numerator
+    :param den: numpy 1D-vector denominator
+    """
+
+    def __init__(self, num, den):
+
+        # make sure it is numpy array and remove leading zeros
+        num = numpy.trim_zeros(numpy.atleast_1d(numpy.array(num, dtype=float)), 'f')
+        den = numpy.trim_zeros(numpy.atleast_1d(numpy.array(den, dtype=float)), 'f')
+
+        if not den.size:
+            raise system.SystemException('Denominator cannot be zero')
+        if not num.size:
+            num = numpy.zeros(1)
+
+        # must be proper
+        if num.size > den.size:
+            raise system.SystemException('Order of numerator cannot be greater than order of the denominator')
+
+        # normalize denominator
+        self.num = num / den[0]
+        self.den = den / den[0]
+
+        # make immutable
+        self.num.flags.writeable = False
+        self.den.flags.writeable = False
+
+    def __eq__(self, other):
+        return (isinstance(other, CTTF) and
+                numpy.array_equal(self.num, other.num) and
+                numpy.array_equal(self.den, other.den))
+
+    def __hash__(self):
+        # adding 0.0 turns -0.0 into 0.0, which compare equal
+        return hash(((self.num + 0.0).tobytes(), (self.den + 0.0).tobytes()))
+
+    def shape(self):
+        return (1, 1, self.den.size - 1)
+
+    def as_CTSS(self):
+        """
+        :returns: a state-space representation (:py:class:`pyctrl.system.ss.CTSS`) of the :py:class:`pyctrl.system.tf.CTTF` in controllable canonical form.
+        """
+
+        n = self.den.size - 1
+        num = numpy.zeros(n + 1)
+        num[n + 1 - self.num.size:] = self.num
+
+        A = numpy.zeros((n,n))
+        B = numpy.zeros((n,1))
+        C = numpy.zeros((1,n))
+
+        if n > 0:
+            A[:-1,1:] = numpy.eye(n-1)
+            A[-1,:] = -numpy.flipud(self.den[1:])
+            B[-1,0] = 1
+            C[0,:] = numpy.flipud(num[1:] - num[0] * self.den[1:])
+
+        return ss.CTSS(A, B, C, numpy.array([[num[0]]]))
@@ -0,0 +1,110 @@
+import os
+import timeit
+import tracemalloc
+
+import pytest
+
+import pyctrl.block as block
+import pyctrl.block.system as system
+
+# benchmarks depend on the machine and only run on demand:
+#
+#   PYCTRL_BENCHMARK=1 python -m pytest -s test/test_benchmark.py
+#
+pytestmark = pytest.mark.skipif(not os.environ.get('PYCTRL_BENCHMARK'),
+                                reason = 'set PYCTRL_BENCHMARK to run benchmarks')
+
+# versions of the slotted blocks with an instance dictionary
+
+class DictShortCircuit(block.Filter, block.BufferBlock):
+    pass
+
+class DictGain(block.Filter, block.BufferBlock):
+
+    def __init__(self, **kwargs):
+        self.gain = kwargs.pop('gain', 1)
+        super().__init__(**kwargs)
+
+    def write(self, *values):
+        super().write(*values)
+        self.buffer = tuple(v * self.gain for v in self.buffer)
+
+class DictConstant(block.Source, block.BufferBlock):
+
+    def __init__(self, **kwargs):
+        self.value = kwargs.pop('value', 1)
+        super().__init__(**kwargs)
+        self.buffer = (self.value, )
+
+def tick(blk):
+    if blk.get_type() is not block.BlockType.source:
+        blk.write(1.5, 2.5)
+    blk.read()
+
+def run(cls, number = 100000):
+    blk = cls()
+    return min(timeit.repeat(lambda: tick(blk), number = number, repeat = 5))
+
+def memory(cls, number = 10000):
+    tracemalloc.start()
+    blks = [cls() for k in range(number)]
+    for blk in blks:
+        tick(blk)
+    size = tracemalloc.get_traced_memory()[0] / number
+    tracemalloc.stop()
+    return size
+
+@pytest.mark.parametrize('slotted, dict_based',
+                         [(block.ShortCircuit, DictShortCircuit),
+                          (system.Gain, DictGain),
+                          (block.Constant, DictConstant)])
+def test_slotted_blocks(slotted, dict_based):
+
+    (t1, t2) = (run(slotted), run(dict_based))
+    (m1, m2) = (memory(slotted), memory(dict_based))
+    print('\n{}: slotted = {:.3f}s/{:.0f}B, dict = {:.3f}s/{:.0f}B'.format(slotted.__name__, t1, m1, t2, m2))
+
+    # without an instance dictionary blocks must be noticeably smaller;
+    # timings depend on the interpreter and are only reported
+    assert m1 < 0.9 * m2
+
+def test_json_graph():
+
+    from pyctrl.flask import JSONEncoder, dumps, loads
+    from test.test_json import _graph
+
+    controller = _graph(200)
+    indented = JSONEncoder(sort_keys = True, indent = 4)
+    t1 = min(timeit.repeat(lambda: indented.encode(controller), number = 10, repeat = 3))
+    t2 = min(timeit.repeat(lambda: dumps(controller), number = 10, repeat = 3))
+    text = dumps(controller)
+    t3 = min(timeit.repeat(lambda: loads(text), number = 10, repeat = 3))
+    print('\n200 blocks: indented = {:.1f}ms, compact = {:.1f}ms, loads = {:.1f}ms'.format(100 * t1, 100 * t2, 100 * t3))
+
+    # compact output must be faster than indented output
+    assert t2 < t1
+
+def test_dmp_decode():
+
+    from pyctrl.bbb.pycomms.mpu6050 import MPU6050
+    from test.test_mpu6050 import packet
+
+    data = packet(0.5, -0.5, 0.25, -0.25, (1, -1, 300), (16384, 0, -8192)) * 24
+    t1 = min(timeit.repeat(lambda: [MPU6050.dmpDecodePackets(data[k:k+42])
+                                    for k in range(0, len(data), 42)],
+                           number = 1000, repeat = 3))
+    t2 = min(timeit.repeat(lambda: MPU6050.dmpDecodePackets(data),
+                           number = 1000, repeat = 3))
+    print('\n24 packets: one at a time = {:.1f}us, at once = {:.1f}us'.format(1000 * t1, 1000 * t2))
+
+    # decoding a burst must cost about as much as a single packet
+    assert t2 < t1 / 4
+
+if __name__ == "__main__":
+
+    for (slotted, dict_based) in [(block.ShortCircuit, DictShortCircuit),
+                                  (system.Gain, DictGain),
+                                  (block.Constant, DictConstant)]:
+        test_slotted_blocks(slotted, dict_based)
+
+    test_json_graph()
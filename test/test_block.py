@@ -4,6 +4,7 @@ import numpy
 
 import pyctrl.block as block
 import pyctrl.block.system as system
+import pyctrl.system.ss as ss
 
 def test_BufferBlock():
 
@@ -72,6 +73,45 @@ def test_BufferBlock():
     assert len(obj.read()) == 5
     assert obj.read() == (1,2,3,4,5)
 
+    # scalar values keep the same types as numpy.hstack
+    obj = block.ShortCircuit(mux = True)
+
+    obj.write(1.5, 2)
+    assert obj.read()[0].dtype == float
+    assert numpy.array_equal(obj.read()[0], numpy.array([1.5, 2]))
+
+    obj.write(1, 2)
+    assert obj.read()[0].dtype == numpy.hstack((1, 2)).dtype
+
+    obj = block.ShortCircuit(mux = True, demux = True)
+
+    obj.write(1.5, 2.5)
+    assert obj.read() == (1.5, 2.5)
+    assert all(type(v) is float for v in obj.read())
+
+    obj.write(numpy.array([1.5, 2.5]))
+    assert obj.read() == (1.5, 2.5)
+    assert all(type(v) is float for v in obj.read())
+
+    obj = block.ShortCircuit(demux = True)
+
+    obj.write(numpy.float64(1.5), 2)
+    assert obj.read() == (1.5, 2)
+    assert all(type(v) is float for v in obj.read())
+
+    # systems reuse their input array for scalar values
+    obj = system.System(model = ss.DTSS(numpy.array([[0.5]]), numpy.array([[1]]),
+                                        numpy.array([[1]]), numpy.array([[0]])))
+    obj.write(1)
+    uk = obj._uk
+    assert numpy.array_equal(obj.read()[0], [0])
+    obj.write(2)
+    assert obj._uk is uk
+    assert numpy.array_equal(obj.read()[0], [1])
+    obj.write(numpy.array([0]))
+    assert numpy.array_equal(obj.read()[0], [2.5])
+    assert '_uk' not in obj.get()
+
     with pytest.raises(block.BlockException):
         obj = block.ShortCircuit(asd = 1)
     
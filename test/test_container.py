@@ -924,3 +924,542 @@ def test_add_device():
 
     assert container.get_signal('s2') == 3
     assert container.get_signal('s3') == 5
+
+def test_fuse():
+
+    import numpy
+    
+    from pyctrl.block.container import Container, Input, Output
+    from pyctrl.block import ShortCircuit
+    from pyctrl.block.system import Gain, Sum, Subtract, Affine, System
+    from pyctrl.block.fuse import Fused
+    from pyctrl.system.tf import DTTF
+    from pyctrl.system.ss import DTSS
+
+    A = numpy.array([[0.5, 0.1], [-0.2, 0.9]])
+    B = numpy.array([[1, 0], [0.5, 1]])
+    C = numpy.array([[1, 2]])
+    D = numpy.array([[0, 0.5]])
+
+    def build():
+        container = Container()
+        container.add_signals('u', 'r')
+        container.add_source('input1', Input(), ['u'])
+        container.add_source('input2', Input(), ['r'])
+        container.add_filter('gain', Gain(gain = 2), ['u'], ['s1'])
+        container.add_filter('subtract', Subtract(), ['r', 's1'], ['e'])
+        container.add_filter('plant', System(model = DTSS(A, B, C, D)), ['e', 'u'], ['y'])
+        container.add_filter('short', ShortCircuit(), ['y'], ['y1'])
+        container.add_filter('affine', Affine(gain = 0.5, offset = 1), ['y1', 'e'], ['w1', 'w2'])
+        container.add_filter('sum', Sum(gain = -1), ['w2', 'u'], ['v'])
+        container.add_sink('output', Output(), ['s1', 'e', 'y', 'y1', 'w1', 'w2', 'v'])
+        return container
+
+    container1 = build()
+    container2 = build()
+    container2.fuse()
+
+    container1.set_enabled(True)
+    container2.set_enabled(True)
+    for k in range(20):
+        (u, r) = numpy.random.randn(2)
+        container1.write(u, r)
+        container2.write(u, r)
+        values1 = container1.read()
+        values2 = container2.read()
+        assert numpy.allclose(numpy.hstack(values1), numpy.hstack(values2))
+    assert [type(device['block']) for device in container2._get_plan()] == [Fused, ShortCircuit, Fused]
+    assert isinstance(container2.get_signal('y'), numpy.ndarray)
+    assert not isinstance(container2.get_signal('v'), numpy.ndarray)
+
+    # states are copied back
+    assert numpy.allclose(container1.get_filter('plant', 'model').state,
+                          container2.get_filter('plant', 'model').state)
+
+    # setting rebuilds
+    container1.set_filter('gain', gain = 3)
+    container2.set_filter('gain', gain = 3)
+    container1.write(1, 2)
+    container2.write(1, 2)
+    assert numpy.allclose(numpy.hstack(container1.read()), numpy.hstack(container2.read()))
+
+    # disabling runs filters one by one
+    container1.filters['affine']['block'].set_enabled(False)
+    container2.filters['affine']['block'].set_enabled(False)
+    for k in range(3):
+        container1.write(1, 2)
+        container2.write(1, 2)
+        assert numpy.allclose(numpy.hstack(container1.read()), numpy.hstack(container2.read()))
+    assert [type(device['block']) for device in container2._get_plan()] == [Fused, ShortCircuit, Affine, Sum]
+    
+    container1.set_enabled(False)
+    container2.set_enabled(False)
+
+    # transfer-function realization
+    model = DTTF(numpy.array([1, 0.5, 0.2]), numpy.array([1, -0.3, 0.1]))
+    container = Container()
+    container.add_signal('u')
+    container.add_filter('gain', Gain(gain = 2), ['u'], ['e'])
+    container.add_filter('model', System(model = model), ['e'], ['y'])
+    container.fuse()
+    container.set_enabled(True)
+    reference = DTTF(numpy.array([1, 0.5, 0.2]), numpy.array([1, -0.3, 0.1]))
+    for k in range(10):
+        u = numpy.random.randn()
+        container.set_signal('u', u)
+        container.run()
+        assert numpy.allclose(container.get_signal('y'), reference.update(2 * u))
+    assert numpy.allclose(container.get_filter('model', 'model').state, reference.state)
+    container.set_enabled(False)
+
+    # vector signals are sized after the sources are read
+    from pyctrl.block import Constant
+    container = Container()
+    container.add_signals('x', 'u', 'r')
+    container.add_source('constant', Constant(value = numpy.array([1., 2.])), ['x'])
+    container.add_source('input1', Input(), ['u'])
+    container.add_source('input2', Input(), ['r'])
+    container.add_filter('gain1', Gain(gain = 2), ['x'], ['y'])
+    container.add_filter('gain2', Gain(gain = 3), ['y'], ['z'])
+    container.add_filter('model', System(model = DTSS(A, B, C, D)), ['r', 'r'], ['v'])
+    container.add_filter('gain3', Gain(gain = 2), ['u'], ['w'])
+    container.add_sink('output', Output(), ['z', 'v', 'w'])
+    container.fuse()
+    container.set_enabled(True)
+    reference = DTSS(A, B, C, D)
+    container.write(1., 1.)
+    (z, v, w) = container.read()
+    assert numpy.array_equal(z, [6, 12])
+    assert numpy.allclose(v, reference.update(numpy.array([1., 1.])))
+    assert w == 2
+    assert [type(device['block']) for device in container._get_plan()] == [Fused]
+
+    # changing shapes rebuilds the plan and keeps states
+    for r in (2., 3., 4.):
+        container.write(numpy.array([1., -1.]), r)
+        (z, v, w) = container.read()
+        assert numpy.allclose(v, reference.update(numpy.array([r, r])))
+        assert numpy.array_equal(w, [2, -2])
+    assert [type(device['block']) for device in container._get_plan()] == [Fused]
+    container.set_enabled(False)
+
+    # runs that cannot be fused warn
+    import warnings
+    container = Container()
+    container.add_signal('x')
+    container.add_source('constant', Constant(value = numpy.ones((2, 2))), ['x'])
+    container.add_filter('gain1', Gain(gain = 2), ['x'], ['y'])
+    container.add_filter('gain2', Gain(gain = 3), ['y'], ['z'])
+    container.fuse()
+    container.set_enabled(True)
+    with warnings.catch_warnings(record = True) as caught:
+        warnings.simplefilter('always')
+        container.run()
+    assert any("'gain1', 'gain2'" in str(w.message) for w in caught)
+    assert numpy.array_equal(container.get_signal('z'), 6 * numpy.ones((2, 2)))
+    container.set_enabled(False)
+
+def test_auto_order():
+
+    from pyctrl.block.container import Container, ContainerException
+    from pyctrl.block.system import Gain, Sum
+
+    container = Container()
+    container.add_signals('u', 'y')
+
+    container.add_filter('sum', Sum(), ['e', 'u'], ['y'])
+    container.add_filter('gain2', Gain(gain = 3), ['s1'], ['e'])
+    container.add_filter('gain1', Gain(gain = 2), ['u'], ['s1'])
+    assert container.filters_order == ['sum', 'gain2', 'gain1']
+
+    container.auto_order()
+    assert container.filters_order == ['gain1', 'gain2', 'sum']
+
+    container.set_enabled(True)
+    container.set_signal('u', 1)
+    container.run()
+    assert container.get_signal('y') == 7
+
+    # new filters are sorted as they are added
+    container.add_filter('gain0', Gain(gain = -1), ['u'], ['u'])
+    assert container.filters_order == ['gain0', 'gain1', 'gain2', 'sum']
+    container.run()
+    assert container.get_signal('y') == -7
+    assert container.get_signal('u') == -1
+
+    # writers of the same signal keep their order
+    container.add_filter('gain3', Gain(gain = 10), ['u'], ['u'])
+    assert container.filters_order == ['gain0', 'gain3', 'gain1', 'gain2', 'sum']
+
+    # algebraic loops are reported and not added
+    with pytest.raises(ContainerException):
+        container.add_filter('loop', Gain(), ['y'], ['s1'])
+    assert 'loop' not in container.filters
+    assert container.filters_order == ['gain0', 'gain3', 'gain1', 'gain2', 'sum']
+
+    with pytest.raises(ContainerException):
+        container.set_filter('gain1', inputs = ['y'])
+    assert container.get_filter('gain2', 'gain') == 3
+    assert container.filters['gain1']['inputs'] == ['u']
+
+    container.set_filter('gain1', inputs = ['e'], outputs = ['s2'])
+    assert container.filters_order == ['gain0', 'gain3', 'gain2', 'gain1', 'sum']
+
+    container.remove_filter('gain3')
+    assert container.filters_order == ['gain0', 'gain2', 'gain1', 'sum']
+
+    container.set_enabled(False)
+
+def test_parallel():
+
+    import numpy
+
+    from pyctrl.block.container import Container, Input, Output
+    from pyctrl.block.system import Gain, Sum, System
+    from pyctrl.system.ss import DTSS
+
+    A = numpy.array([[0.5, 0.1], [-0.2, 0.9]])
+    B = numpy.array([[1], [0.5]])
+    C = numpy.array([[1, 2]])
+
+    def build():
+        container = Container()
+        container.add_signals('u1', 'u2', 'v')
+        container.add_source('input1', Input(), ['u1'])
+        container.add_source('input2', Input(), ['u2'])
+        for side in ('1', '2'):
+            container.add_filter('model' + side, System(model = DTSS(A, B, C)),
+                                 ['u' + side], ['y' + side])
+            container.add_filter('gain' + side, Gain(gain = 2),
+                                 ['y' + side, 'v'], ['z' + side, 'w' + side])
+        container.add_filter('sum2', Sum(), ['w2', 'u2'], ['s2'])
+        container.add_sink('output', Output(), ['y1', 'z1', 'w1', 'y2', 'z2', 's2'])
+        return container
+
+    container1 = build()
+    container2 = build()
+    container2.parallel(workers = 2)
+
+    branches = container2._get_branches()
+    assert [[device['block'] for device in branch] for branch in branches] \
+        == [[container2.filters[label]['block'] for label in ('model1', 'gain1')],
+            [container2.filters[label]['block'] for label in ('model2', 'gain2', 'sum2')]]
+
+    container1.set_enabled(True)
+    container2.set_enabled(True)
+    for k in range(20):
+        (u1, u2) = numpy.random.randn(2)
+        container1.set_signal('v', k)
+        container2.set_signal('v', k)
+        container1.write(u1, u2)
+        container2.write(u1, u2)
+        assert numpy.allclose(numpy.hstack(container1.read()),
+                              numpy.hstack(container2.read()))
+
+    # branches are rebuilt when filters change
+    container2.add_filter('gain3', Gain(), ['y1', 'y2'], ['y3', 'y4'])
+    assert len(container2._get_branches()) == 1
+
+    # errors in worker threads are raised
+    container2.add_filter('fail', Sum(), ['x1', 'x2'], ['x3'])
+    container2.set_signal('x1', 'wrong')
+    assert len(container2._get_branches()) == 2
+    with pytest.raises(Exception):
+        container2.run()
+
+    container1.set_enabled(False)
+    container2.set_enabled(False)
+    container2.parallel(False)
+
+def test_multirate():
+
+    from pyctrl.block import Constant
+    from pyctrl.block.container import Container, Input, Output, ContainerException
+    from pyctrl.block.system import Gain, Sum
+    from pyctrl.block import Logger
+
+    container = Container()
+    container.add_signals('u', 'k1', 'k2', 'k3')
+    container.add_source('input', Input(), ['u'])
+    container.add_source('one', Constant(value = 1), ['one'], divisor = 2)
+    container.add_filter('count1', Sum(), ['k1', 'one'], ['k1'])
+    container.add_filter('count2', Sum(), ['k2', 'u'], ['k2'], divisor = 3)
+    container.add_filter('count3', Sum(), ['k3', 'u'], ['k3'], divisor = 3, phase = 4)
+    container.add_sink('logger', Logger(), ['k1', 'k2', 'k3'], divisor = 2, phase = 1)
+
+    with pytest.raises(ContainerException):
+        container.add_filter('wrong', Gain(), ['u'], ['v'], divisor = 0)
+
+    container.set_enabled(True)
+    for k in range(12):
+        container.write(1)
+        container.run()
+    container.set_enabled(False)
+
+    # 'one' holds its value between periods
+    assert container.get_signal('k1') == 12
+    assert container.get_signal('k2') == 4
+    assert container.get_signal('k3') == 4
+    log = container.get_sink('logger', 'log')
+    assert log['k1'].shape[0] == 6
+    assert log['k1'][:,0].tolist() == [2, 4, 6, 8, 10, 12]
+    assert log['k2'][:,0].tolist() == [1, 2, 2, 3, 4, 4]
+    assert log['k3'][:,0].tolist() == [1, 1, 2, 3, 3, 4]
+
+    # divisor and phase can be changed
+    container.set_filter('count2', divisor = 1)
+    container.set_sink('logger', phase = 0)
+    assert container.filters['count2']['divisor'] == 1
+    assert container.sinks['logger']['phase'] == 0
+    container.reset()
+    container.set_signal('k2', 0)
+    container.set_enabled(True)
+    for k in range(4):
+        container.write(1)
+        container.run()
+    container.set_enabled(False)
+    assert container.get_signal('k2') == 4
+    assert container.get_sink('logger', 'log')['k2'].shape[0] == 2
+
+def test_pure():
+
+    import numpy
+    
+    from pyctrl.block import Constant
+    from pyctrl.block.container import Container, Input
+    from pyctrl.block.system import Gain
+
+    class Counter(Gain):
+
+        def __init__(self, **kwargs):
+            self.count = 0
+            super().__init__(**kwargs)
+            
+        def write(self, *values):
+            self.count += 1
+            super().write(*values)
+
+    container = Container()
+    container.add_signals('u', 'r')
+    container.add_source('input', Input(), ['u'])
+    container.add_source('reference', Constant(value = 1), ['r'])
+    container.add_filter('gain1', Counter(gain = 2), ['r'], ['y1'], pure = True)
+    container.add_filter('gain2', Counter(gain = 2), ['u'], ['y2'], pure = True)
+    container.add_filter('gain3', Counter(gain = 2), ['r'], ['y3'])
+    container.add_filter('gain4', Counter(gain = 3), ['r', 'u'], ['y4', 'y5'], pure = True)
+    container.add_filter('overwrite', Counter(gain = 1), ['u'], ['y5'])
+
+    def count(label):
+        return container.get_filter(label, 'count')
+
+    container.set_enabled(True)
+    for k in range(5):
+        container.write(1)
+        container.run()
+    assert (count('gain1'), count('gain2'), count('gain3')) == (1, 1, 5)
+    assert container.get_signals('y1', 'y2', 'y3') == [2, 2, 2]
+
+    # outputs written by other filters force a run
+    assert count('gain4') == 5
+
+    # changed inputs
+    container.write(2)
+    container.run()
+    assert (count('gain1'), count('gain2')) == (1, 2)
+    assert container.get_signal('y2') == 4
+
+    container.set_source('reference', value = numpy.array([1, 2]))
+    for k in range(3):
+        container.write(2)
+        container.run()
+    assert (count('gain1'), count('gain2')) == (2, 2)
+    assert numpy.array_equal(container.get_signal('y1'), [2, 4])
+
+    # setting signals and filters
+    container.set_signal('y2', 0)
+    container.run()
+    assert count('gain2') == 3
+    assert container.get_signal('y2') == 4
+    container.set_filter('gain1', gain = 3)
+    container.run()
+    assert count('gain1') == 3
+    assert numpy.array_equal(container.get_signal('y1'), [3, 6])
+
+    # not pure
+    container.set_filter('gain1', pure = False)
+    container.run()
+    container.run()
+    assert count('gain1') == 5
+    container.set_enabled(False)
+
+def test_pure_timer():
+
+    import time
+    
+    from pyctrl.block import Constant
+    from pyctrl.block.container import Container
+    from pyctrl.block.system import Gain
+
+    # signals written by timers must rerun pure filters
+    container = Container()
+    container.add_signals('r', 't')
+    container.add_source('reference', Constant(value = 1), ['r'])
+    container.add_timer('timer', Gain(gain = 2), ['r'], ['t'],
+                        period = 0.1, repeat = False)
+    container.add_filter('gain', Gain(gain = 3), ['t'], ['y'], pure = True)
+
+    container.set_enabled(True)
+    container.run()
+    assert container.get_signal('y') == 0
+    time.sleep(0.3)
+    assert container.get_signal('t') == 2
+    container.run()
+    assert container.get_signal('y') == 6
+    container.set_enabled(False)
+
+def test_snapshot():
+
+    import numpy
+    import threading
+    
+    from pyctrl.block.container import Container, Input, ContainerException
+    from pyctrl.block.system import Gain
+
+    container = Container()
+    container.add_signals('u', 'y')
+    container.add_source('input', Input(), ['u'])
+    container.add_filter('gain', Gain(gain = 2), ['u'], ['y'])
+
+    snapshot = container.get_snapshot()
+    assert snapshot == {'u': 0, 'y': 0}
+    with pytest.raises(TypeError):
+        snapshot['u'] = 1
+
+    container.set_enabled(True)
+    container.write(3)
+    container.run()
+    assert container.get_snapshot('u', 'y') == [3, 6]
+    assert snapshot == {'u': 0, 'y': 0}
+
+    # set and add publish too
+    container.set_signal('u', 4)
+    container.add_signal('z')
+    assert container.get_snapshot() == {'u': 4, 'y': 6, 'z': 0}
+    with pytest.raises(ContainerException):
+        container.get_snapshot('w')
+
+    # concurrent readers always see consistent values
+    container.run()
+    errors = []
+    done = threading.Event()
+    def reader():
+        while not done.is_set():
+            snapshot = container.get_snapshot()
+            if snapshot['y'] != 2 * snapshot['u']:
+                errors.append(dict(snapshot))
+    thread = threading.Thread(target = reader)
+    thread.start()
+    for k in range(2000):
+        container.write(k)
+        container.run()
+    done.set()
+    thread.join()
+    assert not errors
+    container.set_enabled(False)
+
+def test_subscribe():
+
+    import threading
+    
+    from pyctrl.block.container import Container, Input, ContainerException
+    from pyctrl.block.system import Gain
+
+    container = Container()
+    container.add_signals('u', 'y')
+    container.add_source('input', Input(), ['u'])
+    container.add_filter('gain', Gain(gain = 2), ['u'], ['y'])
+    container.set_enabled(True)
+
+    with pytest.raises(ContainerException):
+        container.subscribe('w')
+    with pytest.raises(ContainerException):
+        container.subscribe('u', decimate = 0)
+
+    every = container.subscribe('u', 'y')
+    decimated = container.subscribe('y', decimate = 2)
+    bounded = container.subscribe('u', maxsize = 3)
+    assert every.get(0) == []
+    
+    for k in range(5):
+        container.write(k)
+        container.run()
+
+    assert every.get(0) == [(k, 2 * k) for k in range(5)]
+    assert every.get(0) == []
+    assert decimated.get(0) == [(2,), (6,)]
+    assert bounded.get(0) == [(2,), (3,), (4,)]
+    assert bounded.dropped == 2
+
+    # waiting reader
+    rows = []
+    thread = threading.Thread(target = lambda: rows.extend(every.get(5)))
+    thread.start()
+    container.write(7)
+    container.run()
+    thread.join()
+    assert rows == [(7, 14)]
+
+    container.unsubscribe(every)
+    container.run()
+    assert every.get(0) == []
+    assert decimated.get(0) == [(14,)]
+    container.set_enabled(False)
+
+def test_version():
+
+    from pyctrl.block.container import Container, Input
+    from pyctrl.block.system import Gain
+    from pyctrl.block import Printer
+
+    container = Container()
+    versions = [container.get_version()]
+    def changed():
+        versions.append(container.get_version())
+        return versions[-1] != versions[-2]
+
+    container.add_signals('u', 'y')
+    assert changed()
+    container.set_signal('u', 1)
+    assert not changed()
+    container.add_source('input', Input(), ['u'])
+    assert changed()
+    container.add_filter('gain', Gain(gain = 2), ['u'], ['y'])
+    assert changed()
+    container.set_filter('gain', gain = 3)
+    assert changed()
+    container.add_sink('printer', Printer(), ['y'])
+    assert changed()
+    container.remove_sink('printer')
+    assert changed()
+
+    # running does not change the version, enabling does
+    container.set_enabled(True)
+    assert changed()
+    container.write(1)
+    container.run()
+    assert not changed()
+    container.set_enabled(False)
+    assert changed()
+
+    # changes to contained containers propagate
+    child = Container()
+    container.add_filter('child', child, ['u'], ['y'])
+    assert changed()
+    version = child.get_version()
+    container.add_signal('child/x')
+    assert changed()
+    assert child.get_version() != version
+
+    # versions are never reused
+    assert len(set(versions)) == len(versions) - 2
+    assert Container().get_version() > max(versions)
@@ -805,6 +805,51 @@ def test_client_server():
             server.terminate()
 
             
+def test_unix_socket(tmp_path):
+
+    import socket
+    import threading
+    import pyctrl.server
+    import pyctrl.client
+
+    address = 'unix://' + str(tmp_path / 'pyctrl.sock')
+    pyctrl.server.set_controller(pyctrl.Controller(noclock = True))
+    server = pyctrl.server.make_server(address)
+    thread = threading.Thread(target = server.serve_forever)
+    thread.start()
+
+    try:
+
+        with pyctrl.client.Controller(host = address) as client:
+            assert client.socket.family == socket.AF_UNIX
+            client.add_signal('x')
+            client.set_signal('x', 1.5)
+            assert client.get_signal('x') == 1.5
+            assert 'x' in client.list_signals()
+            assert 'x' in pyctrl.server.controller.list_signals()
+
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    # tcp connections disable Nagle's algorithm
+    server = pyctrl.server.make_server('localhost', 0)
+    thread = threading.Thread(target = server.serve_forever)
+    thread.start()
+
+    try:
+
+        with pyctrl.client.Controller(host = 'localhost',
+                                      port = server.server_address[1]) as client:
+            assert client.socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            assert 'x' in client.list_signals()
+
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
 if __name__ == "__main__":
 
     print('> Local')
@@ -815,4 +860,3 @@ if __name__ == "__main__":
 
     print('> Clock')
     test_clock()
-
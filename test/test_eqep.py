@@ -0,0 +1,55 @@
+import pytest
+
+def sysfs(path, **attributes):
+    # fake sysfs directory of regular files
+    for (key, value) in attributes.items():
+        (path / key).write_text('{}\n'.format(value))
+    return str(path)
+
+def written(path, key, value):
+    # sysfs keeps only the last value written but regular files keep
+    # what follows it, so compare only the bytes written
+    data = str(value).encode()
+    return (path / key).read_bytes()[:len(data)] == data
+
+def test_eqep(tmp_path):
+
+    from pyctrl.bbb.eqep import eQEP
+
+    path = sysfs(tmp_path, mode = 1, period = 1000000000, position = 1234)
+    eqep = eQEP(path, eQEP.MODE_ABSOLUTE)
+
+    # constructor sets mode and resets position
+    assert written(tmp_path, 'mode', eQEP.MODE_ABSOLUTE)
+    assert written(tmp_path, 'position', 0)
+    sysfs(tmp_path, mode = eQEP.MODE_ABSOLUTE, position = 0)
+    assert eqep.get_mode() == eQEP.MODE_ABSOLUTE
+    assert eqep.get_position() == 0
+
+    # attributes are read and written in place
+    eqep.set_period(10000000)
+    assert written(tmp_path, 'period', 10000000)
+    sysfs(tmp_path, period = 10000000)
+    assert eqep.get_period() == 10000000
+    eqep.set_position(-5)
+    assert written(tmp_path, 'position', -5)
+    sysfs(tmp_path, position = -5)
+    assert eqep.get_position() == -5
+
+    # changes made by the driver are seen without reopening
+    fds = dict(eqep.fds)
+    (tmp_path / 'position').write_text('42\n')
+    assert eqep.get_position() == 42
+    assert eqep.fds == fds
+    assert set(fds) == {'mode', 'period', 'position'}
+
+    eqep.close()
+    assert eqep.fds == {}
+    eqep.close()
+
+def test_missing(tmp_path):
+
+    from pyctrl.bbb.eqep import eQEP
+
+    with pytest.raises(FileNotFoundError):
+        eQEP(str(tmp_path), eQEP.MODE_ABSOLUTE)
@@ -72,6 +72,80 @@ def test_sub_container():
 
     print('json = \n{}'.format(json1))
 
+def test_slotted_blocks():
+
+    import numpy as np
+    import pyctrl.block as block
+    from pyctrl.block.system import Gain, Sum, System
+    from pyctrl.system.ss import DTSS
+    from pyctrl.flask import JSONEncoder, JSONDecoder
+
+    A = np.array([[0.5, 1],[0, 0.25]])
+    B = np.array([[0],[1]])
+    C = np.array([[1, 0]])
+    D = np.array([[0]])
+    
+    for blk in [Gain(gain = 3),
+                Gain(gain = np.array([1, -2]), demux = True),
+                Sum(gain = 0.5),
+                block.Constant(value = 2),
+                block.ShortCircuit(mux = True),
+                System(model = DTSS(A, B, C, D))]:
+
+        assert not hasattr(blk, '__dict__')
+
+        json1 = JSONEncoder(sort_keys = True).encode(blk)
+        obj = JSONDecoder().decode(json1)
+        assert type(obj) is type(blk)
+        json2 = JSONEncoder(sort_keys = True).encode(obj)
+        assert json1 == json2
+
+    # decoded system runs like the original
+    blk = System(model = DTSS(A, B, C, D))
+    obj = JSONDecoder().decode(JSONEncoder().encode(blk))
+    for uk in [1, 0, -1, 2]:
+        blk.write(uk)
+        obj.write(uk)
+        assert np.all(blk.read()[0] == obj.read()[0])
+
+def _graph(n):
+
+    import pyctrl
+    from pyctrl.block.system import Gain, System
+    from pyctrl.system.tf import DTTF
+
+    controller = pyctrl.Controller(noclock = True)
+    controller.add_signals(*['s{}'.format(k) for k in range(n + 1)])
+    for k in range(n):
+        if k % 2:
+            blk = Gain(gain = k)
+        else:
+            blk = System(model = DTTF([1, 2, 3], [1, 0.5, 0.2]))
+        controller.add_filter('f{}'.format(k), blk,
+                              ['s{}'.format(k)], ['s{}'.format(k + 1)])
+    return controller
+
+def test_dumps_loads():
+
+    from pyctrl.flask import dumps, loads, get_class, JSONEncoder
+    from pyctrl.block.system import Gain
+
+    controller = _graph(20)
+
+    compact = dumps(controller)
+    indented = dumps(controller, compact = False)
+    assert len(compact) < len(indented)
+    assert indented == JSONEncoder(sort_keys = True, indent = 4).encode(controller)
+
+    obj = loads(compact)
+    assert type(obj) is type(controller)
+    assert dumps(obj) == compact
+    assert sorted(loads(indented).list_filters()) == sorted(controller.list_filters())
+
+    # classes are looked up once
+    assert get_class('pyctrl.block.system', 'Gain') is Gain
+    assert get_class.cache_info().hits > 0
+
 def _test_mip_balance():
 
     import numpy as np
@@ -0,0 +1,157 @@
+import time
+import struct
+import numpy
+import pytest
+import warnings
+
+from test.test_pycomms import Bus, FIFO
+
+class FIFOBus(Bus):
+    # FIFO count registers follow the FIFO
+
+    def _read(self, reg):
+        if reg == 0x72:
+            return len(self.fifo) >> 8
+        elif reg == 0x73:
+            return len(self.fifo) & 0xff
+        return super()._read(reg)
+
+def packet(w, x, y, z, gyro = (0, 0, 0), accel = (0, 0, 0)):
+    # DMP packet with a quaternion scaled by 2^30 and raw gyro and
+    # accelerometer values in the high words
+    return struct.pack('>4i', *(int(v * 2**30) for v in (w, x, y, z))) \
+        + struct.pack('>6i', *(v << 16 for v in gyro + accel)) + bytes(2)
+
+def wait(condition, timeout = 2):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline
+        time.sleep(0.001)
+
+def test_decode():
+
+    from pyctrl.bbb.pycomms.mpu6050 import MPU6050
+
+    assert MPU6050.dmpPacketType.itemsize == MPU6050.dmpPacketSize
+
+    # w = 1/2, x = -1/2, y = 1/4, z = -1/4, gyro = (1, -1, 300),
+    # accel = (16384, 0, -8192)
+    data = bytes.fromhex('20000000' 'e0000000' '10000000' 'f0000000'
+                         '00010000' 'ffff0000' '012c0000'
+                         '40000000' '00000000' 'e0000000'
+                         '0000')
+    assert data == packet(0.5, -0.5, 0.25, -0.25,
+                          (1, -1, 300), (16384, 0, -8192))
+
+    values = MPU6050.dmpDecodePackets(data + packet(1, 0, 0, 0))
+    assert numpy.array_equal(values['quaternion'],
+                             [[0.5, -0.5, 0.25, -0.25], [1, 0, 0, 0]])
+    assert numpy.array_equal(values['gyro'], [[1, -1, 300], [0, 0, 0]])
+    assert numpy.array_equal(values['accel'], [[16384, 0, -8192], [0, 0, 0]])
+
+    # no packets
+    values = MPU6050.dmpDecodePackets(b'')
+    assert values['quaternion'].shape == (0, 4)
+    assert values['accel'].shape == (0, 3)
+
+    # single packets, as read by getFIFOBytes
+    mpu = MPU6050(bus = FIFOBus())
+    assert mpu.dmpGetQuaternion(list(data)) == {'w': 0.5, 'x': -0.5,
+                                                'y': 0.25, 'z': -0.25}
+    assert mpu.dmpGetGyro(list(data)) == {'x': 1, 'y': -1, 'z': 300}
+    assert mpu.dmpGetAccel(data) == {'x': 16384, 'y': 0, 'z': -8192}
+
+def test_imu():
+
+    from pyctrl.bbb.pycomms.mpu6050 import MPU6050
+    from pyctrl.bbb.mpu6050 import IMU
+
+    bus = FIFOBus()
+    imu = IMU(mpu = MPU6050(bus = bus), period = 0.001)
+    assert imu.thread.is_alive()
+    assert imu.read() == (1, 0, 0, 0)
+    assert 'mpu' not in imu.get()
+
+    # all packets are drained in one burst
+    bus.fifo.extend(packet(0, 1, 0, 0) + packet(0, 0, 1, 0) + packet(0, 0, 0, 1)[:30])
+    wait(lambda: imu.read() == (0, 0, 1, 0))
+    assert len(bus.fifo) == 30
+    bus.fifo.extend(packet(0, 0, 0, 1)[30:])
+    wait(lambda: imu.read() == (0, 0, 0, 1))
+    assert not bus.fifo
+
+    imu.set_enabled(False)
+    assert imu.thread is None
+    assert imu.read() == (0, 0, 0, 1)
+
+def test_imu_all():
+
+    from pyctrl.bbb.pycomms.mpu6050 import MPU6050
+    from pyctrl.bbb.mpu6050 import IMU
+
+    bus = FIFOBus()
+    imu = IMU(mpu = MPU6050(bus = bus), period = 0.001,
+              latest = False, enabled = False)
+    assert imu.thread is None
+
+    imu.set_enabled(True)
+    (q, ) = imu.read()
+    assert q.shape == (0, 4)
+
+    bus.fifo.extend(packet(0, 1, 0, 0) + packet(0, 0, 1, 0))
+    wait(lambda: not bus.fifo)
+    bus.fifo.extend(packet(0, 0, 0, 1))
+    wait(lambda: not bus.fifo)
+    wait(lambda: imu.output == (0, 0, 0, 1))
+    (q, ) = imu.read()
+    assert numpy.array_equal(q, [[0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
+    (q, ) = imu.read()
+    assert q.shape == (0, 4)
+
+    imu.set_enabled(False)
+
+def test_imu_errors():
+
+    from pyctrl.bbb.pycomms.mpu6050 import MPU6050
+    from pyctrl.bbb.mpu6050 import IMU
+
+    class FaultyBus(FIFOBus):
+
+        def __init__(self):
+            super().__init__()
+            self.faults = 0
+
+        def read_i2c_block_data(self, address, reg, length):
+            if reg == FIFO and self.faults:
+                self.faults -= 1
+                raise OSError(121, 'Remote I/O error')
+            return super().read_i2c_block_data(address, reg, length)
+
+    bus = FaultyBus()
+    imu = IMU(mpu = MPU6050(bus = bus), period = 0.001)
+
+    # failed FIFO reads are counted and the thread keeps reading
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        bus.faults = 3
+        bus.fifo.extend(packet(0, 1, 0, 0))
+        wait(lambda: imu.errors > 0 and bus.faults == 0)
+        bus.fifo.extend(packet(0, 0, 1, 0))
+        wait(lambda: imu.read() == (0, 0, 1, 0))
+    assert imu.thread.is_alive()
+
+    imu.set_enabled(False)
+
+def test_inclinometer():
+
+    from pyctrl.block import BlockException
+    from pyctrl.bbb.pycomms.mpu6050 import MPU6050
+    from pyctrl.bbb.mpu6050 import Inclinometer
+
+    with pytest.raises(BlockException):
+        Inclinometer(mpu = MPU6050(bus = FIFOBus()), latest = False)
+
+    incl = Inclinometer(mpu = MPU6050(bus = FIFOBus()), enabled = False)
+    assert incl.read() == (-0.25, )
+    with pytest.raises(BlockException):
+        incl.set(latest = False)
@@ -0,0 +1,102 @@
+import pytest
+
+import numpy
+
+import pyctrl.block as block
+
+class Check(block.Filter, block.BufferBlock):
+
+    def write(self, *values):
+        if values[0] > 100:
+            raise block.BlockException('value is too large')
+        super().write(*values)
+
+def build():
+
+    from pyctrl.block.container import Container, Input, Output
+    from pyctrl.block.system import Gain, System
+    from pyctrl.system.ss import DTSS
+
+    container = Container()
+    container.add_signals('u', 'v')
+    container.add_source('input1', Input(), ['u'])
+    container.add_source('input2', Input(), ['v'])
+    container.add_filter('model',
+                         System(model = DTSS(numpy.array([[0.5, 0.1], [-0.2, 0.9]]),
+                                             numpy.array([[1, 0], [0.5, 1]]),
+                                             numpy.eye(2), numpy.zeros((2, 2)))),
+                         ['u', 'v'], ['y'])
+    container.add_filter('gain', Gain(gain = 2), ['u'], ['z'])
+    container.add_filter('check', Check(), ['u'], ['w'])
+    container.add_sink('output1', Output(), ['y'])
+    container.add_sink('output2', Output(), ['z'])
+    return container
+
+def test_process_container():
+
+    from pyctrl.block import BlockException
+    from pyctrl.block.container import Container
+    from pyctrl.block.process import ProcessContainer
+
+    with pytest.raises(BlockException):
+        ProcessContainer()
+
+    local = build()
+    local.set_enabled(True)
+    remote = ProcessContainer(container = build())
+
+    with pytest.raises(BlockException):
+        remote.read()
+
+    for k in range(20):
+        (u, v) = numpy.random.randn(2)
+        local.write(u, v)
+        (y1, z1) = local.read()
+        remote.write(u, v)
+        (y2, z2) = remote.read()
+        assert numpy.allclose(y1, y2)
+        assert z1 == z2
+
+    # as a filter
+    container = Container()
+    container.add_signals('u', 'v')
+    container.add_filter('remote', remote, ['u', 'v'], ['y', 'z'])
+    container.set_signal('u', 1)
+    container.set_signal('v', 2)
+    container.run()
+    local.write(1, 2)
+    (y1, z1) = local.read()
+    assert numpy.allclose(container.get_signal('y'), y1)
+    assert container.get_signal('z') == 2
+
+    # reset starts over
+    remote.reset()
+    local.reset()
+    local.write(1, 2)
+    remote.write(1, 2)
+    assert numpy.allclose(local.read()[0], remote.read()[0])
+
+    # errors in the worker
+    remote.write(101, 2)
+    with pytest.raises(BlockException):
+        remote.read()
+    remote.close()
+    local.set_enabled(False)
+
+def test_no_wait():
+
+    from pyctrl.block.process import ProcessContainer
+
+    remote = ProcessContainer(container = build(), wait = False)
+
+    # first read waits
+    remote.write(1, 0)
+    (y, z) = remote.read()
+    assert z == 2
+
+    # later reads return the last completed period
+    for k in range(1, 100):
+        remote.write(k, 0)
+        (y, z) = remote.read()
+        assert z % 2 == 0 and 0 <= z <= 2 * k
+    remote.close()
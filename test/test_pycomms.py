@@ -0,0 +1,121 @@
+import pytest
+import collections
+
+FIFO = 0x74
+
+class Bus:
+    # in-memory SMBus with auto-incrementing registers and a FIFO
+
+    def __init__(self):
+        self.registers = bytearray(256)
+        self.fifo = collections.deque()
+        self.transactions = 0
+
+    def _read(self, reg):
+        if reg == FIFO:
+            return self.fifo.popleft()
+        return self.registers[reg]
+
+    def read_byte_data(self, address, reg):
+        self.transactions += 1
+        return self._read(reg)
+
+    def write_byte_data(self, address, reg, value):
+        self.transactions += 1
+        self.registers[reg] = value
+
+    def read_i2c_block_data(self, address, reg, length):
+        assert length <= 32
+        self.transactions += 1
+        output = []
+        for k in range(length):
+            output.append(self._read(reg))
+            if reg != FIFO:
+                reg += 1
+        return output
+
+    def write_i2c_block_data(self, address, reg, data):
+        self.transactions += 1
+        self.registers[reg:reg+len(data)] = bytes(data)
+
+def test_pycomms():
+
+    from pyctrl.bbb.pycomms import PyComms
+
+    bus = Bus()
+    i2c = PyComms(0x68, bus)
+
+    bus.registers[0x3B:0x3F] = bytes([0x12, 0x34, 0xfe, 0x01])
+
+    # single transactions
+    assert i2c.readU8(0x3B) == 0x12
+    assert i2c.readS8(0x3D) == -2
+    assert i2c.readU16(0x3B) == 0x1234
+    assert i2c.readS16(0x3D) == -511
+    assert bus.transactions == 4
+
+    # consecutive registers in one block
+    bus.transactions = 0
+    assert i2c.readBlock(0x3B, 4) == bytes([0x12, 0x34, 0xfe, 0x01])
+    assert i2c.readBytesListU(0x3B, 4) == [0x12, 0x34, 0xfe, 0x01]
+    assert i2c.readBytesListS(0x3B, 4) == [0x12, 0x34, -2, 0x01]
+    assert i2c.readList(0x3B, 2) == [0x12, 0x34]
+    assert i2c.readBytes(0x3B, 2) == [0x12, 0x34]
+    assert bus.transactions == 5
+
+    # long reads are split in blocks of 32 bytes
+    bus.registers[:] = bytes(range(256))
+    bus.transactions = 0
+    assert i2c.readBlock(10, 100) == bytes(range(10, 110))
+    assert bus.transactions == 4
+
+    # fifo reads stay on the same register
+    packet = bytes(range(42))
+    bus.fifo.extend(packet * 3)
+    bus.transactions = 0
+    assert i2c.readBytes(FIFO, 42) == list(packet)
+    assert i2c.readBlock(FIFO, 84, False) == packet * 2
+    assert bus.transactions == 2 + 3
+    assert not bus.fifo
+
+    # writes
+    bus.registers[:] = bytes(256)
+    i2c.write8(0x10, 0xff)
+    i2c.writeBit(0x11, 3, 1)
+    i2c.writeBits(0x12, 4, 3, 0b101)
+    i2c.writeList(0x20, [1, 2, 3])
+    assert bus.registers[0x10] == 0xff
+    assert i2c.readBit(0x11, 3)
+    assert bus.registers[0x11] == 0x08
+    assert i2c.readBits(0x12, 4, 3) == 0b101
+    assert bus.registers[0x20:0x23] == bytes([1, 2, 3])
+
+def test_errors():
+
+    from pyctrl.bbb.pycomms import PyComms
+
+    class Broken(Bus):
+        def read_i2c_block_data(self, address, reg, length):
+            raise IOError()
+
+    i2c = PyComms(0x68, Broken())
+    assert i2c.readU16(0x3B) == -1
+    assert i2c.readList(0x3B, 4) == -1
+    with pytest.raises(IOError):
+        i2c.readBlock(0x3B, 4)
+
+def test_mpu6050():
+
+    from pyctrl.bbb.pycomms.mpu6050 import MPU6050
+
+    bus = Bus()
+    mpu = MPU6050(bus = bus)
+
+    bus.registers[0x72:0x74] = bytes([0x00, 84])
+    assert mpu.getFIFOCount() == 84
+
+    packet = bytes(range(42))
+    bus.fifo.extend(packet)
+    bus.transactions = 0
+    assert mpu.getFIFOBytes(42) == list(packet)
+    assert bus.transactions == 2
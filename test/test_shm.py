@@ -0,0 +1,101 @@
+import pytest
+import os
+import multiprocessing
+
+import numpy
+
+def reader(name, queue):
+
+    from pyctrl.block.shm import SignalBus
+
+    bus = SignalBus(name)
+    errors = 0
+    for k in range(2000):
+        (u, y) = bus.read()
+        if not numpy.array_equal(y, [u, 2 * u]):
+            errors += 1
+    queue.put((bus.labels, bus.shapes, errors))
+    bus.close()
+
+def test_bus():
+
+    from pyctrl.block import BlockException
+    from pyctrl.block.shm import SignalBus
+
+    name = 'pyctrl_test_bus_{}'.format(os.getpid())
+    bus = SignalBus(name, ['u', 'y'], [(), (2,)])
+    assert bus.get_sequence() == 0
+    bus.write(1, numpy.array([2, 3]))
+    assert bus.get_sequence() == 2
+
+    other = SignalBus(name)
+    assert other.labels == ['u', 'y']
+    assert other.shapes == [(), (2,)]
+    (u, y) = other.read()
+    assert u == 1 and isinstance(u, float)
+    assert numpy.array_equal(y, [2, 3])
+    assert numpy.array_equal(other.read_array(), [1, 2, 3])
+
+    # writer in the middle of an update
+    bus._seq[0] += 1
+    with pytest.raises(BlockException):
+        other.read(timeout = 0.01)
+    bus._seq[0] += 1
+
+    other.close()
+    bus.close()
+
+def test_publisher():
+
+    from pyctrl.block import BlockException
+    from pyctrl.block.container import Container, Input
+    from pyctrl.block.system import Gain
+    from pyctrl.block.shm import Publisher, Subscriber
+
+    name = 'pyctrl_test_publisher_{}'.format(os.getpid())
+
+    container = Container()
+    container.add_signals('u', 'v')
+    container.add_source('input', Input(), ['u'])
+    container.add_filter('gain', Gain(gain = 2), ['v'], ['w'])
+    container.add_filter('mux', Gain(gain = 1, mux = True), ['u', 'w'], ['y'])
+    container.add_sink('publisher', Publisher(name = name), ['u', 'y'])
+
+    container.set_enabled(True)
+    container.set_signal('v', 1)
+    container.write(1)
+    container.run()
+
+    # another container subscribes
+    other = Container()
+    other.add_source('subscriber', Subscriber(name = name), ['u', 'y'])
+    other.set_enabled(True)
+    other.run()
+    assert other.get_signal('u') == 1
+    assert numpy.array_equal(other.get_signal('y'), [1, 2])
+
+    # another process reads consistent values while publishing
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target = reader, args = (name, queue))
+    process.start()
+    k = 0
+    while process.is_alive() and queue.empty():
+        container.set_signal('v', k)
+        container.write(k)
+        container.run()
+        k += 1
+    (labels, shapes, errors) = queue.get(timeout = 10)
+    process.join()
+    assert labels == ['u', 'y']
+    assert shapes == [(), (2,)]
+    assert errors == 0
+
+    # shapes cannot change
+    container.set_signal('v', numpy.array([1, 2]))
+    with pytest.raises(BlockException):
+        container.run()
+
+    container.set_enabled(False)
+    other.set_enabled(False)
+    other.sources['subscriber']['block'].close()
+    container.sinks['publisher']['block'].close()
@@ -0,0 +1,50 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+# time imports in a fresh interpreter
+script = """
+import sys
+from time import perf_counter
+t0 = perf_counter()
+import numpy
+t1 = perf_counter()
+import pyctrl
+import pyctrl.timer
+import pyctrl.sim
+import pyctrl.block.system
+import pyctrl.system.ode
+t2 = perf_counter()
+print(t1 - t0, t2 - t1, 'scipy' in sys.modules)
+"""
+
+def import_time():
+
+    output = subprocess.check_output([sys.executable, '-c', script])
+    (numpy_time, pyctrl_time, has_scipy) = output.decode('utf-8').split()
+    return (float(numpy_time), float(pyctrl_time), has_scipy == 'True')
+
+def test_no_scipy():
+
+    (numpy_time, pyctrl_time, has_scipy) = import_time()
+    assert not has_scipy
+
+@pytest.mark.skipif(not os.environ.get('PYCTRL_BENCHMARK'),
+                    reason = 'set PYCTRL_BENCHMARK to run benchmarks')
+def test_import_time():
+
+    # best of three to filter out noise
+    times = [import_time() for k in range(3)]
+    numpy_time = min(t[0] for t in times)
+    pyctrl_time = min(t[1] for t in times)
+
+    # importing pyctrl should cost no more than twice importing numpy
+    assert pyctrl_time < 2 * numpy_time, \
+        'numpy = {:.3f}s, pyctrl = {:.3f}s'.format(numpy_time, pyctrl_time)
+
+if __name__ == "__main__":
+
+    test_no_scipy()
+    test_import_time()
@@ -6,6 +6,8 @@ import pyctrl.block as block
 import pyctrl.system as system
 import pyctrl.system.tf as tf
 import pyctrl.system.ss as ss
+import pyctrl.system.sos as sos
+import pyctrl.system.c2d as c2d
 
 test_ode = True
 try:
@@ -697,6 +699,344 @@ def test6():
     assert np.all(np.abs(yk - soln[1]) < 1e-4)
 
 
+def test7():
+
+    # single section equals DTTF
+    sys = sos.SOS(np.array([[1, 2, 0, 2, -1, 0]]))
+    assert np.all(sys.sos == np.array([[.5, 1, 0, 1, -.5, 0]]))
+    assert np.all(sys.state == np.zeros((1,2)))
+    assert sys.shape() == (1,1,2)
+    tsys = tf.DTTF(np.array([1, 2]), np.array([2, -1]))
+    for uk in [1, -1, 3, 0, 2]:
+        assert abs(sys.update(uk) - tsys.update(uk)) < 1e-12
+
+    # cascade equals product of DTTFs
+    sections = np.array([[1, .5, .25, 1, -.5, .1],
+                         [2, 0, -1, 1, .3, .2],
+                         [1, 1, 0, 1, -.9, 0]])
+    sys = sos.SOS(sections)
+    num = np.polymul(np.polymul(sections[0,:3], sections[1,:3]), sections[2,:3])
+    den = np.polymul(np.polymul(sections[0,3:], sections[1,3:]), sections[2,3:])
+    tsys = tf.DTTF(num, den)
+    for uk in [1, -1, 3, 0, 2, 0, 0, 1]:
+        assert abs(sys.update(uk) - tsys.update(uk)) < 1e-10
+
+    # accepts one-element arrays
+    yk = sys.update(np.array([1.]))
+    assert abs(yk - tsys.update(1)) < 1e-10
+
+    # set_output
+    sys.set_output(3)
+    assert abs(sys.update(0) - 3) < 1e-12
+    sys.set_output(np.zeros(1))
+    assert np.all(sys.state == np.zeros((3,2)))
+    assert sys.update(0) == 0
+
+    # bad shapes
+    with pytest.raises(system.SystemException):
+        sys = sos.SOS(np.array([[1, 2, 3]]))
+
+    with pytest.raises(system.SystemException):
+        sys = sos.SOS(np.array([[1, 2, 3, 0, 1, 1]]))
+
+    with pytest.raises(system.SystemException):
+        sys = sos.SOS(np.array([[1, 2, 3, 1, 1, 1]]), state = np.zeros(2))
+
+    # LPF of order 1 is tf.LPF
+    sys = sos.LPF(fc = 3, period = 0.01, gain = 2)
+    tsys = tf.LPF(fc = 3, period = 0.01, gain = 2)
+    for uk in [1, -1, 3, 0, 2]:
+        assert abs(sys.update(uk) - tsys.update(uk)) < 1e-12
+
+    # higher order LPF, unit DC gain
+    sys = sos.LPF(fc = 3, period = 0.01, order = 4)
+    assert sys.shape() == (1,1,8)
+    for k in range(2000):
+        yk = sys.update(1)
+    assert abs(yk - 1) < 1e-6
+
+    with pytest.raises(system.SystemException):
+        sys = tf.LPF(fc = 3, period = 0.01, order = 2)
+
+    # Butterworth
+    for order in range(1, 6):
+
+        # lowpass: DC gain is gain and zero gain at Nyquist
+        sys = sos.Butterworth(fc = 5, period = 0.01, order = order, gain = 2)
+        assert sys.sos.shape == ((order + 1) // 2, 6)
+        for k in range(2000):
+            yk = sys.update(1)
+        assert abs(yk - 2) < 1e-6
+        sys.set_output(0)
+        for k in range(2000):
+            yk = sys.update((-1)**k)
+        assert abs(yk) < 1e-6
+
+        # highpass: zero DC gain
+        sys = sos.Butterworth(fc = 5, period = 0.01, order = order,
+                              btype = 'highpass')
+        for k in range(2000):
+            yk = sys.update(1)
+        assert abs(yk) < 1e-6
+
+    # gain at cutoff is 1/sqrt(2)
+    fc, Ts = 5, 0.01
+    sys = sos.Butterworth(fc = fc, period = Ts, order = 4)
+    yk = [sys.update(math.sin(2*math.pi*fc*Ts*k)) for k in range(4000)]
+    assert abs(max(yk[-1000:]) - 1/math.sqrt(2)) < 1e-3
+
+    with pytest.raises(system.SystemException):
+        sys = sos.Butterworth(fc = 60, period = 0.01)
+
+    with pytest.raises(system.SystemException):
+        sys = sos.Butterworth(fc = 5, period = 0.01, btype = 'bandpass')
+
+    # Notch: removes fc, keeps DC
+    fc, Ts = 10, 0.01
+    sys = sos.Notch(fc = fc, period = Ts, Q = 5)
+    yk = [sys.update(1 + math.sin(2*math.pi*fc*Ts*k)) for k in range(4000)]
+    assert abs(max(yk[-1000:]) - 1) < 1e-3
+    assert abs(min(yk[-1000:]) - 1) < 1e-3
+
+    # round trip through json, also inside a System block
+    from pyctrl.flask import JSONEncoder, JSONDecoder
+    import pyctrl.block.system as blksys
+
+    for sys in [sos.SOS(np.array([[1, 2, 1, 2, 0.5, 0.1]])),
+                sos.LPF(fc = 3, period = 0.01, order = 2),
+                sos.Butterworth(fc = 5, period = 0.01, order = 3,
+                                btype = 'highpass'),
+                sos.Notch(fc = 10, period = 0.01, Q = 5)]:
+        blk = blksys.System(model = sys)
+        obj = JSONDecoder().decode(JSONEncoder().encode(blk))
+        assert type(obj.model) is type(sys)
+        assert np.all(obj.model.sos == sys.sos)
+        for uk in [1, -1, 3, 0, 2]:
+            assert obj.model.update(uk) == sys.update(uk)
+
+
+def test8():
+
+    if not test_ode:
+        return
+
+    import functools
+
+    # rk4 passes the same tests as ODE and ODEINT
+    dotest4(functools.partial(ode.FixedStep, method = 'rk4', substeps = 50))
+
+    # \dot{x} = 1 is exact with euler
+    def f(t, x, *pars):
+        return np.array([1])
+
+    sys = ode.FixedStep((0,1,1), f, t0 = 0, method = 'euler')
+    assert sys.state.shape == (1,)
+    yk = sys.update(1, 0)
+    assert np.abs(yk - np.array([1.])) < 1e-12
+    yk = sys.update(1, 0)
+    assert np.abs(yk - np.array([1.])) < 1e-12
+    yk = sys.update(2.5, 0)
+    assert np.abs(yk - np.array([2.5])) < 1e-12
+
+    # \dot{x} = -a * x + a * u
+    def F(t, x, u, a):
+        return -a * x + a * u
+
+    a, x0, uk, T = 2, -1.5, 3, 2
+    yyk = uk * (1 - math.exp(-a*T)) + x0 * math.exp(-a*T)
+    for (method, substeps, tol) in [('euler', 2000, 1e-2),
+                                    ('rk4', 20, 1e-4),
+                                    ('rk4', 200, 1e-8)]:
+        sys = ode.FixedStep((1,1,1), f = F, t0 = 0, x0 = x0, pars = (a,),
+                            method = method, substeps = substeps)
+        yk = sys.update(T, uk)
+        assert np.abs(yk - np.array([yyk])) < tol
+
+    # harmonic oscillator: \dot{q} = v, \dot{v} = -w^2 q
+    def H(t, x, u, w):
+        return np.array([x[1], -w**2 * x[0] + u])
+
+    w, Ts = 2*math.pi, 0.01
+    sys = ode.FixedStep((1,2,2), f = H, t0 = 0, x0 = [1, 0], pars = (w,),
+                        method = 'semi-implicit-euler')
+    assert sys.split == 1
+    energy = []
+    for k in range(1, 1001):
+        xk = sys.update(k*Ts, 0)
+        energy.append(w**2 * xk[0]**2 + xk[1]**2)
+    # energy stays bounded
+    assert max(energy) / w**2 < 1.2 and min(energy) / w**2 > 0.8
+    # back to start after 10 periods
+    assert np.all(np.abs(xk - np.array([1, 0])) < 0.1 * np.array([1, w]))
+
+    with pytest.raises(system.SystemException):
+        sys = ode.FixedStep((1,1,1), f = F, method = 'midpoint')
+
+def test9():
+
+    T = 0.01
+
+    # models are immutable and hashable
+    G = tf.CTTF([0, 2], [2, 4])
+    assert np.all(G.num == np.array([1])) and np.all(G.den == np.array([1, 2]))
+    assert G == tf.CTTF([1], [1, 2])
+    assert hash(G) == hash(tf.CTTF([1], [1, 2]))
+    assert G != tf.CTTF([1], [1, 3])
+    assert hash(tf.CTTF([1, 0], [1, 2, 0])) == hash(tf.CTTF([1, -0.0], [1, 2, -0.0]))
+    assert hash(ss.CTSS([[0]], [[1]], [[1]])) == hash(ss.CTSS([[-0.0]], [[1]], [[1]]))
+    with pytest.raises(ValueError):
+        G.num[0] = 2
+
+    with pytest.raises(system.SystemException):
+        G = tf.CTTF([1, 0, 0], [1, 1])
+    with pytest.raises(system.SystemException):
+        G = ss.CTSS([[0, 1]], [[0], [1]], [[1, 0]])
+
+    # matrix exponential
+    A = np.array([[0, 1], [-4, -0.5]])
+    w = math.sqrt(4 - 0.5**2 / 4)
+    E = c2d.expm(A * 3)
+    # compare with e^{At} x0 for x0 = [1, -0.25]
+    x = np.exp(-0.25 * 3) * np.array([math.cos(w * 3),
+                                      -0.25 * math.cos(w * 3) - w * math.sin(w * 3)])
+    assert np.all(np.abs(E.dot([1, -0.25]) - x) < 1e-10)
+
+    # zoh of a first-order lowpass matches tf.LPF
+    fc = 5
+    wc = 2 * math.pi * fc
+    c2d.cache_clear()
+    sys = c2d.c2d(tf.CTTF([wc], [1, wc]), T)
+    assert isinstance(sys, tf.DTTF)
+    lpf = tf.LPF(fc, T)
+    assert np.all(np.abs(sys.num - lpf.num) < 1e-12)
+    assert np.all(np.abs(sys.den - lpf.den) < 1e-12)
+
+    # cached
+    assert c2d.cache_info().misses == 1
+    sys2 = c2d.c2d(tf.CTTF([wc], [1, wc]), T)
+    assert c2d.cache_info().hits == 1
+    assert sys2 is not sys
+    sys2.update(1)
+    assert np.all(sys.state == 0)
+
+    # double integrator
+    sys = c2d.c2d(ss.CTSS([[0, 1], [0, 0]], [[0], [1]], [[1, 0]]), T)
+    assert isinstance(sys, ss.DTSS)
+    assert np.all(np.abs(sys.A - np.array([[1, T], [0, 1]])) < 1e-12)
+    assert np.all(np.abs(sys.B - np.array([[T**2/2], [T]])) < 1e-12)
+    sys.A[0, 0] = 2
+    sys = c2d.c2d(ss.CTSS([[0, 1], [0, 0]], [[0], [1]], [[1, 0]]), T)
+    assert sys.A[0, 0] == 1
+
+    G = tf.CTTF([1], [1, 0, 0])
+    sys = c2d.c2d(G, T)
+    assert np.all(np.abs(sys.num - np.array([0, T**2/2, T**2/2])) < 1e-12)
+    assert np.all(np.abs(sys.den - np.array([1, -2, 1])) < 1e-12)
+    sys = c2d.c2d(G, T, 'tustin')
+    assert np.all(np.abs(sys.num - np.array([1, 2, 1]) * T**2/4) < 1e-12)
+    assert np.all(np.abs(sys.den - np.array([1, -2, 1])) < 1e-12)
+    sys = c2d.c2d(G, T, 'matched')
+    assert np.all(np.abs(sys.num - np.array([1, 2, 1]) * T**2/4) < 1e-12)
+    assert np.all(np.abs(sys.den - np.array([1, -2, 1])) < 1e-12)
+
+    # tustin of a state-space model agrees with tustin of its transfer-function
+    G = tf.CTTF([1, 3, 2], [1, 2, 5, 1])
+    num = c2d.c2d(G, T, 'bilinear')
+    sys = c2d.c2d(G.as_CTSS(), T, 'tustin')
+    for k in range(10):
+        assert np.abs(num.update(1) - sys.update(np.array([1]))) < 1e-10
+
+    # matched preserves dc gain and maps poles and zeros
+    G = tf.CTTF([1, 2], [1, 4, 3])
+    sys = c2d.c2d(G, T, 'matched')
+    assert np.abs(np.sum(sys.num) / np.sum(sys.den) - 2/3) < 1e-12
+    assert np.all(np.abs(np.sort(np.roots(sys.den)) -
+                         np.exp(np.array([-3, -1]) * T)) < 1e-12)
+    assert np.all(np.abs(np.sort(np.roots(sys.num)) -
+                         np.array([-1, np.exp(-2 * T)])) < 1e-12)
+
+    # static gain
+    sys = c2d.c2d(tf.CTTF([2], [1]), T)
+    assert sys.update(3) == 6
+
+    with pytest.raises(system.SystemException):
+        c2d.c2d(tf.CTTF([1], [1, 1]), T, 'foh')
+    with pytest.raises(system.SystemException):
+        c2d.c2d(tf.CTTF([1], [1, 1]), 0)
+    with pytest.raises(system.SystemException):
+        c2d.c2d(ss.CTSS([[-1]], [[1]], [[1]]), T, 'matched')
+    with pytest.raises(system.SystemException):
+        c2d.c2d(tf.DTTF([1], [1]), T)
+
+def test10():
+
+    A = np.array([[0,1],[1, -2]])
+    B = np.array([[1,-1],[1,0]])
+    C = np.array([[1,-2],[0,1]])
+    D = np.array([[1,0],[-1,1]])
+    sys = ss.DTSS(A, B, C, D)
+    sparse = ss.DTSS(A, B, C, D, sparse = True)
+
+    # state is updated in place
+    state = sys.state
+    xk = np.zeros(2)
+    for uk in [[1,1], [-1,0], [3,2], [0,0]]:
+        uk = np.array(uk)
+        yk = C.dot(xk) + D.dot(uk)
+        xk = A.dot(xk) + B.dot(uk)
+        assert np.all(sys.update(uk) == yk)
+        assert np.all(sparse.update(uk) == yk)
+        assert np.all(sys.state == xk)
+        assert np.all(sparse.state == xk)
+    assert sys.state is state
+
+    # outputs are not overwritten by the next update
+    y1 = sys.update(np.array([1,0]))
+    y2 = sys.update(np.array([0,1]))
+    assert np.any(y1 != y2)
+
+    # get_state returns a copy
+    xk = sys.get_state()
+    sys.update(np.array([1,1]))
+    assert np.any(xk != sys.state)
+    sys.set_state(xk)
+    assert np.all(xk == sys.state)
+    assert sys.state is state
+
+    # matrices are views of the stacked matrix
+    sys.set_state(np.zeros(2))
+    sys.D[0,0] = 2
+    assert np.all(sys.update(np.array([1,0])) == np.array([2,-1]))
+
+    # assigning copies into the buffers
+    sys = ss.DTSS(A, B, C, D)
+    for model in [sys, sparse]:
+        model.state = np.array([1, 2])
+        assert np.all(model.update(np.array([0, 0])) == C.dot([1, 2]))
+        assert np.all(model.state == A.dot([1, 2]))
+        model.A = np.eye(2)
+        model.D = np.zeros((2, 2))
+        model.state = [1, 2]
+        assert np.all(model.update(np.array([1, 0])) == C.dot([1, 2]))
+        assert np.all(model.state == np.array([2, 3]))
+    with pytest.raises(system.SystemException):
+        sys.state = np.zeros(3)
+    with pytest.raises(system.SystemException):
+        sys.A = np.eye(3)
+
+    # json round trip
+    from pyctrl.flask import JSONEncoder, JSONDecoder
+    for model in [ss.DTSS(A, B, C, D, state = np.array([1, -1])),
+                  ss.DTSS(A, B, C, D, sparse = True)]:
+        obj = JSONDecoder().decode(JSONEncoder().encode(model))
+        assert np.all(obj.A == model.A) and np.all(obj.D == model.D)
+        assert np.all(obj.state == model.state)
+        assert obj.sparse == model.sparse
+        assert np.all(obj.update(np.array([1, 2])) == model.update(np.array([1, 2])))
+
+    with pytest.raises(system.SystemException):
+        sys = ss.DTSS(A, B, C, D, state = np.zeros(3))
+
 if __name__ == "__main__":
 
     test1()
@@ -705,3 +1045,7 @@ if __name__ == "__main__":
     test4()
     test5()
     test6()
+    test7()
+    test8()
+    test9()
+    test10()
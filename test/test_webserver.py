@@ -575,3 +575,289 @@ def test_webserver():
             # stop server
             print('> Terminating server')
             server.terminate()
+
+def test_binary():
+
+    import io
+    import numpy
+    import pyctrl
+    from pyctrl.block import Logger
+    from pyctrl.flask import decode_arrays
+    from pyctrl.flask.server import Server, JSONDecoder
+
+    server = Server(__name__)
+    controller = pyctrl.Controller(noclock = True)
+    server.set_controller(controller = controller)
+    controller.add_signals('x', 'y')
+    controller.add_sink('logger', Logger(), ['x', 'y'])
+    logger = controller.sinks['logger']['block']
+    for k in range(5):
+        logger.write(k, 2 * k)
+    controller.set_signal('y', 8)
+        
+    client = server.test_client()
+
+    # json is the default
+    output = client.get('/get/sink/logger?keys="log"')
+    assert output.mimetype == 'application/json'
+    log = JSONDecoder().decode(output.data.decode('utf-8'))['log']
+
+    # raw float64
+    output = client.get('/get/sink/logger?keys="log"',
+                        headers = {'Accept': 'application/octet-stream'})
+    assert output.mimetype == 'application/octet-stream'
+    result = decode_arrays(output.data)
+    assert list(result.keys()) == ['log/x', 'log/y']
+    assert result['log/x'].shape == (5, 1)
+    assert numpy.array_equal(result['log/x'], log['x'])
+    assert numpy.array_equal(result['log/y'], log['y'])
+
+    # npz
+    output = client.get('/get/sink/logger?keys="log"',
+                        headers = {'Accept': 'application/x-npz'})
+    assert output.mimetype == 'application/x-npz'
+    result = numpy.load(io.BytesIO(output.data))
+    assert numpy.array_equal(result['log/y'], log['y'])
+
+    # signals
+    output = client.get('/get/signal/y',
+                        headers = {'Accept': 'application/octet-stream'})
+    result = decode_arrays(output.data)
+    assert result['y'].shape == () and result['y'] == 8
+
+    # errors and non numeric results are json
+    output = client.get('/get/signal/z',
+                        headers = {'Accept': 'application/octet-stream'})
+    assert output.mimetype == 'application/json'
+    assert output.json['status'] == 'error'
+    
+    output = client.get('/get/sink/logger',
+                        headers = {'Accept': 'application/octet-stream'})
+    assert output.mimetype == 'application/json'
+
+def test_stream():
+
+    import json
+    from pyctrl.timer import Controller
+    from pyctrl.flask.server import Server
+
+    server = Server(__name__)
+    controller = Controller(period = 0.01)
+    server.set_controller(controller = controller)
+
+    client = server.test_client()
+
+    # unknown signals
+    output = client.get('/stream/signals?labels="w"')
+    assert output.json['status'] == 'error'
+
+    output = client.get('/stream/signals?labels=["clock","is_running"]&decimate=2',
+                        buffered = False)
+    assert output.mimetype == 'text/event-stream'
+    events = (event.decode('utf-8') for event in output.response)
+    assert next(events) == 'event: labels\ndata: ["clock", "is_running"]\n\n'
+    assert len(controller._subscriptions) == 1
+
+    with controller:
+        rows = []
+        while len(rows) < 5:
+            event = next(events)
+            assert event.startswith('data: ')
+            rows.extend(json.loads(event[6:]))
+    assert all(row[1] for row in rows)
+    assert all(b > a for (a, b) in zip(rows, rows[1:]))
+
+    # closing the stream unsubscribes
+    output.close()
+    assert len(controller._subscriptions) == 0
+
+def test_etag():
+
+    import pyctrl
+    from pyctrl.flask.server import Server
+
+    # templates are found relative to the server module
+    server = Server('pyctrl.flask.server')
+    controller = pyctrl.Controller(noclock = True)
+    server.set_controller(controller = controller)
+
+    client = server.test_client()
+
+    for url in ('/info', '/list/signals', '/list/sinks', '/'):
+        output = client.get(url)
+        assert output.status_code == 200
+        etag = output.headers['ETag']
+        data = output.data
+
+        # cached
+        output = client.get(url)
+        assert output.headers['ETag'] == etag and output.data == data
+
+        # not modified
+        output = client.get(url, headers = {'If-None-Match': etag})
+        assert output.status_code == 304 and output.data == b''
+
+    # structural change
+    controller.add_signal('x')
+    output = client.get('/list/signals', headers = {'If-None-Match': etag})
+    assert output.status_code == 200
+    assert 'x' in output.json
+    output = client.get('/info', headers = {'If-None-Match': etag})
+    assert output.status_code == 200
+    assert b'<li>x</li>' in output.data
+
+def test_controller_signals():
+
+    import pyctrl
+    from pyctrl.flask.server import Server
+
+    server = Server('pyctrl.flask.server')
+    controller = pyctrl.Controller(noclock = True)
+    server.set_controller(controller = controller)
+
+    client = server.test_client()
+
+    # signals written by the controller itself are published
+    assert client.get('/get/signal/is_running').json == {'is_running': False}
+    assert client.get('/get/signal/duty').json == {'duty': 0}
+    assert controller.get_snapshot('is_running', 'duty') == [False, 0]
+
+    controller.reset()
+    assert client.get('/get/signal/is_running').json == {'is_running': False}
+
+def test_download():
+
+    import io
+    import pyctrl
+    from pyctrl.flask import loads
+    from pyctrl.flask.server import Server
+
+    server = Server('pyctrl.flask.server')
+    server.config['SECRET_KEY'] = 'secret!'
+    controller = pyctrl.Controller(noclock = True)
+    server.set_controller(controller = controller)
+    controller.add_signal('x')
+
+    client = server.test_client()
+
+    output = client.get('/download')
+    assert output.mimetype == 'application/json'
+    assert b'\n' not in output.data
+    indented = client.get('/download?compact=false').data
+    assert len(indented) > len(output.data)
+    assert 'x' in loads(output.data.decode('utf-8')).list_signals()
+
+    # upload
+    controller.add_signal('y')
+    output = client.post('/upload',
+                         data = {'file': (io.BytesIO(output.data), 'controller.json')})
+    assert output.status_code == 302
+    assert server.controller is not controller
+    assert 'x' in server.controller.list_signals()
+    assert 'y' not in server.controller.list_signals()
+
+def test_remote(tmp_path):
+
+    import io
+    import os
+    import stat
+    import json
+    import pytest
+    from multiprocessing import connection
+    import pyctrl
+    from pyctrl.block import Logger
+    from pyctrl.flask import remote, decode_arrays
+    from pyctrl.flask.server import Server
+
+    # controller served on a unix socket
+    controller = pyctrl.Controller(noclock = True)
+    controller.add_signals('x', 'y')
+    controller.add_sink('logger', Logger(), ['x', 'y'])
+    authkey = os.urandom(32)
+    listener = remote.Listener(controller, str(tmp_path / 'pyctrl.sock'), authkey)
+    listener.start()
+
+    try:
+
+        # only the owner and holders of the key can connect
+        assert stat.S_IMODE(os.stat(listener.address).st_mode) == 0o600
+        with pytest.raises(connection.AuthenticationError):
+            remote.Controller(listener.address, os.urandom(32)).list_signals()
+        
+        server = Server('pyctrl.flask.server')
+        server.set_controller(controller = remote.Controller(listener.address, authkey))
+        assert isinstance(server.controller, remote.Controller)
+
+        client = server.test_client()
+
+        # calls run on the served controller
+        output = client.get('/add/signal/z')
+        assert output.json == {'status': 'success'}
+        assert 'z' in controller.list_signals()
+        controller.set_signal('x', 2)
+        assert client.get('/get/signal/x').json == {'x': 2}
+        assert client.get('/list/sinks').json == ['logger']
+
+        # errors
+        output = client.get('/get/signal/w')
+        assert output.json['status'] == 'error'
+        assert 'does not exist' in output.json['message']
+
+        # pages and blocks
+        assert client.get('/info').data == controller.html().encode('utf-8')
+        assert b'logger' in client.get('/').data
+        output = client.get('/get/sink/logger')
+        assert output.json['logger']['__class__'] == 'Logger'
+        assert client.get('/html/sink/logger').data \
+            == controller.sinks['logger']['block'].html().encode('utf-8')
+
+        # binary logs
+        logger = controller.sinks['logger']['block']
+        for k in range(3):
+            logger.write(k, -k)
+        output = client.get('/get/sink/logger?keys="log"',
+                            headers = {'Accept': 'application/octet-stream'})
+        assert decode_arrays(output.data)['log/y'].ravel().tolist() == [0, -1, -2]
+
+        # streams
+        output = client.get('/stream/signals?labels="x"&timeout=0.1',
+                            buffered = False)
+        events = (event.decode('utf-8') for event in output.response)
+        next(events)
+        assert len(listener.subscriptions) == 1
+        assert next(events) == ': keep-alive\n\n'
+        output.close()
+        assert len(listener.subscriptions) == 0
+
+        # new controllers are installed in the controller process
+        client.get('/set/controller/pyctrl/Controller?kwargs={"noclock":true}')
+        assert isinstance(server.controller, remote.Controller)
+        assert listener.controller is not controller
+        assert client.get('/list/signals').json == listener.controller.list_signals()
+
+        # download and upload the served controller
+        listener.controller.add_signal('u')
+        output = client.get('/download')
+        data = json.loads(output.data.decode('utf-8'))
+        assert data['__class__'] == 'Controller'
+        assert data['__module__'] == 'pyctrl'
+        assert 'u' in output.data.decode('utf-8')
+
+        previous = listener.controller
+        previous.add_signal('v')
+        server.config['SECRET_KEY'] = 'secret!'
+        output = client.post('/upload',
+                             data = {'file': (io.BytesIO(output.data), 'controller.json')})
+        assert output.status_code == 302
+        assert isinstance(server.controller, remote.Controller)
+        assert listener.controller is not previous
+        assert 'u' in listener.controller.list_signals()
+        assert 'v' not in listener.controller.list_signals()
+
+        # a controller must be given
+        with pytest.raises(Exception):
+            server.controller.set_controller()
+        assert listener.controller is not None
+
+    finally:
+        listener.close()